@@ -0,0 +1,255 @@
+"""
+Load-test the APIClient against the in-process fake POP server.
+
+Every client method is called ``--requests`` times at each concurrency
+level, and throughput and p50/p95/p99 latencies are reported. Results can
+be saved and compared with a previous run to catch regressions:
+
+    python benchmarks/bench_client.py --save baseline.json
+    python benchmarks/bench_client.py --baseline baseline.json
+
+The comparison exits with status 1 when the p95 latency of any method
+grows by more than ``--tolerance``.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pointofpresence import APIClient  # noqa: E402
+from pointofpresence.fake_server import FakePOPServer  # noqa: E402
+
+SERVER = "local"
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def scenarios(client, prefix):
+    """
+    Ordered (method name, call) pairs; each call takes the request index.
+
+    Later scenarios use the datasets and organizations created by the
+    earlier ones.
+    """
+    owner = f"{prefix}-owner"
+    kafka_ids = {}
+    s3_ids = {}
+    url_ids = {}
+
+    def register_organization(i):
+        client.register_organization(
+            {"name": f"{prefix}-org-{i}", "title": f"Org {i}"}, SERVER
+        )
+
+    def register_kafka_topic(i):
+        kafka_ids[i] = client.register_kafka_topic(
+            {
+                "dataset_name": f"{prefix}-kafka-{i}",
+                "dataset_title": f"Kafka {i}",
+                "owner_org": owner,
+                "kafka_topic": f"topic-{i}",
+                "kafka_host": "localhost",
+                "kafka_port": "9092",
+                "dataset_description": "Benchmark topic",
+            },
+            SERVER,
+        )["id"]
+
+    def register_s3_link(i):
+        s3_ids[i] = client.register_s3_link(
+            {
+                "resource_name": f"{prefix}-s3-{i}",
+                "resource_title": f"S3 {i}",
+                "owner_org": owner,
+                "resource_s3": f"s3://bucket/object-{i}",
+                "notes": "Benchmark object",
+            },
+            SERVER,
+        )["id"]
+
+    def register_url(i):
+        url_ids[i] = client.register_url(
+            {
+                "resource_name": f"{prefix}-url-{i}",
+                "resource_title": f"URL {i}",
+                "owner_org": owner,
+                "resource_url": f"https://example.com/{i}.csv",
+                "file_type": "CSV",
+                "notes": "Benchmark file",
+            },
+            SERVER,
+        )["id"]
+
+    return [
+        ("register_organization", register_organization),
+        ("list_organizations", lambda i: client.list_organizations(
+            server=SERVER
+        )),
+        ("register_kafka_topic", register_kafka_topic),
+        ("register_s3_link", register_s3_link),
+        ("register_url", register_url),
+        ("update_kafka_topic", lambda i: client.update_kafka_topic(
+            kafka_ids[i], {"dataset_title": f"Kafka {i} v2"}, SERVER
+        )),
+        ("update_s3_resource", lambda i: client.update_s3_resource(
+            s3_ids[i], {"notes": "Updated"}, SERVER
+        )),
+        ("update_url_resource", lambda i: client.update_url_resource(
+            url_ids[i], {"notes": "Updated"}, SERVER
+        )),
+        ("get_kafka_details", lambda i: client.get_kafka_details()),
+        ("search_datasets", lambda i: client.search_datasets(
+            [f"{prefix}-kafka-{i}"], ["name"], SERVER
+        )),
+        ("advanced_search", lambda i: client.advanced_search(
+            {"search_term": f"topic-{i}", "server": SERVER}
+        )),
+        ("delete_resource_by_id", lambda i: client.delete_resource_by_id(
+            kafka_ids[i], SERVER
+        )),
+        ("delete_resource_by_name", lambda i: client.delete_resource_by_name(
+            f"{prefix}-s3-{i}", SERVER
+        )),
+        ("delete_organization", lambda i: client.delete_organization(
+            f"{prefix}-org-{i}", SERVER
+        )),
+    ]
+
+
+def run_level(server, concurrency, requests):
+    """Run every scenario at one concurrency level."""
+    client = APIClient(
+        server.url,
+        username=server.username,
+        password=server.password,
+        pool_maxsize=max(10, concurrency),
+    )
+    prefix = f"c{concurrency}"
+    client.register_organization({"name": f"{prefix}-owner"}, SERVER)
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for name, call in scenarios(client, prefix):
+
+                def timed(i, call=call):
+                    start = time.perf_counter()
+                    try:
+                        call(i)
+                        error = False
+                    except (ValueError, KeyError):
+                        error = True
+                    return time.perf_counter() - start, error
+
+                start = time.perf_counter()
+                samples = list(executor.map(timed, range(requests)))
+                elapsed = time.perf_counter() - start
+                latencies = sorted(duration for duration, _ in samples)
+                results.append(
+                    {
+                        "method": name,
+                        "concurrency": concurrency,
+                        "requests": requests,
+                        "errors": sum(1 for _, error in samples if error),
+                        "throughput": requests / elapsed,
+                        "p50": percentile(latencies, 0.50),
+                        "p95": percentile(latencies, 0.95),
+                        "p99": percentile(latencies, 0.99),
+                    }
+                )
+    finally:
+        client.close()
+    return results
+
+
+def print_table(results, out=sys.stdout):
+    header = (
+        f"{'method':<24} {'conc':>5} {'errors':>6} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for item in results:
+        print(
+            f"{item['method']:<24} {item['concurrency']:>5} "
+            f"{item['errors']:>6} {item['throughput']:>9.1f} "
+            f"{item['p50'] * 1000:>8.2f} {item['p95'] * 1000:>8.2f} "
+            f"{item['p99'] * 1000:>8.2f}",
+            file=out,
+        )
+
+
+def compare(results, baseline, tolerance):
+    """Return the (method, concurrency, old, new) p95 regressions."""
+    previous = {
+        (item["method"], item["concurrency"]): item for item in baseline
+    }
+    regressions = []
+    for item in results:
+        old = previous.get((item["method"], item["concurrency"]))
+        if old and item["p95"] > old["p95"] * (1 + tolerance):
+            regressions.append(
+                (item["method"], item["concurrency"], old["p95"], item["p95"])
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16, 64]
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0,
+        help="Seconds of latency injected by the fake server.",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0,
+        help="Fraction of requests the fake server fails with a 503.",
+    )
+    parser.add_argument("--save", help="Write the results to a JSON file.")
+    parser.add_argument("--baseline", help="Compare with saved results.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="Allowed relative p95 growth over the baseline.",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    with FakePOPServer(
+        latency=args.latency, error_rate=args.error_rate, seed=0
+    ) as server:
+        for concurrency in args.concurrency:
+            results.extend(run_level(server, concurrency, args.requests))
+    print_table(results)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for method, concurrency, old, new in regressions:
+            print(
+                f"REGRESSION {method} at concurrency {concurrency}: "
+                f"p95 {old * 1000:.2f} ms -> {new * 1000:.2f} ms"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
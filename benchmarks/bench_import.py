@@ -0,0 +1,113 @@
+"""
+Measure the import time of the pointofpresence package.
+
+Each statement runs in a fresh interpreter ``--runs`` times; the median
+wall time is reported next to a bare interpreter start-up, which is the
+floor any import can reach:
+
+    python benchmarks/bench_import.py --runs 20
+
+The time ``from pointofpresence import APIClient`` takes once requests,
+which it cannot avoid, is imported is reported on its own; compare it
+between revisions. The exit status is 1 when ``import pointofpresence``
+loads requests or httpx.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    ("interpreter start-up", "pass"),
+    ("import pointofpresence", "import pointofpresence"),
+    ("from pointofpresence import APIClient",
+     "from pointofpresence import APIClient"),
+    ("import requests", "import requests"),
+]
+
+
+def time_statement(statement, runs, env):
+    """Median seconds to run ``statement`` in a new interpreter."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], env=env, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def client_import_time(runs, env):
+    """Median seconds to import APIClient once requests is loaded."""
+    code = (
+        "import time, requests\n"
+        "start = time.perf_counter()\n"
+        "from pointofpresence import APIClient\n"
+        "print(time.perf_counter() - start)"
+    )
+    samples = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code], env=env, check=True,
+                stdout=subprocess.PIPE, universal_newlines=True,
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+    return statistics.median(samples)
+
+
+def loaded_modules(statement, env):
+    """Top-level modules loaded by ``statement``."""
+    code = (
+        f"{statement}\n"
+        "import sys\n"
+        "print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, check=True,
+        stdout=subprocess.PIPE, universal_newlines=True,
+    ).stdout
+    return set(output.split())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [root, env.get("PYTHONPATH")])
+    )
+
+    baseline = None
+    for label, statement in STATEMENTS:
+        median = time_statement(statement, args.runs, env)
+        if baseline is None:
+            baseline = median
+        print(
+            f"{label:<40} {median * 1000:>8.1f} ms "
+            f"(+{(median - baseline) * 1000:.1f} ms)"
+        )
+
+    heavy = {"requests", "urllib3", "httpx", "certifi"}
+    # Site hooks (.pth files) may preload some of them
+    eager = (
+        heavy & loaded_modules("import pointofpresence", env)
+    ) - loaded_modules("pass", env)
+    print(
+        "heavy modules loaded by 'import pointofpresence': "
+        + (", ".join(sorted(eager)) or "none")
+    )
+
+    client_ms = client_import_time(args.runs, env) * 1000
+    print(f"APIClient import on top of requests: {client_ms:.1f} ms")
+    return 1 if eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
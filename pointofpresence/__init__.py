@@ -1,33 +1,42 @@
 # pointofpresence/__init__.py
 
-from .register_kafka_method import APIClientKafkaRegister
-from .register_organization_method import APIClientOrganizationRegister
-from .register_s3_method import APIClientS3Register
-from .register_url_method import APIClientURLRegister
-from .list_organization_method import APIClientOrganizationList
-from .search_method import APIClientSearch
-from .update_kafka_method import APIClientKafkaUpdate
-from .update_s3_method import APIClientS3Update
-from .update_url_method import APIClientURLUpdate
-from .delete_organization_method import APIClientOrganizationDelete
-from .delete_resource_method import APIClientResourceDelete
-from .get_kafka_details_method import APIClientKafkaDetails
+# The clients and their mixins are imported on first access so that
+# importing the package does not load requests, urllib3 or httpx.
+import importlib
 
+_LAZY_EXPORTS = {
+    "APIClient": ".client",
+    "AsyncAPIClient": ".async_client",
+    "APIClientBase": ".client_base",
+    "APIClientKafkaRegister": ".register_kafka_method",
+    "APIClientOrganizationRegister": ".register_organization_method",
+    "APIClientS3Register": ".register_s3_method",
+    "APIClientURLRegister": ".register_url_method",
+    "APIClientOrganizationList": ".list_organization_method",
+    "APIClientSearch": ".search_method",
+    "APIClientKafkaUpdate": ".update_kafka_method",
+    "APIClientS3Update": ".update_s3_method",
+    "APIClientURLUpdate": ".update_url_method",
+    "APIClientOrganizationDelete": ".delete_organization_method",
+    "APIClientResourceDelete": ".delete_resource_method",
+    "APIClientKafkaDetails": ".get_kafka_details_method",
+    "APIClientBulkRegister": ".bulk_register_method",
+    "APIClientBulkDelete": ".bulk_delete_method",
+}
 
-class APIClient(
-    APIClientKafkaRegister,
-    APIClientOrganizationRegister,
-    APIClientS3Register,
-    APIClientURLRegister,
-    APIClientOrganizationList,
-    APIClientSearch,
-    APIClientKafkaUpdate,
-    APIClientS3Update,
-    APIClientURLUpdate,
-    APIClientOrganizationDelete,
-    APIClientResourceDelete,
-    APIClientKafkaDetails,
-):
-    """Unified API Client with GET, POST, and DELETE methods."""
+__all__ = list(_LAZY_EXPORTS)
 
-    pass
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,540 @@
+# pointofpresence/async_client.py
+
+import httpx
+from .client_base import APIClientBase
+
+
+class AsyncAPIClientBase:
+    """Base class for the asyncio API client."""
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str = None,
+        username: str = None,
+        password: str = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: float = None,
+    ):
+        """
+        Initialize the asyncio API client.
+
+        No I/O happens here: authentication (or the API availability check
+        when no credentials are given) runs in :meth:`open`, which is called
+        automatically when the client is used as an async context manager.
+
+        :param base_url: Base URL of the API.
+        :param token: Access token for authentication.
+        :param username: Username for authentication.
+        :param password: Password for authentication.
+        :param max_connections: Maximum number of concurrent connections in
+            the transport pool.
+        :param max_keepalive_connections: Maximum number of idle connections
+            kept alive in the pool.
+        :param timeout: Request timeout in seconds. Defaults to no timeout,
+            like the synchronous client.
+        """
+        self.base_url = APIClientBase._ensure_protocol(base_url).rstrip("/")
+        self.session = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=timeout,
+        )
+
+        # Initialize token to None by default
+        self.token = None
+
+        # Validate input combinations
+        if token and (username or password):
+            raise ValueError(
+                "Provide either a token or username/password, not both."
+            )
+
+        self._username = username
+        self._password = password
+
+        # Initialize with token if provided
+        if token:
+            self.token = token
+            self.session.headers.update(
+                {"Authorization": f"Bearer {self.token}"}
+            )
+
+    @classmethod
+    async def create(cls, *args, **kwargs):
+        """
+        Build a client and run :meth:`open` on it.
+
+        :return: A ready-to-use client.
+        """
+        client = cls(*args, **kwargs)
+        await client.open()
+        return client
+
+    async def open(self):
+        """
+        Authenticate with username/password or, when no credentials were
+        provided, check that the API is reachable.
+        """
+        if self.token:
+            return
+        if self._username and self._password:
+            await self.get_token(self._username, self._password)
+        else:
+            await self._check_api_availability()
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def _check_api_availability(self):
+        """
+        Check if the API is reachable by making a GET request to the base URL.
+        Raises a ValueError if the connection fails or the response is not 200.
+        """
+        try:
+            response = await self.session.get(self.base_url)
+            response.raise_for_status()
+        except httpx.ConnectError:
+            raise ValueError(
+                f"Failed to connect to the API at {self.base_url}. "
+                "Please check if the URL is correct and reachable."
+            )
+        except httpx.HTTPStatusError as http_err:
+            raise ValueError(
+                "API connection check failed with "
+                f"status code {response.status_code}: {http_err}"
+            )
+        except httpx.RequestError as req_err:
+            raise ValueError(
+                "An error occurred while attempting to connect "
+                f"to the API: {req_err}"
+            )
+
+    async def get_token(self, username: str, password: str):
+        """
+        Obtain authentication token.
+
+        :param username: Username for authentication.
+        :param password: Password for authentication.
+        """
+        url = f"{self.base_url}/token"
+        try:
+            response = await self.session.post(
+                url, data={"username": username, "password": password}
+            )
+            response.raise_for_status()
+            self.token = response.json().get("access_token")
+            if not self.token:
+                raise ValueError(
+                    "Authentication failed: No access token received."
+                )
+            # Update session headers with the token
+            self.session.headers.update(
+                {"Authorization": f"Bearer {self.token}"}
+            )
+        except httpx.ConnectError:
+            raise ValueError(
+                f"Failed to connect to the API at {self.base_url}. "
+                "Please check if the URL is correct and reachable."
+            )
+        except httpx.HTTPStatusError as http_err:
+            if response.status_code == 401:
+                raise ValueError(
+                    "Authentication failed: Invalid username or password."
+                ) from http_err
+            else:
+                raise ValueError(
+                    f"HTTP error occurred: {http_err}"
+                ) from http_err
+        except httpx.RequestError as req_err:
+            raise ValueError(
+                "An error occurred while attempting to obtain "
+                f"the token: {req_err}"
+            ) from req_err
+
+
+class AsyncAPIClient(AsyncAPIClientBase):
+    """
+    Unified asyncio API Client.
+
+    Exposes the same methods as :class:`pointofpresence.APIClient` as
+    coroutines, with the same ``ValueError`` error mapping, so that one
+    event loop can drive many catalog operations concurrently.
+    """
+
+    async def register_kafka_topic(self, data, server="local"):
+        """
+        Register a new Kafka topic by making a POST request.
+
+        :param data: Data for the Kafka topic.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :return: Response JSON data with the topic ID.
+        :raises ValueError: If the registration fails.
+        """
+        url = f"{self.base_url}/kafka"
+        params = {"server": server}
+
+        try:
+            response = await self.session.post(url, json=data, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "Organization does not exist" in error_detail:
+                raise ValueError(
+                    "Error creating Kafka dataset: Organization "
+                    "(owner_org) does not exist"
+                )
+            else:
+                raise ValueError(
+                    f"Error creating Kafka dataset: {error_detail}")
+
+    async def register_organization(self, data, server="local"):
+        """
+        Register a new organization by making a POST request.
+
+        :param data: Data for the organization.
+        :param server: CKAN instance
+            ("local" or "pre_ckan"). Defaults to "local".
+        :return: Response JSON data with the organization ID and message.
+        :raises ValueError: If the registration fails or name already exists.
+        """
+        url = f"{self.base_url}/organization"
+        params = {"server": server}
+        try:
+            response = await self.session.post(url, json=data, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "Group name already exists in database" in error_detail:
+                raise ValueError(
+                    "Error creating organization: Organization name "
+                    "already exists"
+                )
+            else:
+                raise ValueError(
+                    f"Error creating organization: {error_detail}"
+                )
+
+    async def register_s3_link(self, data, server="local"):
+        """
+        Register a new S3 link by making a POST request.
+
+        :param data: Data for the S3 link.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :return: Response JSON data with the link ID.
+        :raises ValueError: If the registration fails or organization
+                            does not exist.
+        """
+        url = f"{self.base_url}/s3"
+        params = {"server": server}
+        try:
+            response = await self.session.post(url, json=data, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "Organization does not exist" in error_detail:
+                raise ValueError(
+                    "Error creating S3 resource: Organization "
+                    "(owner_org) does not exist"
+                )
+            elif "Reserved key error" in error_detail:
+                raise ValueError(
+                    "Error creating S3 resource: Reserved key conflict."
+                )
+            else:
+                raise ValueError(f"Error creating S3 resource: {error_detail}")
+
+    async def register_url(self, data, server="local"):
+        """
+        Register a new URL resource by making a POST request.
+
+        :param data: Data for the URL resource.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :return: Response JSON data with the resource ID.
+        :raises ValueError: If the registration fails.
+        """
+        url = f"{self.base_url}/url"
+        params = {"server": server}
+        try:
+            response = await self.session.post(url, json=data, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "Organization does not exist" in error_detail:
+                raise ValueError(
+                    "Error creating URL resource: Organization "
+                    "(owner_org) does not exist."
+                )
+            elif "Group name already exists in database" in error_detail:
+                raise ValueError(
+                    "Error creating URL resource: Name already exists."
+                )
+            else:
+                raise ValueError(
+                    f"Error creating URL resource: {error_detail}"
+                )
+
+    async def list_organizations(self, name=None, server="global"):
+        """
+        List all organizations, with optional name filtering and server
+        selection.
+
+        :param name: Optional string to filter organizations by name.
+        :param server: The CKAN server to query ('local', 'global',
+        'pre_ckan').
+        :return: List of organization names.
+        :raises ValueError: If the retrieval fails.
+        """
+        url = f"{self.base_url}/organization"
+        params = {"server": server}
+        if name:
+            params["name"] = name
+
+        try:
+            response = await self.session.get(url, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            raise ValueError(f"Error listing organizations: {error_detail}")
+
+    async def search_datasets(self, terms, keys=None, server="global"):
+        """
+        Search datasets by a list of terms with optional key specifications.
+
+        :param terms: A list of terms to search for in the datasets.
+        :param keys: An optional list specifying the keys for each term.
+                     Use `None` for a global search for the corresponding term.
+        :param server: Specify the server to search on: 'local', 'global' or
+        'pre-ckan'.
+        :return: List of matching datasets.
+        :raises ValueError: If the search fails or validation fails.
+        """
+        if keys is not None:
+            if len(keys) != len(terms):
+                raise ValueError(
+                    "The number of terms must match the number of keys, "
+                    "or keys must be omitted."
+                )
+            keys = [key if key is not None else "null" for key in keys]
+
+        url = f"{self.base_url}/search"
+        payload = {"terms": terms, "server": server}
+        if keys:
+            payload["keys"] = keys
+
+        try:
+            response = await self.session.get(url, params=payload)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            raise ValueError(f"Error searching for datasets: {error_detail}")
+
+    async def advanced_search(self, search_data: dict) -> list:
+        """
+        Perform an advanced search using the POST /search endpoint.
+
+        :param search_data: A dict matching the 'SearchRequest' model.
+        :return: A list of matching datasets.
+        :raises ValueError: If the search or validation fails.
+        """
+        url = f"{self.base_url}/search"
+
+        try:
+            response = await self.session.post(url, json=search_data)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = ""
+            try:
+                error_detail = response.json().get("detail", str(e))
+            except Exception:
+                error_detail = str(e)
+            raise ValueError(f"Error in advanced search: {error_detail}")
+
+    async def update_kafka_topic(self, dataset_id, data, server="local"):
+        """
+        Update an existing Kafka topic by making a PUT request.
+
+        :param dataset_id: ID of the dataset to update.
+        :param data: Data for updating the Kafka topic.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :return: Response JSON data indicating success.
+        :raises ValueError: If the update fails.
+        """
+        url = f"{self.base_url}/kafka/{dataset_id}"
+        params = {"server": server}
+        try:
+            response = await self.session.put(url, json=data, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "Kafka dataset not found" in error_detail:
+                raise ValueError("Error updating Kafka dataset: Not found")
+            else:
+                raise ValueError(
+                    f"Error updating Kafka dataset: {error_detail}"
+                )
+
+    async def update_s3_resource(self, resource_id, data, server="local"):
+        """
+        Update an existing S3 resource by making a PUT request.
+
+        :param resource_id: ID of the resource to update.
+        :param data: Data for updating the S3 resource.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :return: Response JSON data indicating success.
+        :raises ValueError: If the update fails.
+        """
+        url = f"{self.base_url}/s3/{resource_id}"
+        params = {"server": server}
+        try:
+            response = await self.session.put(url, json=data, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "S3 resource not found" in error_detail:
+                raise ValueError("Error updating S3 resource: Not found")
+            else:
+                raise ValueError(f"Error updating S3 resource: {error_detail}")
+
+    async def update_url_resource(self, resource_id, data, server="local"):
+        """
+        Update an existing URL resource by making a PUT request.
+
+        :param resource_id: ID of the resource to update.
+        :param data: Data for updating the URL resource.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :return: Response JSON data indicating success.
+        :raises ValueError: If the update fails.
+        """
+        url = f"{self.base_url}/url/{resource_id}"
+        params = {"server": server}
+        try:
+            response = await self.session.put(url, json=data, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "Resource not found" in error_detail:
+                raise ValueError("Error updating URL resource: Not found")
+            else:
+                raise ValueError(
+                    f"Error updating URL resource: {error_detail}"
+                )
+
+    async def delete_organization(self, organization_name, server="local"):
+        """
+        Delete an organization by making a DELETE request.
+
+        :param organization_name: Name of the organization to delete.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :return: Response JSON data indicating success.
+        :raises ValueError: If the deletion fails.
+        """
+        url = f"{self.base_url}/organization/{organization_name}"
+        params = {"server": server}
+
+        try:
+            response = await self.session.delete(url, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "Organization not found" in error_detail:
+                raise ValueError("Error deleting organization: Not found")
+            else:
+                raise ValueError(
+                    f"Error deleting organization: {error_detail}")
+
+    async def delete_resource_by_id(self, resource_id, server="local"):
+        """
+        Delete a resource by its ID by making a DELETE request.
+
+        :param resource_id: ID of the resource to delete.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :return: Response JSON data indicating success.
+        :raises ValueError: If the deletion fails.
+        """
+        url = f"{self.base_url}/resource"
+        params = {"resource_id": resource_id, "server": server}
+
+        try:
+            response = await self.session.delete(url, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "Resource not found" in error_detail:
+                raise ValueError("Error deleting resource: Not found")
+            else:
+                raise ValueError(f"Error deleting resource: {error_detail}")
+
+    async def delete_resource_by_name(self, resource_name, server="local"):
+        """
+        Delete a resource by its name by making a DELETE request.
+        """
+        url = f"{self.base_url}/resource/{resource_name}"
+        params = {"server": server}
+
+        try:
+            response = await self.session.delete(url, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = response.json().get("detail", str(e))
+            if "Resource not found" in error_detail:
+                raise ValueError("Error deleting resource: Not found")
+            else:
+                raise ValueError(f"Error deleting resource: {error_detail}")
+
+    async def get_kafka_details(self):
+        """
+        Fetch Kafka connection details from the API.
+
+        Returns
+        -------
+        dict
+            Kafka connection details including 'kafka_host', 'kafka_port',
+            and 'kafka_connection'.
+
+        Raises
+        ------
+        ValueError
+            If the API response contains an error or is unreachable.
+        """
+        endpoint = f"{self.base_url}/status/kafka-details"
+        try:
+            response = await self.session.get(endpoint)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as http_err:
+            raise ValueError(
+                f"Failed to fetch Kafka details: {http_err}"
+            ) from http_err
+        except httpx.RequestError as req_err:
+            raise ValueError(
+                "An error occurred while fetching Kafka " f"details: {req_err}"
+            ) from req_err
+        except ValueError as json_err:
+            raise ValueError(
+                "An error occurred while parsing Kafka " f"details: {json_err}"
+            ) from json_err
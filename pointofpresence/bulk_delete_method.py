@@ -0,0 +1,129 @@
+# pointofpresence/bulk_delete_method.py
+
+import re
+from .concurrency import BulkResult, bounded_map
+from .delete_organization_method import APIClientOrganizationDelete
+from .delete_resource_method import APIClientResourceDelete
+from .ratelimit import TokenBucket
+from .search_method import APIClientSearch
+
+DELETED = "deleted"
+NOT_FOUND = "not found"
+
+_UUID = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I
+)
+
+
+def _is_not_found(error):
+    """True for the 'Not found' errors of the deletion methods."""
+    return isinstance(error, ValueError) and str(error).endswith(
+        ": Not found"
+    )
+
+
+def _report(results):
+    """Turn 'Not found' errors into successful "not found" results."""
+    for result in results:
+        if _is_not_found(result.error):
+            yield BulkResult(result.index, result.item, NOT_FOUND, None)
+        else:
+            yield result
+
+
+class APIClientBulkDelete(
+    APIClientSearch, APIClientOrganizationDelete, APIClientResourceDelete
+):
+    """
+    Extension of the deletion clients with concurrent bulk methods.
+
+    Deletions run on a thread pool capped at ``max_workers`` and, when
+    ``rate`` is given, at that many requests per second. Each item is
+    reported as a :class:`pointofpresence.concurrency.BulkResult` whose
+    ``result`` is ``"deleted"`` or ``"not found"``; any other failure is
+    reported in ``error`` with the ValueError the single-item method
+    raised.
+    """
+
+    def delete_resources_many(
+        self, ids_or_names, server="local", by="auto", max_workers=8,
+        rate=None,
+    ):
+        """
+        Delete many resources concurrently.
+
+        :param ids_or_names: Iterable of resource IDs or names.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :param by: 'id', 'name', or 'auto' to delete UUIDs by ID and
+            anything else by name.
+        :param max_workers: Maximum number of concurrent requests.
+        :param rate: Maximum number of requests per second, or None.
+        :return: Generator of BulkResult in completion order.
+        :raises ValueError: If ``by`` is not 'id', 'name' or 'auto'.
+        """
+        if by not in ("id", "name", "auto"):
+            raise ValueError("by must be one of 'id', 'name' or 'auto'.")
+        bucket = TokenBucket(rate, burst=1) if rate else None
+
+        def delete(item):
+            if bucket is not None:
+                bucket.acquire()
+            if by == "id" or (by == "auto" and _UUID.match(str(item))):
+                self.delete_resource_by_id(item, server=server)
+            else:
+                self.delete_resource_by_name(item, server=server)
+            return DELETED
+
+        return _report(bounded_map(delete, ids_or_names, max_workers))
+
+    def delete_organization(
+        self, organization_name, server="local", cascade=False,
+        max_workers=8, rate=None,
+    ):
+        """
+        Delete an organization, optionally with all of its resources.
+
+        With ``cascade``, the datasets owned by the organization are found
+        with ``iter_search`` and deleted concurrently (see
+        :meth:`delete_resources_many`) before the organization itself. If
+        any of them cannot be deleted, the organization is kept.
+
+        :param organization_name: Name of the organization to delete.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :param cascade: Delete the organization's resources first.
+        :param max_workers: Maximum number of concurrent deletions.
+        :param rate: Maximum number of deletions per second, or None.
+        :return: Response JSON data indicating success. With ``cascade``,
+            its ``resources`` key maps each resource ID to "deleted" or
+            "not found".
+        :raises ValueError: If the deletion fails.
+        """
+        if not cascade:
+            return super().delete_organization(organization_name, server)
+
+        dataset_ids = [
+            dataset["id"]
+            for dataset in self.iter_search(
+                [organization_name], ["owner_org"], server=server
+            )
+            if organization_name in (
+                dataset.get("owner_org"),
+                (dataset.get("organization") or {}).get("name"),
+            )
+        ]
+        report = {}
+        errors = []
+        for result in self.delete_resources_many(
+            dataset_ids, server, by="id", max_workers=max_workers, rate=rate
+        ):
+            if result.ok:
+                report[result.item] = result.result
+            else:
+                errors.append(f"{result.item}: {result.error}")
+        if errors:
+            raise ValueError(
+                f"Error deleting organization: {len(errors)} resources "
+                "could not be deleted: " + "; ".join(sorted(errors))
+            )
+        response = super().delete_organization(organization_name, server)
+        return dict(response, resources=report)
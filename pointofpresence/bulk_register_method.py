@@ -0,0 +1,92 @@
+# pointofpresence/bulk_register_method.py
+
+from .concurrency import bounded_map
+from .register_kafka_method import APIClientKafkaRegister
+from .register_s3_method import APIClientS3Register
+from .register_url_method import APIClientURLRegister
+from .validation import VALIDATORS
+
+
+class APIClientBulkRegister(
+    APIClientKafkaRegister, APIClientS3Register, APIClientURLRegister
+):
+    """
+    Extension of the registration clients with concurrent bulk methods.
+
+    Every bulk method returns a generator of
+    :class:`pointofpresence.concurrency.BulkResult`, yielded as requests
+    complete. ``result`` holds the response JSON of a successful
+    registration and ``error`` the same ``ValueError`` the single-item
+    method would have raised. All requests share the client session and
+    its connection pool, so ``max_workers`` should not exceed the pool
+    size.
+
+    With ``validate=True`` each item is validated in-process as it is
+    taken from ``items``; an invalid item is not sent and its result
+    holds the PayloadValidationError. Items are still read lazily, so
+    validation keeps the constant memory use of the bulk methods.
+    """
+
+    def register_url_many(
+        self, items, server="local", max_workers=8, validate=False
+    ):
+        """
+        Register many URL resources concurrently.
+
+        :param items: Iterable of URL resource payloads.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :param max_workers: Maximum number of concurrent requests.
+        :param validate: Validate each item before sending it.
+        :return: Generator of BulkResult in completion order.
+        """
+        return self._register_many(
+            self.register_url, "url", items, server, max_workers, validate
+        )
+
+    def register_s3_links_many(
+        self, items, server="local", max_workers=8, validate=False
+    ):
+        """
+        Register many S3 links concurrently.
+
+        :param items: Iterable of S3 link payloads.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :param max_workers: Maximum number of concurrent requests.
+        :param validate: Validate each item before sending it.
+        :return: Generator of BulkResult in completion order.
+        """
+        return self._register_many(
+            self.register_s3_link, "s3", items, server, max_workers, validate
+        )
+
+    def register_kafka_topics_many(
+        self, items, server="local", max_workers=8, validate=False
+    ):
+        """
+        Register many Kafka topics concurrently.
+
+        :param items: Iterable of Kafka topic payloads.
+        :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+        :param max_workers: Maximum number of concurrent requests.
+        :param validate: Validate each item before sending it.
+        :return: Generator of BulkResult in completion order.
+        """
+        return self._register_many(
+            self.register_kafka_topic,
+            "kafka",
+            items,
+            server,
+            max_workers,
+            validate,
+        )
+
+    @staticmethod
+    def _register_many(register, kind, items, server, max_workers, validate):
+        check = VALIDATORS[kind] if validate else None
+
+        def send(data):
+            if check is not None:
+                check(data)
+            return register(data, server=server)
+
+        return bounded_map(send, items, max_workers=max_workers)
@@ -0,0 +1,102 @@
+# pointofpresence/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with per-entry expiry and LRU eviction.
+
+    Entries can be tagged (for example with the server they were read
+    from) so that related entries can be invalidated together.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        """
+        :param maxsize: Maximum number of entries. The least recently used
+            entry is evicted when it is exceeded.
+        :param ttl: Seconds an entry stays valid.
+        :raises ValueError: If maxsize is lower than 1.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up ``key``.
+
+        :param key: Hashable cache key.
+        :return: A ``(found, value)`` tuple.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value, tag=None):
+        """
+        Store ``value`` under ``key``.
+
+        :param key: Hashable cache key.
+        :param value: Value to cache.
+        :param tag: Optional tag used by :meth:`invalidate`.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value, tag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tag):
+        """
+        Drop every entry stored with ``tag``.
+
+        :param tag: Tag given to :meth:`set`.
+        :return: Number of entries removed.
+        """
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if entry[2] == tag
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        :return: Dict with hits, misses, evictions and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
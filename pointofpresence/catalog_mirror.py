@@ -0,0 +1,475 @@
+# pointofpresence/catalog_mirror.py
+
+import json
+import sqlite3
+import threading
+import time
+from .concurrency import bounded_map
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS organizations (
+    server TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (server, name)
+);
+CREATE TABLE IF NOT EXISTS datasets (
+    row_id INTEGER PRIMARY KEY,
+    server TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    owner_org TEXT,
+    metadata_modified TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (server, id)
+);
+CREATE TABLE IF NOT EXISTS fields (
+    server TEXT NOT NULL,
+    dataset_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS fields_dataset ON fields (server, dataset_id);
+CREATE INDEX IF NOT EXISTS fields_key ON fields (server, key);
+CREATE TABLE IF NOT EXISTS sync_state (
+    server TEXT PRIMARY KEY,
+    synced_at REAL,
+    high_water_mark TEXT
+);
+"""
+
+
+def flatten(value, prefix=""):
+    """
+    Yield ``(key, text)`` pairs for every scalar in a dataset.
+
+    Nested keys are joined with dots, and list items share the key of the
+    list, so ``{"resources": [{"url": u}]}`` yields ``("resources.url", u)``
+    and ``{"extras": {"key1": v}}`` yields ``("extras.key1", v)``.
+
+    :param value: Decoded dataset, or part of it.
+    :param prefix: Key of ``value`` itself.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten(item, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(value, list):
+        for item in value:
+            yield from flatten(item, prefix)
+    elif value is not None:
+        yield prefix, value if isinstance(value, str) else json.dumps(value)
+
+
+def _like_pattern(term):
+    escaped = (
+        term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    )
+    return f"%{escaped}%"
+
+
+class CatalogMirror:
+    """
+    Local SQLite copy of the catalog of one POP server.
+
+    :meth:`sync` downloads the organizations and their datasets, and
+    :meth:`search_datasets` answers ``search_datasets(terms, keys)``
+    queries from the local database, returning the datasets exactly as
+    the API sent them. Global terms use an FTS5 trigram index when the
+    SQLite build provides one and a LIKE scan otherwise; key-specific
+    terms such as ``extras.key1`` use an index of the flattened dataset
+    fields. Terms match case-insensitively as substrings.
+
+    Several mirrors (one per server) can share a database file. A mirror
+    can be used from several threads.
+    """
+
+    def __init__(self, client, path: str = ":memory:", server="global"):
+        """
+        :param client: APIClient used to download the catalog.
+        :param path: SQLite database file, or ``":memory:"``.
+        :param server: The server to mirror ('local', 'global',
+            'pre_ckan').
+        """
+        self.client = client
+        self.server = server
+        self.path = path
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._drop_unkeyed_tables()
+            self._db.executescript(_SCHEMA)
+        self.full_text = self._create_full_text_index()
+
+    def _drop_unkeyed_tables(self):
+        """
+        Drop the catalog of a database created before ``datasets`` had a
+        ``row_id`` key, so that the next sync downloads it again.
+        """
+        columns = [
+            row[1]
+            for row in self._db.execute("PRAGMA table_info(datasets)")
+        ]
+        if not columns or "row_id" in columns:
+            return
+        for table in ("datasets", "fields", "datasets_fts", "sync_state"):
+            self._db.execute(f"DROP TABLE IF EXISTS {table}")
+
+    def _create_full_text_index(self):
+        """
+        Create the table of searchable text.
+
+        :return: True if it is an FTS5 trigram index, which answers
+            substring queries of three or more characters.
+        """
+        try:
+            with self._db:
+                self._db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS datasets_fts "
+                    "USING fts5(server UNINDEXED, id UNINDEXED, text, "
+                    "tokenize='trigram')"
+                )
+            return True
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 or older than 3.34: scan with LIKE
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS datasets_fts "
+                    "(row_id INTEGER PRIMARY KEY, server TEXT, id TEXT, "
+                    "text TEXT)"
+                )
+            return False
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM datasets WHERE server = ?",
+                (self.server,),
+            ).fetchone()[0]
+
+    def sync(self, max_workers: int = 8) -> dict:
+        """
+        Replace the local copy with the current catalog of the server.
+
+        Organizations are listed with ``list_organizations`` and their
+        datasets are fetched concurrently with
+        ``iter_search([org], ["owner_org"])``. The database is only
+        modified once every organization was fetched successfully.
+
+        :param max_workers: Number of organizations fetched concurrently.
+        :return: Dict with the number of ``organizations`` and
+            ``datasets`` mirrored.
+        :raises ValueError: If listing the organizations or fetching the
+            datasets of one of them fails.
+        """
+        started = time.time()
+        organizations = self.client.list_organizations(server=self.server)
+        datasets = {}
+        for result in bounded_map(
+            self._fetch_organization, organizations, max_workers=max_workers
+        ):
+            if not result.ok:
+                raise ValueError(
+                    f"Error syncing organization {result.item}: "
+                    f"{result.error}"
+                ) from result.error
+            for dataset in result.result:
+                datasets[dataset["id"]] = dataset
+
+        with self._lock, self._db:
+            for table in ("organizations", "datasets", "fields"):
+                self._db.execute(
+                    f"DELETE FROM {table} WHERE server = ?", (self.server,)
+                )
+            self._db.execute(
+                "DELETE FROM datasets_fts WHERE server = ?", (self.server,)
+            )
+            self._db.executemany(
+                "INSERT INTO organizations VALUES (?, ?)",
+                [(self.server, name) for name in organizations],
+            )
+            for dataset in datasets.values():
+                self._insert(dataset)
+            self._set_sync_state(started, self._high_water_mark())
+        return {"organizations": len(organizations), "datasets": len(datasets)}
+
+    def sync_delta(self, max_workers: int = 8) -> dict:
+        """
+        Update the local copy with the changes since the last sync.
+
+        The newest ``metadata_modified`` seen so far is kept per server as
+        a high-water mark. Each known organization is asked concurrently
+        for the datasets modified at or after it, with an advanced search
+        filtered by ``owner_org`` and a ``metadata_modified`` range.
+        Returned datasets are upserted, and those whose ``state`` is
+        ``deleted`` are removed. New organizations are fetched in full and
+        the datasets of vanished ones are dropped. Without a previous sync
+        this is a full :meth:`sync`.
+
+        Deletions are only seen if the server reports them as deleted
+        datasets in range queries; run a full sync periodically to
+        reconcile otherwise.
+
+        :param max_workers: Number of organizations fetched concurrently.
+        :return: Dict with the number of ``organizations`` and the
+            ``upserted`` and ``deleted`` datasets, and ``full`` set to True
+            if a full sync was run instead.
+        :raises ValueError: If a request fails; the local copy is then left
+            unchanged.
+        """
+        high_water_mark = self.sync_state()["high_water_mark"]
+        if high_water_mark is None:
+            stats = self.sync(max_workers=max_workers)
+            return {
+                "organizations": stats["organizations"],
+                "upserted": stats["datasets"],
+                "deleted": 0,
+                "full": True,
+            }
+
+        started = time.time()
+        organizations = self.client.list_organizations(server=self.server)
+        known = set(self.organizations())
+        # Organizations new since the last sync are fetched in full
+        jobs = [
+            (name, high_water_mark if name in known else None)
+            for name in organizations
+        ]
+        changed = {}
+        for result in bounded_map(
+            self._fetch_changes, jobs, max_workers=max_workers
+        ):
+            if not result.ok:
+                raise ValueError(
+                    f"Error syncing organization {result.item[0]}: "
+                    f"{result.error}"
+                ) from result.error
+            for dataset in result.result:
+                changed[dataset["id"]] = dataset
+
+        upserted = deleted = 0
+        newest = high_water_mark
+        with self._lock, self._db:
+            for name in known.difference(organizations):
+                rows = self._db.execute(
+                    "SELECT id FROM datasets WHERE server = ? "
+                    "AND owner_org = ?",
+                    (self.server, name),
+                ).fetchall()
+                for (dataset_id,) in rows:
+                    self._delete(dataset_id)
+                deleted += len(rows)
+                self._db.execute(
+                    "DELETE FROM organizations WHERE server = ? AND name = ?",
+                    (self.server, name),
+                )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO organizations VALUES (?, ?)",
+                [(self.server, name) for name in organizations],
+            )
+            for dataset_id, dataset in changed.items():
+                modified = dataset.get("metadata_modified")
+                if modified and modified > newest:
+                    newest = modified
+                if dataset.get("state") == "deleted":
+                    if self.get(dataset_id) is not None:
+                        deleted += 1
+                    self._delete(dataset_id)
+                else:
+                    self._insert(dataset)
+                    upserted += 1
+            self._set_sync_state(started, newest)
+        return {
+            "organizations": len(organizations),
+            "upserted": upserted,
+            "deleted": deleted,
+            "full": False,
+        }
+
+    def _fetch_changes(self, job):
+        """Datasets of an organization modified since ``since``, or all."""
+        organization, since = job
+        if since is None:
+            return self._fetch_organization(organization)
+        return list(
+            self.client.iter_advanced_search(
+                {
+                    "filter_list": [
+                        f"owner_org:{organization}",
+                        f"metadata_modified:[{since} TO *]",
+                    ],
+                    "server": self.server,
+                }
+            )
+        )
+
+    def _fetch_organization(self, organization):
+        return list(
+            self.client.iter_search(
+                [organization], ["owner_org"], server=self.server
+            )
+        )
+
+    def _insert(self, dataset):
+        """Upsert one dataset; the caller holds the lock and transaction."""
+        dataset_id = dataset["id"]
+        self._delete(dataset_id)
+        fields = list(flatten(dataset))
+        cursor = self._db.execute(
+            "INSERT INTO datasets (server, id, name, owner_org, "
+            "metadata_modified, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self.server,
+                dataset_id,
+                dataset.get("name"),
+                dataset.get("owner_org"),
+                dataset.get("metadata_modified"),
+                json.dumps(dataset),
+            ),
+        )
+        self._db.executemany(
+            "INSERT INTO fields VALUES (?, ?, ?, ?)",
+            [
+                (self.server, dataset_id, key, str(value))
+                for key, value in fields
+            ],
+        )
+        # The text row is linked to the dataset row by its row_id, which
+        # unlike an implicit rowid is kept by VACUUM
+        self._db.execute(
+            "INSERT INTO datasets_fts (rowid, server, id, text) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                cursor.lastrowid,
+                self.server,
+                dataset_id,
+                "\n".join(str(value) for _, value in fields),
+            ),
+        )
+
+    def _delete(self, dataset_id):
+        """Delete one dataset; the caller holds the lock and transaction."""
+        row = self._db.execute(
+            "SELECT row_id FROM datasets WHERE server = ? AND id = ?",
+            (self.server, dataset_id),
+        ).fetchone()
+        if row is None:
+            return
+        self._db.execute("DELETE FROM datasets WHERE row_id = ?", row)
+        self._db.execute("DELETE FROM datasets_fts WHERE rowid = ?", row)
+        self._db.execute(
+            "DELETE FROM fields WHERE server = ? AND dataset_id = ?",
+            (self.server, dataset_id),
+        )
+
+    def _high_water_mark(self):
+        return self._db.execute(
+            "SELECT MAX(metadata_modified) FROM datasets WHERE server = ?",
+            (self.server,),
+        ).fetchone()[0]
+
+    def _set_sync_state(self, synced_at, high_water_mark):
+        self._db.execute(
+            "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+            (self.server, synced_at, high_water_mark),
+        )
+
+    def sync_state(self) -> dict:
+        """
+        Return when the mirror was last synced.
+
+        :return: Dict with ``synced_at`` (seconds since the epoch) and
+            ``high_water_mark`` (newest ``metadata_modified`` seen), both
+            None if the mirror was never synced.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT synced_at, high_water_mark FROM sync_state "
+                "WHERE server = ?",
+                (self.server,),
+            ).fetchone()
+        synced_at, high_water_mark = row or (None, None)
+        return {"synced_at": synced_at, "high_water_mark": high_water_mark}
+
+    def organizations(self) -> list:
+        """Return the mirrored organization names."""
+        with self._lock:
+            return [
+                row[0] for row in self._db.execute(
+                    "SELECT name FROM organizations WHERE server = ? "
+                    "ORDER BY name",
+                    (self.server,),
+                )
+            ]
+
+    def get(self, dataset_id):
+        """
+        Return a mirrored dataset by ID, or None.
+
+        :param dataset_id: ID of the dataset.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM datasets WHERE server = ? AND id = ?",
+                (self.server, dataset_id),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def search_datasets(self, terms, keys=None) -> list:
+        """
+        Search the mirrored datasets like ``APIClient.search_datasets``.
+
+        :param terms: A list of terms; a dataset must match all of them.
+        :param keys: An optional list specifying the key of each term
+            (for example ``"name"`` or ``"extras.key1"``). Use None for a
+            search over every field.
+        :return: List of matching datasets, in the API result shape.
+        :raises ValueError: If terms and keys lengths differ.
+        """
+        if keys is None:
+            keys = [None] * len(terms)
+        elif len(keys) != len(terms):
+            raise ValueError(
+                "The number of terms must match the number of keys, "
+                "or keys must be omitted."
+            )
+
+        conditions = []
+        params = [self.server]
+        for term, key in zip(terms, keys):
+            term = str(term)
+            if key is None or key == "null":
+                if self.full_text and len(term) >= 3:
+                    conditions.append(
+                        "row_id IN (SELECT rowid FROM datasets_fts "
+                        "WHERE datasets_fts MATCH ?)"
+                    )
+                    params.append('"' + term.replace('"', '""') + '"')
+                else:
+                    conditions.append(
+                        "row_id IN (SELECT rowid FROM datasets_fts "
+                        "WHERE text LIKE ? ESCAPE '\\')"
+                    )
+                    params.append(_like_pattern(term))
+            else:
+                conditions.append(
+                    "id IN (SELECT dataset_id FROM fields WHERE server = ? "
+                    "AND key = ? AND value LIKE ? ESCAPE '\\')"
+                )
+                params.extend([self.server, key, _like_pattern(term)])
+
+        query = "SELECT data FROM datasets WHERE server = ?"
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+        query += " ORDER BY name"
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
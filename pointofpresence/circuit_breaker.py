@@ -0,0 +1,212 @@
+# pointofpresence/circuit_breaker.py
+
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ValueError):
+    """Raised instead of sending a request to a server whose circuit is
+    open."""
+
+    def __init__(self, base_url, server, retry_after):
+        self.base_url = base_url
+        self.server = server
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuit open for server '{server}' at {base_url}: failing "
+            f"fast for another {retry_after:.1f} s."
+        )
+
+
+class _Circuit:
+    """State of one (base_url, server) circuit."""
+
+    __slots__ = ("state", "failures", "opened_at", "probes", "trips")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.trips = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker per API base URL and POP server.
+
+    A circuit opens after ``failure_threshold`` consecutive failures.
+    Connection errors, timeouts and 5xx responses are failures, and so
+    are responses slower than ``latency_slo`` seconds when it is set.
+    While a circuit is open, requests to that server raise
+    CircuitOpenError at once instead of waiting for another failure.
+    After ``reset_timeout`` seconds the circuit half-opens: up to
+    ``half_open_probes`` requests are let through as probes, and the
+    circuit closes again on the first successful probe or reopens on a
+    failed one.
+
+    The other servers of the same API keep their own circuits. A breaker
+    is thread-safe and can be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        latency_slo: float = None,
+        half_open_probes: int = 1,
+    ):
+        """
+        :param failure_threshold: Consecutive failures that open a circuit.
+        :param reset_timeout: Seconds a circuit stays open before probing.
+        :param latency_slo: Optional response time, in seconds, above
+            which a response counts as a failure.
+        :param half_open_probes: Concurrent probe requests allowed while
+            half-open.
+        :raises ValueError: If a threshold is not positive.
+        """
+        if failure_threshold < 1 or half_open_probes < 1:
+            raise ValueError(
+                "failure_threshold and half_open_probes must be at least 1."
+            )
+        if reset_timeout < 0:
+            raise ValueError("reset_timeout must not be negative.")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_slo = latency_slo
+        self.half_open_probes = half_open_probes
+        self.rejected = 0
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, base_url, server):
+        key = (base_url, server)
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+        return circuit
+
+    def before_request(self, base_url: str, server):
+        """
+        Check that a request may be sent.
+
+        :param base_url: Base URL of the API.
+        :param server: Server the request targets, or None.
+        :raises CircuitOpenError: If the circuit is open, or half-open
+            with every probe slot taken.
+        """
+        with self._lock:
+            circuit = self._circuit(base_url, server)
+            if circuit.state == CLOSED:
+                return
+            remaining = circuit.opened_at + self.reset_timeout - (
+                time.monotonic()
+            )
+            if circuit.state == OPEN and remaining <= 0:
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+            if (
+                circuit.state == HALF_OPEN
+                and circuit.probes < self.half_open_probes
+            ):
+                circuit.probes += 1
+                return
+            self.rejected += 1
+        raise CircuitOpenError(base_url, server, max(0.0, remaining))
+
+    def record(self, base_url: str, server, ok: bool, duration: float):
+        """
+        Record the outcome of a request let through by
+        :meth:`before_request`.
+
+        :param base_url: Base URL of the API.
+        :param server: Server the request targeted, or None.
+        :param ok: False for a connection error, timeout or 5xx response.
+        :param duration: Response time in seconds.
+        """
+        if self.latency_slo is not None and duration > self.latency_slo:
+            ok = False
+        with self._lock:
+            circuit = self._circuit(base_url, server)
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                if ok:
+                    circuit.state = CLOSED
+                    circuit.failures = 0
+                else:
+                    self._trip(circuit)
+            elif ok:
+                circuit.failures = 0
+            elif circuit.state == CLOSED:
+                circuit.failures += 1
+                if circuit.failures >= self.failure_threshold:
+                    self._trip(circuit)
+
+    @staticmethod
+    def _trip(circuit):
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.trips += 1
+
+    def state(self, base_url: str, server) -> str:
+        """
+        Return the state of a circuit: 'closed', 'open' or 'half_open'.
+
+        An open circuit whose reset timeout elapsed is reported as
+        'half_open', since the next request will be a probe.
+        """
+        with self._lock:
+            circuit = self._circuits.get((base_url, server))
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and (
+                time.monotonic() - circuit.opened_at >= self.reset_timeout
+            ):
+                return HALF_OPEN
+            return circuit.state
+
+    def reset(self, base_url: str = None, server=None):
+        """
+        Close circuits by hand.
+
+        :param base_url: Only close the circuits of this API.
+        :param server: Only close the circuits of this server.
+        """
+        with self._lock:
+            for key in list(self._circuits):
+                if base_url is not None and key[0] != base_url:
+                    continue
+                if server is not None and key[1] != server:
+                    continue
+                del self._circuits[key]
+
+    def stats(self) -> dict:
+        """
+        Return the circuits and counters.
+
+        :return: Dict with ``rejected`` (requests failed fast) and
+            ``circuits``, a list of dicts with ``base_url``, ``server``,
+            ``state``, ``failures`` and ``trips``.
+        """
+        with self._lock:
+            keys = list(self._circuits)
+            rejected = self.rejected
+        circuits = []
+        for base_url, server in keys:
+            circuit = self._circuits.get((base_url, server))
+            if circuit is None:
+                continue
+            circuits.append(
+                {
+                    "base_url": base_url,
+                    "server": server,
+                    "state": self.state(base_url, server),
+                    "failures": circuit.failures,
+                    "trips": circuit.trips,
+                }
+            )
+        return {"rejected": rejected, "circuits": circuits}
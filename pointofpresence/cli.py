@@ -0,0 +1,122 @@
+# pointofpresence/cli.py
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(
+        prog="pop", description="Point of Presence command line client."
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    importer = commands.add_parser(
+        "import",
+        help="Register the datasets of a CSV or JSON Lines metadata file.",
+    )
+    importer.add_argument("path", help='Metadata file, or "-" for stdin.')
+    importer.add_argument(
+        "--url",
+        default=os.environ.get("POP_URL"),
+        help="Base URL of the API (default: $POP_URL).",
+    )
+    importer.add_argument(
+        "--token",
+        default=os.environ.get("POP_TOKEN"),
+        help="Access token (default: $POP_TOKEN).",
+    )
+    importer.add_argument(
+        "--username",
+        default=os.environ.get("POP_USERNAME"),
+        help="Username (default: $POP_USERNAME).",
+    )
+    importer.add_argument(
+        "--password",
+        default=os.environ.get("POP_PASSWORD"),
+        help="Password (default: $POP_PASSWORD).",
+    )
+    importer.add_argument(
+        "--server",
+        default="local",
+        choices=["local", "pre_ckan"],
+        help="Server to register in (default: local).",
+    )
+    importer.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        help="File format (default: from the file extension).",
+    )
+    importer.add_argument(
+        "--results",
+        help="Write one JSON line per record with its ID or error.",
+    )
+    importer.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent registrations (default: 8).",
+    )
+    importer.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Map and check the records without registering them.",
+    )
+    return parser
+
+
+def _import(args):
+    from .client import APIClient
+    from .importer import import_file
+
+    client = None
+    if not args.dry_run:
+        if not args.url:
+            raise ValueError(
+                "The API URL is required: use --url or $POP_URL."
+            )
+        client = APIClient(
+            args.url,
+            token=args.token,
+            username=args.username if not args.token else None,
+            password=args.password if not args.token else None,
+            pool_maxsize=max(10, args.workers),
+        )
+    try:
+        return import_file(
+            client,
+            args.path,
+            results_path=args.results,
+            server=args.server,
+            format=args.format,
+            max_workers=args.workers,
+            dry_run=args.dry_run,
+        )
+    finally:
+        if client is not None:
+            client.close()
+
+
+def main(argv=None) -> int:
+    """
+    Entry point of the ``pop`` command.
+
+    :param argv: Command line arguments; defaults to ``sys.argv[1:]``.
+    :return: Exit status: 0 on success, 1 if any record failed, 2 on
+        usage or connection errors.
+    """
+    args = _build_parser().parse_args(argv)
+    try:
+        summary = _import(args)
+    except (OSError, ValueError, csv.Error) as err:
+        print(f"pop: error: {err}", file=sys.stderr)
+        return 2
+    print(json.dumps(summary))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
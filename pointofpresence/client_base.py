@@ -1,6 +1,28 @@
 # pointofpresence/client_base.py
+import threading
+import weakref
 import requests
 from urllib.parse import urlparse
+from .circuit_breaker import CircuitBreaker
+from .codec import JSONCodec, get_codec
+from .compression import BodyCompressor, accept_encoding
+from .failover import EndpointPool
+from .http_cache import (
+    CachingHTTPAdapter,
+    FileCacheBackend,
+    MemoryCacheBackend,
+)
+from .metrics import MetricsRecorder
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .token_manager import TokenManager
+from .transport import POPSession, PooledHTTPAdapter
+from .validation import validate as validate_payload
+
+# Base URLs that passed the availability check in this process
+_available_base_urls = set()
+_available_lock = threading.Lock()
 
 
 class APIClientBase:
@@ -8,21 +30,169 @@ class APIClientBase:
 
     def __init__(
         self,
-        base_url: str,
+        base_url,
         token: str = None,
         username: str = None,
         password: str = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        pool_idle_timeout: float = None,
+        warmup_connections: int = 0,
+        retry: RetryPolicy = None,
+        lazy: bool = False,
+        token_cache=None,
+        token_refresh_margin: float = 60.0,
+        codec=None,
+        metrics=False,
+        http_cache=None,
+        rate_limit=None,
+        circuit_breaker=None,
+        probe_interval: float = 30.0,
+        coalesce: bool = False,
+        compression=None,
+        validate: bool = False,
     ):
         """
         Initialize the API client.
 
-        :param base_url: Base URL of the API.
+        :param base_url: Base URL of the API, or a list of the base URLs
+            of several replicas, primary first. Reads then go to the
+            fastest healthy replica and writes to the primary, with
+            automatic failover on connection errors (see EndpointPool).
         :param token: Access token for authentication.
         :param username: Username for authentication.
         :param password: Password for authentication.
+        :param pool_connections: Number of per-host connection pools to
+            keep.
+        :param pool_maxsize: Maximum number of connections kept per host.
+            Set it to at least the number of threads sharing the client.
+        :param pool_block: If True, wait for a free connection when the
+            pool is exhausted instead of opening a throwaway one.
+        :param pool_idle_timeout: Seconds without traffic after which
+            pooled keep-alive connections are discarded. None keeps them
+            until the server closes them.
+        :param warmup_connections: Number of connections to pre-open once
+            the client is initialized (see :meth:`warm_up`).
+        :param retry: Optional RetryPolicy applied to every request. The
+            number of HTTP attempts of each response is stored in its
+            ``attempts`` attribute.
+        :param lazy: If True, construction does no I/O: authentication,
+            the availability check and the warm-up run on the first
+            request instead.
+        :param token_cache: Share tokens obtained with username/password
+            between processes through a file-locked cache file. True uses
+            the default file under ``~/.cache/pointofpresence``; a string
+            is used as the file path. None keeps tokens in memory only.
+        :param token_refresh_margin: Seconds before a JWT expires at which
+            it is refreshed in the background.
+        :param codec: JSON codec used for every request body and response:
+            None or "json" (standard library), "orjson", "msgspec", "auto"
+            (fastest installed) or an object with dumps/loads methods.
+        :param metrics: Record per-endpoint request metrics, see
+            :meth:`metrics`. Pass a MetricsRecorder to share one between
+            clients.
+        :param http_cache: Cache GET responses and revalidate them with
+            ETag / Last-Modified, see CachingHTTPAdapter. True or
+            "memory" keeps them in memory, a string is used as the
+            directory of an on-disk cache shared between processes, and
+            any object with get/set methods is used as the store.
+        :param rate_limit: Client-side rate limits, as a RateLimiter (which
+            can be shared by several clients) or as its rules dict, for
+            example ``{("*", "write"): 5}`` for five writes per second on
+            each server.
+        :param circuit_breaker: Fail fast on servers that keep failing,
+            see CircuitBreaker. True uses the default thresholds; pass a
+            CircuitBreaker to tune them or to share one between clients.
+        :param probe_interval: Seconds between the background health
+            probes of the replicas when several base URLs are given. None
+            disables the probes. The probe thread runs until
+            :meth:`close`; use such clients as context managers.
+        :param coalesce: Let concurrent identical GET requests share one
+            HTTP call (see SingleFlight). The collapsed requests are
+            counted in ``single_flight.stats()``.
+        :param compression: Compress JSON request bodies of 1 KiB or
+            more and advertise every response encoding urllib3 can
+            decode. True picks zstd when the zstandard package is
+            installed and gzip otherwise; 'gzip', 'deflate' or 'zstd'
+            selects one; a BodyCompressor sets the threshold and level.
+            The bytes saved are reported by ``compressor.stats()``.
+        :param validate: Check registration payloads in-process (required
+            fields, types, name format, reserved ``extras`` keys) and
+            raise PayloadValidationError before sending invalid ones.
         """
-        self.base_url = self._ensure_protocol(base_url).rstrip("/")
-        self.session = requests.Session()
+        if isinstance(base_url, str):
+            base_url = [base_url]
+        self.base_urls = [
+            self._ensure_protocol(url).rstrip("/") for url in base_url
+        ]
+        if not self.base_urls:
+            raise ValueError("At least one base URL is required.")
+        self.base_url = self.base_urls[0]
+        self.pool_maxsize = pool_maxsize
+        self.retry_policy = retry
+        self.validate_payloads = validate
+        self.session = POPSession()
+        self.session.base_url = self.base_url
+        self.endpoints = None
+        if len(self.base_urls) > 1:
+            self.endpoints = EndpointPool(self.base_urls)
+            self.session.endpoints = self.endpoints
+        if metrics is True:
+            metrics = MetricsRecorder()
+        self.metrics_recorder = metrics or None
+        self.session.metrics = self.metrics_recorder
+        if isinstance(rate_limit, dict):
+            rate_limit = RateLimiter(rate_limit)
+        self.rate_limiter = rate_limit
+        self.session.rate_limiter = rate_limit
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker()
+        self.circuit_breaker = circuit_breaker or None
+        self.session.circuit_breaker = self.circuit_breaker
+        self.single_flight = SingleFlight() if coalesce else None
+        self.session.single_flight = self.single_flight
+        if compression is True:
+            compression = BodyCompressor()
+        elif isinstance(compression, str):
+            compression = BodyCompressor(compression)
+        self.compressor = compression or None
+        self.session.compressor = self.compressor
+        if self.compressor is not None:
+            self.session.headers["Accept-Encoding"] = accept_encoding()
+        self.codec = get_codec(codec)
+        if type(self.codec) is not JSONCodec:
+            # The standard library codec is what requests already uses
+            self.session.codec = self.codec
+        adapter_options = {}
+        if retry is not None:
+            max_retries = retry.to_urllib3()
+            if self.endpoints is not None:
+                # A refused connection fails over to the next replica
+                # at once instead of being retried with backoff
+                max_retries = max_retries.new(connect=0)
+            adapter_options["max_retries"] = max_retries
+            self.session.hooks["response"].append(retry.response_hook)
+        adapter_options.update(
+            pool_idle_timeout=pool_idle_timeout,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        if http_cache in (None, False):
+            adapter = PooledHTTPAdapter(**adapter_options)
+            self.http_cache = None
+        else:
+            if http_cache in (True, "memory"):
+                backend = MemoryCacheBackend()
+            elif isinstance(http_cache, str):
+                backend = FileCacheBackend(http_cache)
+            else:
+                backend = http_cache
+            adapter = CachingHTTPAdapter(backend=backend, **adapter_options)
+            self.http_cache = adapter
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
         # Initialize token to None by default
         self.token = None
@@ -35,17 +205,60 @@ class APIClientBase:
 
         # Initialize with token if provided
         if token:
-            self.token = token
-            self.session.headers.update(
-                {"Authorization": f"Bearer {self.token}"}
+            self._set_token(token)
+
+        # Username/password tokens are cached, refreshed before expiry and
+        # renewed when the API rejects them
+        self._token_manager = None
+        if username and password:
+            if token_cache is True:
+                token_cache = TokenManager.default_cache_file()
+            self._token_manager = TokenManager(
+                fetch=lambda: self._request_token(username, password),
+                cache_key=f"{self.base_url} {username}",
+                cache_file=token_cache or None,
+                refresh_margin=token_refresh_margin,
+                on_refresh=self._set_token,
+            )
+            self.session.reauthenticate = self._reauthenticate
+
+        if lazy:
+            self.session.defer(
+                lambda: self._connect(warmup_connections, background=True)
             )
+        else:
+            self._connect(warmup_connections)
+
+        if self.endpoints is not None and probe_interval:
+            self.endpoints.start_probes(self.session, probe_interval)
+            # Stop the probes when a client that was never closed is
+            # collected
+            weakref.finalize(self, self.endpoints.close)
+
+    def _connect(self, warmup_connections, background=False):
+        """
+        Authenticate or check the API, then warm up the connection pool.
+
+        :param background: Warm up on a separate thread. Used when running
+            as the deferred initializer of the session, which other
+            threads' requests wait for.
+        """
+        if self.token:
+            pass
         # Fallback to username/password authentication
-        elif username and password:
-            self.get_token(username, password)
+        elif self._token_manager is not None:
+            self._set_token(self._token_manager.get_token())
         # Check API availability if no authentication details are provided
         else:
             self._check_api_availability()
 
+        if warmup_connections and background:
+            threading.Thread(
+                target=self.warm_up, args=(warmup_connections,), daemon=True
+            ).start()
+        elif warmup_connections:
+            self.warm_up(warmup_connections)
+
     @staticmethod
     def _ensure_protocol(url: str) -> str:
         """
@@ -64,7 +277,13 @@ class APIClientBase:
         """
         Check if the API is reachable by making a GET request to the base URL.
         Raises a ValueError if the connection fails or the response is not 200.
+
+        A successful check is cached per base URL for the lifetime of the
+        process, so creating many clients against the same API costs a
+        single request.
         """
+        if self.base_url in _available_base_urls:
+            return
         try:
             response = self.session.get(self.base_url)
             response.raise_for_status()
@@ -83,6 +302,54 @@ class APIClientBase:
                 "An error occurred while attempting to connect "
                 f"to the API: {req_err}"
             )
+        with _available_lock:
+            _available_base_urls.add(self.base_url)
+
+    def warm_up(self, connections: int, timeout: float = 10.0) -> int:
+        """
+        Pre-open connections to the API so that the first burst of requests
+        does not pay TCP/TLS setup.
+
+        Opens up to ``connections`` concurrent streamed GET requests to the
+        base URL, holds them until all are established and then returns
+        them to the pool. Failures are ignored: warming up is best effort.
+
+        :param connections: Number of connections to open, capped at the
+            pool size.
+        :param timeout: Seconds to wait for all connections to be opened.
+        :return: Number of connections that were opened.
+        """
+        connections = min(connections, self.pool_maxsize)
+        if connections < 1:
+            return 0
+
+        barrier = threading.Barrier(connections)
+        opened = []
+
+        def open_connection():
+            try:
+                response = self.session.get(self.base_url, stream=True)
+            except requests.exceptions.RequestException:
+                response = None
+            try:
+                # Keep the connection checked out until all are open
+                barrier.wait(timeout=timeout)
+            except threading.BrokenBarrierError:
+                pass
+            if response is not None:
+                # Reading the body releases the connection to the pool
+                response.content
+                opened.append(response.status_code)
+
+        threads = [
+            threading.Thread(target=open_connection)
+            for _ in range(connections)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return len(opened)
 
     def get_token(self, username: str, password: str):
         """
@@ -91,21 +358,93 @@ class APIClientBase:
         :param username: Username for authentication.
         :param password: Password for authentication.
         """
+        self._set_token(self._request_token(username, password))
+
+    def metrics(self, prometheus: bool = False):
+        """
+        Return the request metrics recorded by this client.
+
+        :param prometheus: Return the Prometheus text exposition format
+            instead of a list of dicts.
+        :return: Snapshot from :meth:`MetricsRecorder.snapshot` or
+            :meth:`MetricsRecorder.to_prometheus`.
+        :raises ValueError: If the client was created without metrics.
+        """
+        if self.metrics_recorder is None:
+            raise ValueError(
+                "Metrics are disabled. Create the client with metrics=True."
+            )
+        if prometheus:
+            return self.metrics_recorder.to_prometheus()
+        return self.metrics_recorder.snapshot()
+
+    def close(self):
+        """
+        Stop the background token refresh and endpoint probes and close
+        the session.
+        """
+        if self._token_manager is not None:
+            self._token_manager.close()
+        if self.endpoints is not None:
+            self.endpoints.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _validate(self, kind: str, data):
+        """Validate a registration payload if the client validates."""
+        if self.validate_payloads:
+            validate_payload(kind, data)
+
+    def _set_token(self, token: str):
+        """Use ``token`` for every following request."""
+        self.token = token
+        # Update session headers with the token
+        self.session.headers.update({"Authorization": f"Bearer {token}"})
+
+    def _reauthenticate(self, rejected_authorization: str) -> bool:
+        """
+        Replace a token rejected by the API.
+
+        :param rejected_authorization: Authorization header of the rejected
+            request.
+        :return: True if a new token is in place.
+        """
+        stale_token = None
+        if rejected_authorization:
+            stale_token = rejected_authorization[len("Bearer "):]
+        try:
+            token = self._token_manager.refresh(stale_token)
+        except ValueError:
+            return False
+        self._set_token(token)
+        return True
+
+    def _request_token(self, username: str, password: str) -> str:
+        """
+        Request a new token from the API.
+
+        :param username: Username for authentication.
+        :param password: Password for authentication.
+        :return: The access token.
+        :raises ValueError: If authentication fails.
+        """
         url = f"{self.base_url}/token"
         try:
             response = self.session.post(
                 url, data={"username": username, "password": password}
             )
             response.raise_for_status()
-            self.token = response.json().get("access_token")
-            if not self.token:
+            token = response.json().get("access_token")
+            if not token:
                 raise ValueError(
                     "Authentication failed: No access token received."
                 )
-            # Update session headers with the token
-            self.session.headers.update(
-                {"Authorization": f"Bearer {self.token}"}
-            )
+            return token
         except requests.exceptions.ConnectionError:
             raise ValueError(
                 f"Failed to connect to the API at {self.base_url}. "
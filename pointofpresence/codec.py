@@ -0,0 +1,103 @@
+# pointofpresence/codec.py
+
+import json
+
+
+class JSONCodec:
+    """JSON codec based on the standard library ``json`` module."""
+
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        """Serialize ``obj`` to UTF-8 encoded JSON."""
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data):
+        """
+        Deserialize JSON ``data``.
+
+        :raises ValueError: If ``data`` is not valid JSON.
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on ``orjson``."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data):
+        # orjson.JSONDecodeError is a ValueError subclass
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """JSON codec based on ``msgspec``."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._decode_error = msgspec.DecodeError
+
+    def dumps(self, obj) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data):
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as err:
+            raise ValueError(str(err)) from err
+
+
+_CODECS = {
+    "json": JSONCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def get_codec(codec=None) -> JSONCodec:
+    """
+    Resolve a codec setting.
+
+    :param codec: None or ``"json"`` for the standard library, ``"orjson"``
+        or ``"msgspec"``, ``"auto"`` for the fastest installed one, or any
+        object with ``dumps(obj) -> bytes`` and ``loads(data)`` methods.
+    :return: The codec instance.
+    :raises ValueError: If the codec name is unknown or its package is not
+        installed.
+    """
+    if codec is None:
+        return JSONCodec()
+    if not isinstance(codec, str):
+        return codec
+    if codec == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return _CODECS[name]()
+            except ImportError:
+                continue
+        return JSONCodec()
+    if codec not in _CODECS:
+        raise ValueError(
+            f"Unknown codec '{codec}'. Use one of: auto, "
+            + ", ".join(_CODECS)
+        )
+    try:
+        return _CODECS[codec]()
+    except ImportError as err:
+        raise ValueError(
+            f"The '{codec}' codec requires the {codec} package."
+        ) from err
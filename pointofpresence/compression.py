@@ -0,0 +1,181 @@
+# pointofpresence/compression.py
+
+import gzip
+import threading
+import zlib
+from urllib3.util import make_headers
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+ENCODINGS = ("gzip", "deflate", "zstd")
+
+
+def accept_encoding() -> str:
+    """
+    Return the ``Accept-Encoding`` value for every response encoding
+    urllib3 can decode here: gzip and deflate, plus br and zstd when
+    brotli and zstandard are installed.
+    """
+    return make_headers(accept_encoding=True)["accept-encoding"]
+
+
+def compress(data: bytes, encoding: str, level: int = None) -> bytes:
+    """
+    Compress ``data`` for a ``Content-Encoding`` header.
+
+    :param data: Request body.
+    :param encoding: 'gzip', 'deflate' or 'zstd'.
+    :param level: Compression level; None uses a fast default.
+    :return: The compressed body.
+    :raises ValueError: If the encoding is unknown or zstd is requested
+        without the zstandard package.
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6 if level is None else level)
+    if encoding == "deflate":
+        return zlib.compress(data, 6 if level is None else level)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ValueError(
+                "zstd compression requires the zstandard package."
+            )
+        return zstandard.ZstdCompressor(
+            level=3 if level is None else level
+        ).compress(data)
+    raise ValueError(f"encoding must be one of {', '.join(ENCODINGS)}.")
+
+
+class BodyCompressor:
+    """
+    Compression of request bodies and accounting of compressed traffic.
+
+    Bodies of at least ``threshold`` bytes are compressed with
+    ``encoding``; smaller ones are sent as they are, since compressing
+    them costs more CPU than it saves on the wire. The compressed body
+    is only used when it is actually smaller.
+    """
+
+    def __init__(
+        self, encoding: str = "auto", threshold: int = 1024, level=None
+    ):
+        """
+        :param encoding: 'gzip', 'deflate', 'zstd', or 'auto' for zstd
+            when the zstandard package is installed and gzip otherwise.
+        :param threshold: Minimum body size in bytes to compress.
+        :param level: Compression level; None uses a fast default.
+        :raises ValueError: If the encoding is unknown or unavailable.
+        """
+        if encoding == "auto":
+            encoding = "zstd" if zstandard is not None else "gzip"
+        compress(b"", encoding, level)  # Validate
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level
+        self._stats = dict.fromkeys(
+            (
+                "requests_compressed",
+                "request_bytes",
+                "request_bytes_sent",
+                "responses_compressed",
+                "response_bytes",
+                "response_bytes_received",
+            ),
+            0,
+        )
+        self._lock = threading.Lock()
+
+    def compress_body(self, data: bytes):
+        """
+        Compress a request body if it is large enough.
+
+        :param data: Encoded request body.
+        :return: Tuple of the body to send and its ``Content-Encoding``,
+            which is None when the body is sent uncompressed.
+        """
+        if len(data) < self.threshold:
+            return data, None
+        compressed = compress(data, self.encoding, self.level)
+        if len(compressed) >= len(data):
+            return data, None
+        with self._lock:
+            self._stats["requests_compressed"] += 1
+            self._stats["request_bytes"] += len(data)
+            self._stats["request_bytes_sent"] += len(compressed)
+        return compressed, self.encoding
+
+    def record_response(self, response, decoded: int = None):
+        """
+        Count the wire and decoded sizes of a compressed response.
+
+        Responses without ``Content-Encoding`` or whose wire size is
+        unknown are ignored.
+
+        :param response: Response whose body has been read.
+        :param decoded: Decoded body size; defaults to the size of
+            ``response.content``.
+        """
+        if not response.headers.get("Content-Encoding"):
+            return
+        tell = getattr(response.raw, "tell", None)
+        received = tell() if tell is not None else 0
+        if not received:
+            return
+        if decoded is None:
+            decoded = len(response.content)
+        with self._lock:
+            self._stats["responses_compressed"] += 1
+            self._stats["response_bytes"] += decoded
+            self._stats["response_bytes_received"] += received
+
+    def count_stream(self, response):
+        """
+        Record a streamed response once it has been read through its
+        ``iter_content`` (which urllib3 decompresses chunk by chunk) and
+        exhausted or closed.
+        """
+        if not response.headers.get("Content-Encoding"):
+            return
+        iter_content = response.iter_content
+        close = response.close
+        decoded = [0]
+        recorded = []
+
+        def record():
+            if not recorded:
+                recorded.append(True)
+                self.record_response(response, decoded[0])
+
+        def counting_iter_content(*args, **kwargs):
+            for chunk in iter_content(*args, **kwargs):
+                decoded[0] += len(chunk)
+                yield chunk
+            record()
+
+        def recording_close():
+            if decoded[0]:
+                record()
+            close()
+
+        response.iter_content = counting_iter_content
+        response.close = recording_close
+
+    def stats(self) -> dict:
+        """
+        Return the compression counters.
+
+        :return: Dict with the number of compressed requests and
+            responses, their sizes before and after compression, and
+            ``bytes_saved`` across both directions.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["bytes_saved"] = (
+            stats["request_bytes"]
+            - stats["request_bytes_sent"]
+            + stats["response_bytes"]
+            - stats["response_bytes_received"]
+        )
+        return stats
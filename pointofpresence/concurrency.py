@@ -0,0 +1,80 @@
+# pointofpresence/concurrency.py
+
+import itertools
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+_BulkResultBase = namedtuple(
+    "BulkResult", ["index", "item", "result", "error"]
+)
+
+
+class BulkResult(_BulkResultBase):
+    """
+    Outcome of one item of a bulk operation.
+
+    :ivar index: Position of the item in the input iterable.
+    :ivar item: The input item itself.
+    :ivar result: Return value of the operation, or None if it failed.
+    :ivar error: Exception raised by the operation, or None on success.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        """True when the operation succeeded."""
+        return self.error is None
+
+
+def bounded_map(func, items, max_workers=8, max_pending=None):
+    """
+    Apply ``func`` to every item on a thread pool, yielding results as
+    they complete.
+
+    Items are pulled lazily from ``items`` so that at most ``max_pending``
+    of them are in flight at any time, which keeps memory flat for very
+    large inputs. A failing item never aborts the batch: its exception is
+    reported in the corresponding :class:`BulkResult`.
+
+    :param func: Callable applied to each item.
+    :param items: Iterable of items.
+    :param max_workers: Maximum number of concurrent calls.
+    :param max_pending: Maximum number of submitted but not yet yielded
+        items. Defaults to twice ``max_workers``.
+    :return: Generator of :class:`BulkResult`, in completion order.
+    :raises ValueError: If ``max_workers`` is lower than 1.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+    if max_pending is None:
+        max_pending = max_workers * 2
+    max_pending = max(max_pending, max_workers)
+
+    iterator = enumerate(items)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+
+    def submit(count):
+        for index, item in itertools.islice(iterator, count):
+            pending[executor.submit(func, item)] = (index, item)
+
+    try:
+        submit(max_pending)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    yield BulkResult(index, item, None, exc)
+                else:
+                    yield BulkResult(index, item, result, None)
+            submit(len(done))
+    finally:
+        # Drop queued work if the consumer stops iterating early
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,203 @@
+# pointofpresence/failover.py
+
+import threading
+import time
+import weakref
+import requests
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+# Statuses with which a replica reports itself unavailable
+_UNAVAILABLE_STATUSES = frozenset([502, 503, 504])
+
+
+class _Endpoint:
+    """Health and smoothed round-trip time of one replica."""
+
+    __slots__ = ("url", "rtt", "down_since", "requests", "failures")
+
+    def __init__(self, url):
+        self.url = url
+        self.rtt = None
+        self.down_since = None
+        self.requests = 0
+        self.failures = 0
+
+
+class EndpointPool:
+    """
+    Replicas of the POP API and their health.
+
+    Each endpoint tracks an exponentially weighted moving average of its
+    response time, fed by real requests and by the background probes
+    started with :meth:`start_probes`. Connection errors and 502/503/504
+    answers mark an endpoint down; it is tried again once a probe or a
+    request succeeds, or after ``recheck_after`` seconds.
+
+    Reads go to the fastest healthy endpoint, with endpoints that have
+    no samples yet tried first. Writes go to the first healthy endpoint
+    in the given order, so they stay on the primary while it is up.
+    Down endpoints are kept as a last resort in both cases.
+    """
+
+    def __init__(
+        self, urls, alpha: float = 0.3, recheck_after: float = 30.0
+    ):
+        """
+        :param urls: Base URLs of the replicas, primary first.
+        :param alpha: Weight of the latest sample in the moving average.
+        :param recheck_after: Seconds after which a down endpoint is
+            tried again even without a successful probe.
+        :raises ValueError: If ``urls`` is empty or ``alpha`` is not in
+            (0, 1].
+        """
+        if not urls:
+            raise ValueError("At least one endpoint URL is required.")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1].")
+        self.urls = list(urls)
+        self.alpha = alpha
+        self.recheck_after = recheck_after
+        self._endpoints = {url: _Endpoint(url) for url in self.urls}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._probe_thread = None
+
+    @property
+    def primary(self) -> str:
+        return self.urls[0]
+
+    def candidates(self, kind: str) -> list:
+        """
+        Return the endpoints to try, in order.
+
+        :param kind: 'read' or 'write'.
+        :return: List of base URLs, healthy ones first.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = []
+            down = []
+            for url in self.urls:
+                endpoint = self._endpoints[url]
+                if endpoint.down_since is None or (
+                    now - endpoint.down_since >= self.recheck_after
+                ):
+                    healthy.append(endpoint)
+                else:
+                    down.append(endpoint)
+            if kind != "write":
+                healthy.sort(key=lambda e: e.rtt or 0.0)
+        return [endpoint.url for endpoint in healthy + down]
+
+    def observe(self, url: str, duration: float, status_code: int = 200):
+        """
+        Record a response of an endpoint.
+
+        :param url: Base URL of the endpoint.
+        :param duration: Response time in seconds.
+        :param status_code: HTTP status of the response.
+        """
+        with self._lock:
+            endpoint = self._endpoints[url]
+            endpoint.requests += 1
+            if status_code in _UNAVAILABLE_STATUSES:
+                endpoint.failures += 1
+                endpoint.down_since = time.monotonic()
+                return
+            endpoint.down_since = None
+            if endpoint.rtt is None:
+                endpoint.rtt = duration
+            else:
+                endpoint.rtt += self.alpha * (duration - endpoint.rtt)
+
+    def mark_down(self, url: str):
+        """Record a connection failure of an endpoint."""
+        with self._lock:
+            endpoint = self._endpoints[url]
+            endpoint.requests += 1
+            endpoint.failures += 1
+            endpoint.down_since = time.monotonic()
+
+    def probe(self, session, timeout: float = 5.0):
+        """
+        Send one lightweight GET to the base URL of every endpoint.
+
+        :param session: requests Session used for the probes. Its request
+            hooks are bypassed, so probes are not rate limited, counted
+            in the metrics or answered from the HTTP cache.
+        :param timeout: Timeout of each probe in seconds.
+        """
+        for url in self.urls:
+            start = time.perf_counter()
+            try:
+                response = requests.Session.request(
+                    session, "GET", url, timeout=timeout,
+                    headers={"Cache-Control": "no-cache"},
+                )
+                response.close()
+            except requests.exceptions.RequestException:
+                self.mark_down(url)
+                continue
+            self.observe(
+                url, time.perf_counter() - start, response.status_code
+            )
+
+    def start_probes(self, session, interval: float, timeout: float = 5.0):
+        """
+        Probe the endpoints every ``interval`` seconds on a daemon thread
+        until :meth:`close` is called or the session is collected.
+
+        The thread only holds a weak reference to the session, which
+        often references its client, so that an unclosed client can
+        still be collected.
+        """
+        if self._probe_thread is not None:
+            return
+        session_ref = weakref.ref(session)
+
+        def run():
+            while not self._stop.wait(interval):
+                session = session_ref()
+                if session is None:
+                    return
+                self.probe(session, timeout)
+                del session
+
+        self._probe_thread = threading.Thread(target=run, daemon=True)
+        self._probe_thread.start()
+
+    def close(self):
+        """Stop the background probes."""
+        self._stop.set()
+
+    def stats(self) -> list:
+        """
+        Return the state of every endpoint.
+
+        :return: List of dicts with ``url``, ``healthy``, ``rtt`` (seconds
+            or None), ``requests`` and ``failures``, primary first.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": e.url,
+                    "healthy": e.down_since is None
+                    or now - e.down_since >= self.recheck_after,
+                    "rtt": e.rtt,
+                    "requests": e.requests,
+                    "failures": e.failures,
+                }
+                for e in (self._endpoints[url] for url in self.urls)
+            ]
+
+
+def request_not_sent(exc) -> bool:
+    """
+    Return True if a ConnectionError happened before the request reached
+    the server, so that a write can safely be sent to another endpoint.
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
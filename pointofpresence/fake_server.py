@@ -0,0 +1,513 @@
+# pointofpresence/fake_server.py
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from .validation import RESERVED_EXTRAS_KEYS
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Payload field holding the dataset name, per registration endpoint
+_NAME_FIELDS = {
+    "kafka": "dataset_name",
+    "s3": "resource_name",
+    "url": "resource_name",
+}
+
+_NOT_FOUND_DETAILS = {
+    "kafka": "Kafka dataset not found",
+    "s3": "S3 resource not found",
+    "url": "Resource not found",
+}
+
+
+class _HTTPError(Exception):
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class FakePOPStore:
+    """Thread-safe in-memory catalog backing :class:`FakePOPServer`."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.organizations = {}
+        self.datasets = {}
+        self.tokens = set()
+
+    def orgs(self, server):
+        return self.organizations.setdefault(server, {})
+
+    def dsets(self, server):
+        return self.datasets.setdefault(server, {})
+
+    def visible(self, catalog, server):
+        """Entries of ``catalog`` seen from ``server``; global sees all."""
+        if server != "global":
+            return dict(catalog.get(server, {}))
+        merged = {}
+        for entries in catalog.values():
+            merged.update(entries)
+        return merged
+
+
+class FakePOPServer:
+    """
+    In-process stand-in for a POP API, for offline tests and benchmarks.
+
+    It implements ``/token``, ``/organization``, ``/kafka``, ``/s3``,
+    ``/url``, ``/resource``, ``/search`` and ``/status/kafka-details``
+    with an in-memory store, and answers with the same error details as
+    the real API so that the client error mapping can be exercised.
+    Successful GET responses carry an ETag and honour ``If-None-Match``.
+    Deleted datasets are kept as ``state: "deleted"`` tombstones that
+    only searches with a ``metadata_modified:[low TO high]`` filter return.
+    Latency and failures can be injected to study client behaviour.
+
+    Example::
+
+        with FakePOPServer(latency=0.005) as server:
+            client = APIClient(server.url)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        username: str = "admin",
+        password: str = "admin",
+        kafka_details: dict = None,
+        seed: int = None,
+        compress_responses: bool = False,
+    ):
+        """
+        :param host: Interface to listen on.
+        :param port: Port to listen on; 0 picks a free port.
+        :param latency: Seconds added to every response.
+        :param error_rate: Fraction of requests answered with a 503.
+        :param username: Accepted username for ``/token``.
+        :param password: Accepted password for ``/token``.
+        :param kafka_details: Body of ``/status/kafka-details``.
+        :param seed: Seed of the error injection random generator.
+        :param compress_responses: Gzip response bodies of 1 KiB or more
+            for clients accepting gzip.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.compress_responses = compress_responses
+        self.username = username
+        self.password = password
+        self.kafka_details = kafka_details or {
+            "kafka_host": "localhost",
+            "kafka_port": "9092",
+            "kafka_connection": True,
+        }
+        self.store = FakePOPStore()
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._count_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _inject(self):
+        """Apply the configured latency and return True to fail."""
+        with self._count_lock:
+            self.request_count += 1
+            fail = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        return fail
+
+    # Route handlers; each returns (status, body)
+
+    def handle(self, method, path, query, body, headers):
+        segments = [s for s in path.split("/") if s]
+        server = query.get("server", ["local"])[-1]
+        route = segments[0] if segments else ""
+
+        if method == "GET" and not segments:
+            return 200, {"message": "POP API is running"}
+        if method == "POST" and route == "token":
+            return self._token(body)
+        if route == "organization":
+            return self._organization(method, segments, query, body, server)
+        if route in _NAME_FIELDS:
+            return self._dataset(method, route, segments, body, server)
+        if method == "DELETE" and route == "resource":
+            return self._delete_resource(segments, query, server)
+        if route == "search":
+            return self._search(method, query, body, server)
+        if method == "GET" and segments == ["status", "kafka-details"]:
+            return 200, dict(self.kafka_details)
+        raise _HTTPError(404, "Not Found")
+
+    def _token(self, form):
+        if (
+            form.get("username") != self.username
+            or form.get("password") != self.password
+        ):
+            raise _HTTPError(401, "Incorrect username or password")
+        token = uuid.uuid4().hex
+        with self.store.lock:
+            self.store.tokens.add(token)
+        return 200, {"access_token": token, "token_type": "bearer"}
+
+    def _organization(self, method, segments, query, body, server):
+        store = self.store
+        with store.lock:
+            orgs = store.orgs(server)
+            if method == "GET" and len(segments) == 1:
+                name = query.get("name", [None])[-1]
+                names = sorted(store.visible(store.organizations, server))
+                if name:
+                    names = [n for n in names if name.lower() in n.lower()]
+                return 200, names
+            if method == "POST" and len(segments) == 1:
+                name = body.get("name")
+                if not name:
+                    raise _HTTPError(400, "Invalid input: name is required")
+                if name in orgs:
+                    raise _HTTPError(
+                        400, "Group name already exists in database"
+                    )
+                org_id = str(uuid.uuid4())
+                orgs[name] = {"id": org_id, **body}
+                return 201, {
+                    "id": org_id,
+                    "message": "Organization created successfully",
+                }
+            if method == "DELETE" and len(segments) == 2:
+                if orgs.pop(segments[1], None) is None:
+                    raise _HTTPError(404, "Organization not found")
+                return 200, {"message": "Organization deleted successfully"}
+        raise _HTTPError(405, "Method Not Allowed")
+
+    def _dataset(self, method, kind, segments, body, server):
+        store = self.store
+        with store.lock:
+            datasets = store.dsets(server)
+            if method == "POST" and len(segments) == 1:
+                name = body.get(_NAME_FIELDS[kind])
+                if not name:
+                    raise _HTTPError(
+                        400,
+                        f"Invalid input: {_NAME_FIELDS[kind]} is required",
+                    )
+                if body.get("owner_org") not in store.orgs(server):
+                    raise _HTTPError(400, "Organization does not exist")
+                self._check_extras(body)
+                if any(
+                    d["name"] == name and d["state"] == "active"
+                    for d in datasets.values()
+                ):
+                    raise _HTTPError(
+                        400, "Group name already exists in database"
+                    )
+                dataset = _dataset_from_payload(kind, str(uuid.uuid4()), body)
+                datasets[dataset["id"]] = dataset
+                return 201, {"id": dataset["id"]}
+            if method == "PUT" and len(segments) == 2:
+                current = datasets.get(segments[1])
+                if (
+                    current is None
+                    or current["kind"] != kind
+                    or current["state"] != "active"
+                ):
+                    raise _HTTPError(404, _NOT_FOUND_DETAILS[kind])
+                self._check_extras(body)
+                payload = {**current["payload"], **body}
+                datasets[current["id"]] = _dataset_from_payload(
+                    kind, current["id"], payload
+                )
+                return 200, {"message": f"{kind} resource updated"}
+        raise _HTTPError(405, "Method Not Allowed")
+
+    @staticmethod
+    def _check_extras(body):
+        extras = body.get("extras") or {}
+        reserved = sorted(RESERVED_EXTRAS_KEYS.intersection(extras))
+        if reserved:
+            raise _HTTPError(
+                400, f"Reserved key error: {', '.join(reserved)}"
+            )
+
+    def _delete_resource(self, segments, query, server):
+        store = self.store
+        with store.lock:
+            datasets = store.dsets(server)
+            if len(segments) == 2:
+                matches = [
+                    d["id"] for d in datasets.values()
+                    if d["name"] == segments[1] and d["state"] == "active"
+                ]
+                dataset_id = matches[0] if matches else None
+            else:
+                dataset_id = query.get("resource_id", [None])[-1]
+            dataset = datasets.get(dataset_id)
+            if dataset is None or dataset["state"] != "active":
+                raise _HTTPError(404, "Resource not found")
+            # Keep a tombstone, reported by metadata_modified range queries
+            dataset["state"] = "deleted"
+            dataset["metadata_modified"] = _now()
+        return 200, {"message": "Resource deleted successfully"}
+
+    def _search(self, method, query, body, server):
+        if method == "GET":
+            terms = query.get("terms", [])
+            keys = query.get("keys") or [None] * len(terms)
+            limit = query.get("limit", [None])[-1]
+            offset = query.get("offset", ["0"])[-1]
+        elif method == "POST":
+            server = body.get("server", "global")
+            pairs = [
+                (body.get(field), key) for field, key in (
+                    ("search_term", None),
+                    ("dataset_name", "name"),
+                    ("resource_url", "resources.url"),
+                ) if body.get(field)
+            ]
+            for item in body.get("filter_list") or []:
+                key, _, value = item.partition(":")
+                pairs.append((value, key))
+            terms = [term for term, _ in pairs]
+            keys = [key for _, key in pairs]
+            limit = body.get("limit")
+            offset = body.get("offset", 0)
+        else:
+            raise _HTTPError(405, "Method Not Allowed")
+
+        with self.store.lock:
+            datasets = list(
+                self.store.visible(self.store.datasets, server).values()
+            )
+        # Like CKAN change queries, range filters on metadata_modified also
+        # report deleted datasets
+        include_deleted = any(
+            key == "metadata_modified" and _is_range(term)
+            for term, key in zip(terms, keys)
+        )
+        results = [
+            _public(d) for d in datasets
+            if (include_deleted or d["state"] == "active")
+            and all(
+                _matches(d, term, key if key != "null" else None)
+                for term, key in zip(terms, keys)
+            )
+        ]
+        offset = int(offset or 0)
+        if limit is not None:
+            results = results[offset:offset + int(limit)]
+        return 200, results
+
+
+def _dataset_from_payload(kind, dataset_id, payload):
+    """Build the stored dataset for a registration payload."""
+    name = payload.get(_NAME_FIELDS[kind])
+    if kind == "kafka":
+        title = payload.get("dataset_title", name)
+        notes = payload.get("dataset_description", "")
+        url = (
+            f"kafka://{payload.get('kafka_host')}:"
+            f"{payload.get('kafka_port')}/{payload.get('kafka_topic')}"
+        )
+    else:
+        title = payload.get("resource_title", name)
+        notes = payload.get("notes", "")
+        url = payload.get("resource_url") or payload.get("resource_s3")
+    dataset = {
+        "id": dataset_id,
+        "kind": kind,
+        "name": name,
+        "title": title,
+        "owner_org": payload.get("owner_org"),
+        "notes": notes,
+        "resources": [
+            {
+                "id": f"{dataset_id}-resource",
+                "url": url,
+                "name": name,
+                "description": notes,
+                "format": payload.get("file_type", kind.upper()),
+            }
+        ],
+        "extras": dict(payload.get("extras") or {}),
+        "state": "active",
+        "metadata_modified": _now(),
+        "payload": dict(payload),
+    }
+    # Lower-cased text matched by searches without a key
+    dataset["text"] = json.dumps(_public(dataset)).lower()
+    return dataset
+
+
+def _public(dataset):
+    """Dataset as returned by the search endpoint."""
+    return {
+        key: value for key, value in dataset.items()
+        if key not in ("kind", "payload", "text")
+    }
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _is_range(term):
+    return term.startswith("[") and term.endswith("]") and " TO " in term
+
+
+def _matches(dataset, term, key):
+    """
+    True if ``term`` appears in ``key`` (dotted path) or anywhere. A term
+    like ``[low TO high]`` matches values in that range, ``*`` being
+    unbounded.
+    """
+    if key is not None and _is_range(term):
+        low, _, high = term[1:-1].partition(" TO ")
+        value = dataset.get(key)
+        return value is not None and (
+            (low == "*" or str(value) >= low)
+            and (high == "*" or str(value) <= high)
+        )
+    term = term.lower()
+    if key is None:
+        return term in dataset["text"]
+    values = [dataset]
+    for part in key.split("."):
+        next_values = []
+        for value in values:
+            if isinstance(value, list):
+                value = [v.get(part) for v in value if isinstance(v, dict)]
+                next_values.extend(value)
+            elif isinstance(value, dict) and part in value:
+                next_values.append(value[part])
+        values = next_values
+    return any(term in str(value).lower() for value in values)
+
+
+def _decode_body(raw, encoding):
+    """Decompress a request body sent with ``Content-Encoding``."""
+    if not encoding or not raw:
+        return raw
+    try:
+        if encoding == "gzip":
+            return gzip.decompress(raw)
+        if encoding == "deflate":
+            return zlib.decompress(raw)
+        if encoding == "zstd" and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompressobj().decompress(
+                raw
+            )
+    except (OSError, EOFError, zlib.error) as err:
+        raise _HTTPError(400, f"Invalid {encoding} body: {err}")
+    raise _HTTPError(415, f"Unsupported Content-Encoding: {encoding}")
+
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Send headers and body in one segment; with the default
+        # unbuffered writer, Nagle and delayed ACKs add ~40 ms per call
+        disable_nagle_algorithm = True
+        wbufsize = 64 * 1024
+
+        def _dispatch(self):
+            parsed = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                raw = _decode_body(raw, self.headers.get("Content-Encoding"))
+                if server._inject():
+                    raise _HTTPError(503, "Injected failure")
+                content_type = self.headers.get("Content-Type", "")
+                if "application/x-www-form-urlencoded" in content_type:
+                    body = {
+                        k: v[-1]
+                        for k, v in parse_qs(raw.decode("utf-8")).items()
+                    }
+                else:
+                    body = json.loads(raw) if raw else {}
+                status, payload = server.handle(
+                    self.command,
+                    parsed.path,
+                    parse_qs(parsed.query),
+                    body,
+                    self.headers,
+                )
+            except _HTTPError as err:
+                status, payload = err.status, {"detail": err.detail}
+            except ValueError as err:
+                status, payload = 422, {"detail": f"Invalid input: {err}"}
+            data = json.dumps(payload).encode("utf-8")
+            etag = None
+            if self.command == "GET" and status == 200:
+                etag = '"%s"' % hashlib.sha1(data).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    status, data = 304, b""
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            if (
+                server.compress_responses
+                and len(data) >= 1024
+                and "gzip" in self.headers.get("Accept-Encoding", "")
+            ):
+                data = gzip.compress(data)
+                self.send_header("Content-Encoding", "gzip")
+            if data:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
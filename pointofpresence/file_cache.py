@@ -0,0 +1,93 @@
+# pointofpresence/file_cache.py
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "pointofpresence"
+)
+
+
+def cache_path(filename: str) -> str:
+    """
+    Return the path of ``filename`` inside the default cache directory.
+
+    :param filename: Name of the cache file.
+    :return: Absolute path of the cache file.
+    """
+    return os.path.join(DEFAULT_CACHE_DIR, filename)
+
+
+@contextmanager
+def locked_file(path: str):
+    """
+    Hold an exclusive inter-process lock associated with ``path``.
+
+    The lock is taken on a sibling ``.lock`` file so that the data file
+    itself can be replaced atomically while the lock is held.
+
+    :param path: Path of the file to protect.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(f"{path}.lock", "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def load_json(path: str) -> dict:
+    """
+    Read a JSON object from ``path``.
+
+    :param path: Path of the cache file.
+    :return: The decoded object, or an empty dict if the file is missing
+        or corrupt.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_json(path: str, data: dict):
+    """
+    Atomically write ``data`` as JSON to ``path``, readable by the
+    current user only.
+
+    :param path: Path of the cache file.
+    :param data: JSON-serializable object.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -1,7 +1,41 @@
 # pointofpresence/get_kafka_details_method.py
 
+import hashlib
+import json
+import threading
+import time
 import requests
 from pointofpresence.client_base import APIClientBase
+from pointofpresence.file_cache import (
+    cache_path,
+    load_json,
+    locked_file,
+    save_json,
+)
+
+_ENTRY_KEYS = frozenset(["details", "digest", "etag", "fetched_at"])
+
+
+def _digest(details) -> str:
+    """Hash of the canonical JSON form of the details."""
+    canonical = json.dumps(details, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _KafkaDetailsCache:
+    """Cached Kafka details of one client, optionally backed by a file."""
+
+    def __init__(self, ttl, cache_file):
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self.entry = None
+        self.lock = threading.Lock()
+
+    def fresh(self, entry):
+        return (
+            entry is not None
+            and time.time() - entry["fetched_at"] < self.ttl
+        )
 
 
 class APIClientKafkaDetails(APIClientBase):
@@ -9,6 +43,9 @@ class APIClientKafkaDetails(APIClientBase):
     A class to handle requests for Kafka connection details.
     """
 
+    _kafka_details_cache = None
+    _kafka_details_listeners = ()
+
     def get_kafka_details(self):
         """
         Fetch Kafka connection details from the API.
@@ -24,11 +61,138 @@ class APIClientKafkaDetails(APIClientBase):
         ValueError
             If the API response contains an error or is unreachable.
         """
+        return self._fetch_kafka_details()[0]
+
+    def enable_kafka_details_cache(self, ttl=300.0, cache_file=True):
+        """
+        Configure the cache used by get_kafka_details_cached.
+
+        Parameters
+        ----------
+        ttl : float
+            Seconds the details are used without asking the API.
+        cache_file : bool or str
+            True shares the details with every process of the host
+            through a file in the user cache directory, a path uses that
+            file, and False or None keeps them in memory only.
+        """
+        if cache_file is True:
+            cache_file = cache_path("kafka_details.json")
+        self._kafka_details_cache = _KafkaDetailsCache(
+            ttl, cache_file or None
+        )
+
+    def on_kafka_details_change(self, callback):
+        """
+        Call ``callback(old, new)`` when revalidation finds new details.
+
+        Parameters
+        ----------
+        callback : callable
+            Receives the previous and the new details dicts. It is not
+            called for the first lookup.
+
+        Returns
+        -------
+        callable
+            The callback, so that this method can be used as a decorator.
+        """
+        self._kafka_details_listeners = (
+            tuple(self._kafka_details_listeners) + (callback,)
+        )
+        return callback
+
+    def get_kafka_details_cached(self):
+        """
+        Return Kafka connection details, asking the API at most once per
+        TTL.
+
+        Expired details are revalidated with a conditional request
+        (``If-None-Match``) when the API sent an ETag, and by comparing a
+        hash of the details otherwise. Change callbacks are only called
+        when the details differ. The cache is configured with
+        enable_kafka_details_cache; by default details are kept for five
+        minutes and shared through the user cache directory.
+
+        Returns
+        -------
+        dict
+            Kafka connection details. The dict is shared and must not be
+            modified.
+
+        Raises
+        ------
+        ValueError
+            If the details have to be fetched and the request fails.
+        """
+        if self._kafka_details_cache is None:
+            self.enable_kafka_details_cache()
+        cache = self._kafka_details_cache
+        entry = cache.entry
+        if cache.fresh(entry):
+            return entry["details"]
+
+        with cache.lock:
+            entry = cache.entry
+            if cache.fresh(entry):
+                return entry["details"]
+            if cache.cache_file is None:
+                new_entry = self._revalidate_kafka_details(entry)
+            else:
+                with locked_file(cache.cache_file):
+                    stored = load_json(cache.cache_file)
+                    shared = stored.get(self.base_url)
+                    if not isinstance(shared, dict) or not _ENTRY_KEYS <= set(
+                        shared
+                    ):
+                        shared = None
+                    if cache.fresh(shared):
+                        new_entry = shared
+                    else:
+                        new_entry = self._revalidate_kafka_details(
+                            shared or entry
+                        )
+                        stored[self.base_url] = new_entry
+                        save_json(cache.cache_file, stored)
+            cache.entry = new_entry
+
+        if entry is not None and entry["digest"] != new_entry["digest"]:
+            for callback in self._kafka_details_listeners:
+                callback(entry["details"], new_entry["details"])
+        return new_entry["details"]
+
+    def _revalidate_kafka_details(self, entry):
+        """Fetch the details, conditionally if ``entry`` has an ETag."""
+        etag = entry.get("etag") if entry else None
+        details, response = self._fetch_kafka_details(etag)
+        if details is None:
+            details = entry["details"]
+            digest = entry["digest"]
+        else:
+            digest = _digest(details)
+        return {
+            "details": details,
+            "digest": digest,
+            "etag": response.headers.get("ETag") or etag,
+            "fetched_at": time.time(),
+        }
+
+    def _fetch_kafka_details(self, etag=None):
+        """
+        GET the details; return (None, response) on 304 Not Modified.
+        """
         endpoint = f"{self.base_url}/status/kafka-details"
         try:
-            response = self.session.get(endpoint)
+            if etag:
+                response = self.session.get(
+                    endpoint, headers={"If-None-Match": etag}
+                )
+            else:
+                response = self.session.get(endpoint)
             response.raise_for_status()
-            return response.json()
+            if etag and response.status_code == 304:
+                return None, response
+            return response.json(), response
         except requests.exceptions.HTTPError as http_err:
             raise ValueError(
                 f"Failed to fetch Kafka details: {http_err}"
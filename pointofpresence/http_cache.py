@@ -0,0 +1,292 @@
+# pointofpresence/http_cache.py
+
+import base64
+import hashlib
+import os
+import threading
+import time
+from email.utils import parsedate_tz, mktime_tz
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from .cache import TTLCache
+from .file_cache import DEFAULT_CACHE_DIR, load_json, save_json
+from .transport import PooledHTTPAdapter
+
+# Request headers that make a request conditional on the caller's side
+_CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+# Headers that describe the transfer rather than the cached body
+_TRANSFER_HEADERS = ("Content-Encoding", "Content-Length", "Transfer-Encoding")
+
+# Headers of a 304 response that replace the stored ones
+_UPDATED_HEADERS = (
+    "Cache-Control", "Date", "ETag", "Expires", "Last-Modified", "Vary"
+)
+
+
+class MemoryCacheBackend:
+    """In-process HTTP cache store with LRU eviction."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        :param maxsize: Maximum number of cached responses.
+        """
+        self._entries = TTLCache(maxsize=maxsize, ttl=float("inf"))
+
+    def get(self, key):
+        return self._entries.get(key)[1]
+
+    def set(self, key, entry):
+        self._entries.set(key, entry)
+
+
+class FileCacheBackend:
+    """
+    HTTP cache store keeping one JSON file per response in a directory,
+    so that several processes share validators and bodies.
+    """
+
+    def __init__(self, directory: str = None):
+        """
+        :param directory: Cache directory. Defaults to ``http`` inside
+            the user cache directory.
+        """
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, "http")
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        entry = load_json(self._path(key))
+        if not entry:
+            return None
+        try:
+            entry["body"] = base64.b64decode(entry["body"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return entry
+
+    def set(self, key, entry):
+        data = dict(entry, body=base64.b64encode(entry["body"]).decode())
+        save_json(self._path(key), data)
+
+
+def parse_cache_control(value: str) -> dict:
+    """
+    Parse a ``Cache-Control`` header.
+
+    :param value: Header value, or None.
+    :return: Dict of lower-cased directives; valueless directives map to
+        True.
+    """
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('" ') or True
+    return directives
+
+
+def _http_date(value):
+    """Seconds since the epoch of an HTTP date header, or None."""
+    parsed = parsedate_tz(value) if value else None
+    return mktime_tz(parsed) if parsed else None
+
+
+class CachingHTTPAdapter(PooledHTTPAdapter):
+    """
+    PooledHTTPAdapter with a private HTTP cache for GET requests.
+
+    Responses with validators (``ETag`` or ``Last-Modified``) or an
+    explicit lifetime (``Cache-Control: max-age`` or ``Expires``) are
+    stored. While a stored response is fresh it is returned without a
+    request; afterwards it is revalidated with ``If-None-Match`` /
+    ``If-Modified-Since`` and a 304 is answered from the store.
+    ``no-store`` responses are never stored and ``no-cache`` ones are
+    revalidated every time. Streamed requests and requests that are
+    already conditional bypass the cache.
+
+    Entries are keyed by URL and a hash of the ``Authorization`` header.
+    A successful write through the adapter forces every stored response
+    to be revalidated before its next use.
+
+    Responses served from the store have ``from_cache`` set to True.
+    """
+
+    def __init__(self, backend=None, **kwargs):
+        """
+        :param backend: Store with ``get(key)`` and ``set(key, entry)``
+            methods. Defaults to a MemoryCacheBackend.
+        :param kwargs: Passed through to PooledHTTPAdapter.
+        """
+        self.backend = backend or MemoryCacheBackend()
+        self._invalidated_at = 0.0
+        self._stats = dict.fromkeys(
+            ("hits", "revalidated", "misses", "stored", "bytes_saved"), 0
+        )
+        self._stats_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        :return: Dict with ``hits`` (served without a request),
+            ``revalidated`` (304 answers), ``misses``, ``stored`` and
+            ``bytes_saved`` (body bytes not downloaded).
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            response = super().send(request, stream=stream, **kwargs)
+            if response.ok:
+                self._invalidated_at = time.time()
+            return response
+        if stream or any(h in request.headers for h in _CONDITIONAL_HEADERS):
+            return super().send(request, stream=stream, **kwargs)
+        if "no-store" in parse_cache_control(
+            request.headers.get("Cache-Control")
+        ):
+            return super().send(request, stream=stream, **kwargs)
+
+        key = self._key(request)
+        entry = self.backend.get(key)
+        if entry is not None and not self._vary_matches(entry, request):
+            entry = None
+        if entry is not None and self._is_fresh(entry, request):
+            self._count("hits")
+            self._count("bytes_saved", len(entry["body"]))
+            return self._build_cached(request, entry)
+
+        if entry is not None:
+            if entry.get("etag"):
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+        response = super().send(request, stream=stream, **kwargs)
+
+        if entry is not None and response.status_code == 304:
+            # Drain the empty body so the connection returns to the pool
+            response.content
+            response.close()
+            headers = CaseInsensitiveDict(entry["headers"])
+            for name in _UPDATED_HEADERS:
+                if name in response.headers:
+                    headers[name] = response.headers[name]
+            entry["headers"] = dict(headers)
+            entry.update(self._validators(entry["headers"]))
+            entry["stored_at"] = time.time()
+            self.backend.set(key, entry)
+            self._count("revalidated")
+            self._count("bytes_saved", len(entry["body"]))
+            return self._build_cached(request, entry)
+
+        self._count("misses")
+        if response.status_code == 200 and request.method == "GET":
+            self._store(key, request, response)
+        response.from_cache = False
+        return response
+
+    @staticmethod
+    def _key(request):
+        authorization = request.headers.get("Authorization", "")
+        raw = f"{request.method} {request.url} {authorization}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _validators(headers):
+        headers = CaseInsensitiveDict(headers)
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        lifetime = None
+        if "no-cache" in directives:
+            lifetime = 0
+        elif "max-age" in directives:
+            try:
+                lifetime = max(0, int(directives["max-age"]))
+            except (TypeError, ValueError):
+                lifetime = 0
+            try:
+                age = max(0, int(headers.get("Age") or 0))
+            except ValueError:
+                age = 0
+            lifetime -= age
+        elif headers.get("Expires"):
+            expires = _http_date(headers["Expires"])
+            date = _http_date(headers.get("Date")) or time.time()
+            lifetime = expires - date if expires else 0
+        return {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "lifetime": lifetime,
+        }
+
+    def _store(self, key, request, response):
+        headers = dict(response.headers)
+        if "no-store" in parse_cache_control(headers.get("Cache-Control")):
+            return
+        validators = self._validators(headers)
+        if not (
+            validators["etag"]
+            or validators["last_modified"]
+            or validators["lifetime"]
+        ):
+            return
+        vary = [
+            name.strip() for name in headers.get("Vary", "").split(",")
+            if name.strip() and name.strip() != "Accept-Encoding"
+        ]
+        if "*" in vary:
+            return
+        for name in _TRANSFER_HEADERS:
+            headers.pop(name, None)
+        entry = {
+            "url": request.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": headers,
+            "body": response.content,
+            "vary": {name: request.headers.get(name) for name in vary},
+            "stored_at": time.time(),
+        }
+        entry.update(validators)
+        self.backend.set(key, entry)
+        self._count("stored")
+
+    def _is_fresh(self, entry, request):
+        if entry["stored_at"] <= self._invalidated_at:
+            return False
+        if "no-cache" in parse_cache_control(
+            request.headers.get("Cache-Control")
+        ):
+            return False
+        lifetime = entry.get("lifetime") or 0
+        return time.time() - entry["stored_at"] < lifetime
+
+    @staticmethod
+    def _vary_matches(entry, request):
+        return all(
+            request.headers.get(name) == value
+            for name, value in (entry.get("vary") or {}).items()
+        )
+
+    def _build_cached(self, request, entry):
+        response = Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers["Content-Length"] = str(len(entry["body"]))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry["body"]
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
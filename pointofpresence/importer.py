@@ -0,0 +1,347 @@
+# pointofpresence/importer.py
+
+import csv
+import io
+import json
+import os
+import re
+import sys
+from .concurrency import bounded_map
+from .validation import validate
+
+# DCAT properties of the NDP metadata mapping and the POP payload field
+# or ``extras:<key>`` they are stored in. Properties that CKAN keeps in
+# core dataset fields (tags, version, url, type) get their own extras
+# key, since those names are reserved.
+DCAT_FIELDS = {
+    "dct:title": "title",
+    "dct:description": "description",
+    "dcat:keyword": "extras:keywords",
+    "dcat:theme": "extras:theme",
+    "dct:identifier": "extras:identifier",
+    "dct:issued": "extras:issued",
+    "dct:modified": "extras:modified",
+    "owl:versionInfo": "extras:dataset_version",
+    "adms:versionNotes": "extras:version_notes",
+    "dct:language": "extras:language",
+    "dcat:landingPage": "extras:landing_page",
+    "dct:accrualPeriodicity": "extras:frequency",
+    "dct:accessRights": "extras:access_rights",
+    "foaf:page": "extras:documentation",
+    "dct:provenance": "extras:provenance",
+    "dcat-us:purpose": "extras:purpose",
+    "skos:scopeNote": "extras:usage",
+    "dct:type": "extras:data_type",
+    "dct:spatial": "extras:spatial_uri",
+    "dcat-us:geographicBoundingBox": "extras:bbox",
+    "dcat-us:describedBy": "extras:data_dictionary",
+    "dcat:temporalResolution": "extras:temporal_resolution",
+    "dcat:spatialResolutionInMeters": "extras:spatial_resolution_in_meters",
+    "dcat:accessURL": "access_url",
+    "dcat:downloadURL": "download_url",
+    "dcat:mediaType": "extras:mimetype",
+    "dct:format": "file_type",
+    "dct:license": "extras:license",
+    "adms:status": "extras:status",
+    "dcat:byteSize": "extras:size",
+    "dct:rights": "extras:rights",
+}
+
+# Payload fields accepted as they are, per registration kind
+PAYLOAD_FIELDS = {
+    "url": (
+        "resource_name", "resource_title", "owner_org", "resource_url",
+        "file_type", "notes", "extras", "mapping", "processing",
+    ),
+    "s3": (
+        "resource_name", "resource_title", "owner_org", "resource_s3",
+        "notes", "extras",
+    ),
+    "kafka": (
+        "dataset_name", "dataset_title", "owner_org", "kafka_topic",
+        "kafka_host", "kafka_port", "dataset_description", "extras",
+        "mapping", "processing",
+    ),
+}
+
+_NAME_FIELDS = {
+    "url": "resource_name",
+    "s3": "resource_name",
+    "kafka": "dataset_name",
+}
+_TITLE_FIELDS = {
+    "url": "resource_title",
+    "s3": "resource_title",
+    "kafka": "dataset_title",
+}
+_DESCRIPTION_FIELDS = {
+    "url": "notes",
+    "s3": "notes",
+    "kafka": "dataset_description",
+}
+_REGISTER_METHODS = {
+    "url": "register_url",
+    "s3": "register_s3_link",
+    "kafka": "register_kafka_topic",
+}
+_JSON_FIELDS = ("extras", "mapping", "processing")
+_ALL_FIELDS = frozenset(
+    field for fields in PAYLOAD_FIELDS.values() for field in fields
+)
+# Columns combined into payload fields by map_record
+_SPECIAL_FIELDS = frozenset(
+    ["kind", "name", "title", "description", "access_url", "download_url"]
+)
+
+
+def read_records(path: str, format: str = None):
+    """
+    Read metadata records lazily from a CSV or JSON Lines file.
+
+    :param path: File path, or "-" for standard input.
+    :param format: 'csv' or 'jsonl'. Defaults to the file extension.
+    :return: Generator of (line number, record dict). Blank JSON lines
+        are skipped and empty CSV cells are left out of the record. A
+        malformed CSV row or a JSON line that is not an object is yielded
+        as the ValueError describing it, so that one bad line does not
+        end the file.
+    :raises ValueError: If the format is unknown.
+    """
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        format = "jsonl" if extension in (".jsonl", ".ndjson") else "csv"
+    if format not in ("csv", "jsonl"):
+        raise ValueError("format must be 'csv' or 'jsonl'.")
+    return _read(path, format)
+
+
+def _read(path, format):
+    if path == "-":
+        stream = io.TextIOWrapper(
+            sys.stdin.buffer, encoding="utf-8-sig", newline=""
+        )
+        try:
+            yield from _parse(stream, format)
+        finally:
+            # Hand the buffer back so collecting the wrapper does not
+            # close standard input
+            stream.detach()
+        return
+    with open(path, newline="", encoding="utf-8-sig") as stream:
+        yield from _parse(stream, format)
+
+
+def _parse(stream, format):
+    if format == "csv":
+        reader = csv.DictReader(stream)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as err:
+                # DictReader only updates its line_num on success
+                number = reader.reader.line_num
+                yield number, ValueError(f"Invalid CSV: {err}")
+                continue
+            yield reader.line_num, {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value is not None and value.strip()
+            }
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as err:
+            record = ValueError(f"Invalid JSON: {err}")
+        if not isinstance(record, (dict, ValueError)):
+            record = ValueError("Expected a JSON object")
+        yield number, record
+
+
+def map_record(record: dict):
+    """
+    Map a metadata record to a POP registration payload.
+
+    Columns can be DCAT properties (see ``DCAT_FIELDS``), POP payload
+    fields, ``extras:<key>`` (the CKAN field names of the NDP mapping)
+    or ``kind``. Any other column is stored in ``extras``. The kind is
+    'kafka' when there is a ``kafka_topic``, 's3' for ``s3://`` URLs
+    and 'url' otherwise; a ``dcat:downloadURL`` wins over an
+    ``dcat:accessURL``. Without a name, one is derived from the title.
+
+    :param record: Dict of column to value.
+    :return: Tuple of the kind and the payload.
+    :raises ValueError: If the kind is unknown.
+    """
+    fields = {}
+    extras = {}
+    for column, value in record.items():
+        if value is None or value == "":
+            continue
+        target = DCAT_FIELDS.get(column, column)
+        for prefix in ("extras:", "extras."):
+            if target.startswith(prefix):
+                extras[target[len(prefix):].strip()] = _extra_value(value)
+                break
+        else:
+            if target in _JSON_FIELDS and isinstance(value, str):
+                value = json.loads(value)
+            if target in _ALL_FIELDS or target in _SPECIAL_FIELDS:
+                fields[target] = value
+            else:
+                extras[target] = _extra_value(value)
+    if isinstance(fields.get("extras"), dict):
+        extras = {**fields.pop("extras"), **extras}
+
+    url = fields.pop("download_url", None) or fields.pop("access_url", None)
+    fields.pop("access_url", None)
+    kind = fields.pop("kind", None)
+    if kind is None:
+        if "kafka_topic" in fields:
+            kind = "kafka"
+        elif str(url or fields.get("resource_s3", "")).startswith("s3://"):
+            kind = "s3"
+        else:
+            kind = "url"
+    if kind not in PAYLOAD_FIELDS:
+        raise ValueError("kind must be one of 'url', 's3' or 'kafka'.")
+    if url:
+        url_field = "resource_s3" if kind == "s3" else "resource_url"
+        fields.setdefault(url_field, url)
+
+    title = fields.pop("title", None)
+    if title:
+        fields.setdefault(_TITLE_FIELDS[kind], title)
+    description = fields.pop("description", None)
+    if description:
+        fields.setdefault(_DESCRIPTION_FIELDS[kind], description)
+    name = fields.pop("name", None) or fields.get(_NAME_FIELDS[kind])
+    if not name and title:
+        name = slugify(title)
+    if name:
+        fields[_NAME_FIELDS[kind]] = name
+
+    payload = {
+        key: value for key, value in fields.items()
+        if key in PAYLOAD_FIELDS[kind]
+    }
+    for key, value in fields.items():
+        if key not in payload:
+            extras[key] = _extra_value(value)
+    if extras:
+        payload["extras"] = extras
+    return kind, payload
+
+
+def _extra_value(value):
+    """Extras are stored as strings by CKAN."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    return json.dumps(value)
+
+
+def slugify(text: str) -> str:
+    """Return a CKAN dataset name (lowercase, digits, - and _) for text."""
+    return re.sub(r"[^a-z0-9_-]+", "_", text.lower()).strip("_")[:100]
+
+
+def iter_import(
+    client,
+    path: str,
+    server: str = "local",
+    format: str = None,
+    max_workers: int = 8,
+    max_pending: int = None,
+    dry_run: bool = False,
+):
+    """
+    Register the records of a CSV or JSON Lines file concurrently.
+
+    The file is read lazily and at most ``max_pending`` records are in
+    memory or in flight at any time, so files of any size use constant
+    memory and the registrations never outrun the server. Records that
+    cannot be mapped or fail validation (see
+    :mod:`pointofpresence.validation`) fail without a request.
+
+    :param client: APIClient used for the registrations; may be None
+        for a dry run.
+    :param path: File path, or "-" for standard input.
+    :param server: Specify 'local' or 'pre_ckan'. Defaults to 'local'.
+    :param format: 'csv' or 'jsonl'. Defaults to the file extension.
+    :param max_workers: Maximum number of concurrent registrations.
+    :param max_pending: Maximum number of records read ahead. Defaults
+        to twice ``max_workers``.
+    :param dry_run: Map and check the records without registering them.
+    :return: Generator of BulkResult in completion order. ``item`` is
+        the (line number, record) tuple and ``result`` a dict with the
+        ``kind``, ``name`` and ``id`` of the registered record.
+    """
+    def process(item):
+        _, record = item
+        if isinstance(record, ValueError):
+            raise record
+        kind, payload = map_record(record)
+        validate(kind, payload)
+        result = {
+            "kind": kind,
+            "name": payload[_NAME_FIELDS[kind]],
+            "id": None,
+        }
+        if not dry_run:
+            register = getattr(client, _REGISTER_METHODS[kind])
+            result["id"] = register(payload, server=server).get("id")
+        return result
+
+    return bounded_map(
+        process,
+        read_records(path, format),
+        max_workers=max_workers,
+        max_pending=max_pending,
+    )
+
+
+def import_file(client, path: str, results_path: str = None, **kwargs):
+    """
+    Register the records of a file and write one JSON line per record.
+
+    :param client: APIClient used for the registrations.
+    :param path: File path, or "-" for standard input.
+    :param results_path: File receiving, in completion order, a JSON
+        object per record with its ``line``, ``kind``, ``name``, ``id``
+        and ``error``. None writes nothing.
+    :param kwargs: Passed to :func:`iter_import`.
+    :return: Dict with the number of records ``total``, ``registered``
+        and ``failed``.
+    """
+    summary = {"total": 0, "registered": 0, "failed": 0}
+    output = None
+    if results_path:
+        output = open(results_path, "w", encoding="utf-8")
+    try:
+        for outcome in iter_import(client, path, **kwargs):
+            line = outcome.item[0]
+            summary["total"] += 1
+            if outcome.ok:
+                summary["registered"] += 1
+                entry = dict(line=line, **outcome.result, error=None)
+            else:
+                summary["failed"] += 1
+                entry = {
+                    "line": line,
+                    "kind": None,
+                    "name": None,
+                    "id": None,
+                    "error": str(outcome.error),
+                }
+            if output is not None:
+                output.write(json.dumps(entry) + "\n")
+                output.flush()
+    finally:
+        if output is not None:
+            output.close()
+    return summary
@@ -1,12 +1,26 @@
 # pointofpresence/list_organization_method.py
 
+import threading
+import time
 from .client_base import APIClientBase
-from requests.exceptions import HTTPError
+from .organization_index import OrganizationIndex
+from requests.exceptions import HTTPError, RequestException
 
 
 class APIClientOrganizationList(APIClientBase):
     """Extension of APIClientBase with method to list organizations."""
 
+    organization_refresh_interval = 300.0
+    _organization_indexes = None
+
+    def __init__(self, *args, **kwargs):
+        self._organization_lock = threading.Lock()
+        # Held while a server's list is fetched, without the main lock
+        self._organization_load_locks = {}
+        # Bumped by every organization write, see _load_organization_index
+        self._organization_generation = 0
+        super().__init__(*args, **kwargs)
+
     def list_organizations(self, name=None, server="global"):
         """
         List all organizations, with optional name filtering and server
@@ -30,3 +44,140 @@ class APIClientOrganizationList(APIClientBase):
         except HTTPError as e:
             error_detail = response.json().get("detail", str(e))
             raise ValueError(f"Error listing organizations: {error_detail}")
+
+    def organization_index(self, server="global", refresh=False):
+        """
+        Return the local index of the organizations of a server.
+
+        The full list is loaded on first use. Once it is older than
+        ``organization_refresh_interval`` seconds the current index is
+        still returned while a background thread reloads it. Registering
+        or deleting an organization through this client drops the index
+        of that server, so that the next call reloads it.
+
+        :param server: The CKAN server ('local', 'global', 'pre_ckan').
+        :param refresh: Reload the list now, waiting for the server.
+        :return: An OrganizationIndex.
+        :raises ValueError: If the list has to be loaded and the
+            retrieval fails.
+        """
+        with self._organization_lock:
+            if self._organization_indexes is None:
+                self._organization_indexes = {}
+                self.session.write_listeners.append(
+                    self._invalidate_organization_index
+                )
+                self._organization_indexes_refreshing = set()
+            entry = self._organization_indexes.get(server)
+        if entry is None or refresh:
+            # Concurrent first calls wait for one load instead of each
+            # fetching the full list
+            return self._load_organization_index(server, reuse=not refresh)
+        index, loaded_at = entry
+        if time.monotonic() - loaded_at > self.organization_refresh_interval:
+            self._refresh_organization_index(server)
+        return index
+
+    def find_organizations(
+        self, query, server="global", mode="prefix", limit=None
+    ):
+        """
+        Look organization names up in the local index.
+
+        The server is only asked again when the index has no match, in
+        which case the names it returns are added to the index.
+
+        :param query: Text typed by the user.
+        :param server: The CKAN server ('local', 'global', 'pre_ckan').
+        :param mode: 'prefix', 'contains' (the server's own filter) or
+            'fuzzy' (closest names first).
+        :param limit: Maximum number of names to return.
+        :return: List of organization names.
+        :raises ValueError: If the mode is unknown or the server lookup
+            fails.
+        """
+        if mode not in ("prefix", "contains", "fuzzy"):
+            raise ValueError(
+                "mode must be one of 'prefix', 'contains' or 'fuzzy'."
+            )
+        index = self.organization_index(server)
+        if mode == "fuzzy":
+            result = index.fuzzy(query, limit=limit or 10)
+        else:
+            result = getattr(index, mode)(query, limit)
+        if result or not query:
+            return result
+
+        # Cache miss: the organization may be newer than the index
+        names = self.list_organizations(name=query, server=server)
+        missing = [name for name in names if name not in index]
+        if missing:
+            index = OrganizationIndex(index.names() + missing)
+            with self._organization_lock:
+                loaded_at = self._organization_indexes.get(
+                    server, (None, time.monotonic())
+                )[1]
+                self._organization_indexes[server] = (index, loaded_at)
+            if mode == "fuzzy":
+                return index.fuzzy(query, limit=limit or 10)
+            return getattr(index, mode)(query, limit)
+        return result
+
+    def _load_organization_index(self, server, reuse=False):
+        """
+        Fetch the full list of a server and store its index.
+
+        The list is not stored if an organization write happened while
+        it was fetched, since it may predate the write.
+
+        :param reuse: Return the index another thread stored while this
+            one waited, instead of fetching again.
+        """
+        with self._organization_lock:
+            load_lock = self._organization_load_locks.setdefault(
+                server, threading.Lock()
+            )
+        with load_lock:
+            with self._organization_lock:
+                entry = self._organization_indexes.get(server)
+                if reuse and entry is not None:
+                    return entry[0]
+                generation = self._organization_generation
+            index = OrganizationIndex(self.list_organizations(server=server))
+            with self._organization_lock:
+                if generation == self._organization_generation:
+                    self._organization_indexes[server] = (
+                        index,
+                        time.monotonic(),
+                    )
+        return index
+
+    def _refresh_organization_index(self, server):
+        """Reload the index of a server in a background thread."""
+        with self._organization_lock:
+            if server in self._organization_indexes_refreshing:
+                return
+            self._organization_indexes_refreshing.add(server)
+
+        def reload():
+            try:
+                self._load_organization_index(server)
+            except (ValueError, RequestException):
+                pass  # Keep serving the previous index
+            finally:
+                with self._organization_lock:
+                    self._organization_indexes_refreshing.discard(server)
+
+        threading.Thread(target=reload, daemon=True).start()
+
+    def _invalidate_organization_index(self, method, url, params):
+        """Drop the indexes an organization write made stale."""
+        path = url[len(self.base_url):]
+        if not path.startswith("/organization"):
+            return
+        server = (params or {}).get("server")
+        with self._organization_lock:
+            self._organization_generation += 1
+            for name in list(self._organization_indexes):
+                if server is None or name in (server, "global"):
+                    del self._organization_indexes[name]
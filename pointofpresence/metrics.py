@@ -0,0 +1,234 @@
+# pointofpresence/metrics.py
+
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+# Endpoints whose path has more than one fixed segment
+_STATIC_ENDPOINTS = ("/status/kafka-details",)
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Collapse a request path into its endpoint, replacing identifiers.
+
+    ``/kafka/1234`` becomes ``/kafka/{id}`` so that metrics are grouped
+    per endpoint rather than per resource.
+
+    :param path: Request path relative to the API base URL.
+    :return: The endpoint template.
+    """
+    path = "/" + path.strip("/")
+    for endpoint in _STATIC_ENDPOINTS:
+        if path == endpoint or path.startswith(endpoint + "/"):
+            return endpoint
+    segments = path.split("/")[1:]
+    if not segments[0]:
+        return "/"
+    if len(segments) == 1:
+        return f"/{segments[0]}"
+    return f"/{segments[0]}/{{id}}"
+
+
+class _Series:
+    """Counters of one (method, endpoint, server) combination."""
+
+    def __init__(self, buckets):
+        self.status_codes = {}
+        self.bucket_counts = [0] * len(buckets)
+        self.latency_sum = 0.0
+        self.count = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+
+
+class MetricsRecorder:
+    """
+    Thread-safe recorder of client-side request metrics.
+
+    Requests are grouped by method, endpoint template and server. For each
+    group the recorder keeps request counts per status code, a latency
+    histogram, bytes sent and received, and the number of retries.
+    A recorder can be shared by several clients.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Upper bounds, in seconds, of the latency histogram
+            buckets.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        server,
+        status,
+        duration: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        retries: int = 0,
+    ):
+        """
+        Record one request.
+
+        :param method: HTTP method.
+        :param endpoint: Endpoint template, see :func:`endpoint_template`.
+        :param server: Value of the ``server`` parameter, or None.
+        :param status: HTTP status code, or ``"error"`` if no response
+            was received.
+        :param duration: Latency in seconds.
+        :param bytes_sent: Size of the request body.
+        :param bytes_received: Size of the response body.
+        :param retries: Number of retried attempts.
+        """
+        key = (method, endpoint, server or "")
+        bucket = bisect.bisect_left(self.buckets, duration)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.buckets)
+            series.status_codes[str(status)] = (
+                series.status_codes.get(str(status), 0) + 1
+            )
+            if bucket < len(self.buckets):
+                series.bucket_counts[bucket] += 1
+            series.latency_sum += duration
+            series.count += 1
+            series.bytes_sent += bytes_sent
+            series.bytes_received += bytes_received
+            series.retries += retries
+
+    def reset(self):
+        """Drop every recorded value."""
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> list:
+        """
+        Return a copy of the recorded metrics.
+
+        :return: List of dicts, one per (method, endpoint, server), with
+            ``count``, ``status_codes``, ``latency`` (``sum`` and
+            cumulative ``buckets``), ``bytes_sent``, ``bytes_received``
+            and ``retries``.
+        """
+        with self._lock:
+            result = []
+            for (method, endpoint, server), series in sorted(
+                self._series.items()
+            ):
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(self.buckets, series.bucket_counts):
+                    cumulative += count
+                    buckets[bound] = cumulative
+                result.append(
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "server": server,
+                        "count": series.count,
+                        "status_codes": dict(series.status_codes),
+                        "latency": {
+                            "sum": series.latency_sum,
+                            "buckets": buckets,
+                        },
+                        "bytes_sent": series.bytes_sent,
+                        "bytes_received": series.bytes_received,
+                        "retries": series.retries,
+                    }
+                )
+            return result
+
+    def to_prometheus(self, prefix: str = "pop_client") -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+
+        :param prefix: Prefix of every metric name.
+        :return: The exposition text.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def header(name, kind, text):
+            lines.append(f"# HELP {prefix}_{name} {text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        header("requests_total", "counter", "Requests sent to the POP API.")
+        for item in snapshot:
+            for status, count in sorted(item["status_codes"].items()):
+                labels = _labels(item, status=status)
+                lines.append(f"{prefix}_requests_total{{{labels}}} {count}")
+
+        header(
+            "request_duration_seconds",
+            "histogram",
+            "Latency of requests to the POP API.",
+        )
+        for item in snapshot:
+            for bound, count in item["latency"]["buckets"].items():
+                labels = _labels(item, le=repr(float(bound)))
+                lines.append(
+                    f"{prefix}_request_duration_seconds_bucket{{{labels}}} "
+                    f"{count}"
+                )
+            labels = _labels(item, le="+Inf")
+            lines.append(
+                f"{prefix}_request_duration_seconds_bucket{{{labels}}} "
+                f"{item['count']}"
+            )
+            labels = _labels(item)
+            lines.append(
+                f"{prefix}_request_duration_seconds_sum{{{labels}}} "
+                f"{item['latency']['sum']}"
+            )
+            lines.append(
+                f"{prefix}_request_duration_seconds_count{{{labels}}} "
+                f"{item['count']}"
+            )
+
+        for name, field, text in (
+            ("sent_bytes_total", "bytes_sent", "Request body bytes sent."),
+            (
+                "received_bytes_total",
+                "bytes_received",
+                "Response body bytes received.",
+            ),
+            ("retries_total", "retries", "Retried request attempts."),
+        ):
+            header(name, "counter", text)
+            for item in snapshot:
+                lines.append(
+                    f"{prefix}_{name}{{{_labels(item)}}} {item[field]}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _labels(item, **extra) -> str:
+    """Format the Prometheus labels of a snapshot item."""
+    labels = {
+        "method": item["method"],
+        "endpoint": item["endpoint"],
+        "server": item["server"],
+    }
+    labels.update(extra)
+    return ",".join(
+        f'{name}="{_escape(value)}"' for name, value in labels.items()
+    )
+
+
+def _escape(value) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
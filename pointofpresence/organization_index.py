@@ -0,0 +1,122 @@
+# pointofpresence/organization_index.py
+
+import bisect
+import difflib
+from collections import Counter
+
+
+class OrganizationIndex:
+    """
+    Immutable in-memory index of organization names.
+
+    Names are kept sorted by their lower-cased form, so prefix queries are
+    two binary searches. Lookups are case-insensitive and return names with
+    their original case.
+    """
+
+    def __init__(self, names):
+        """
+        :param names: Iterable of organization names.
+        """
+        pairs = sorted({(name.lower(), name) for name in names})
+        self._keys = [key for key, _ in pairs]
+        self._names = [name for _, name in pairs]
+        self._grams = None
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        key = name.lower()
+        position = bisect.bisect_left(self._keys, key)
+        return position < len(self._keys) and self._keys[position] == key
+
+    def names(self) -> list:
+        """Return every indexed name, sorted case-insensitively."""
+        return list(self._names)
+
+    def prefix(self, query: str, limit: int = None) -> list:
+        """
+        Return the names starting with ``query``.
+
+        :param query: Name prefix.
+        :param limit: Maximum number of names to return.
+        :return: Sorted list of matching names.
+        """
+        key = query.lower()
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_left(self._keys, key + "\U0010ffff", lo=start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._names[start:end]
+
+    def contains(self, query: str, limit: int = None) -> list:
+        """
+        Return the names containing ``query``, like the server filter.
+
+        :param query: Substring to look for.
+        :param limit: Maximum number of names to return.
+        :return: Sorted list of matching names.
+        """
+        key = query.lower()
+        result = []
+        for position, candidate in enumerate(self._keys):
+            if key in candidate:
+                result.append(self._names[position])
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    def fuzzy(
+        self, query: str, limit: int = 10, cutoff: float = 0.6
+    ) -> list:
+        """
+        Return the names most similar to ``query``, best match first.
+
+        Prefix matches come first, followed by names whose similarity
+        ratio (see ``difflib``) is at least ``cutoff``. Only the names
+        sharing the most character pairs with ``query`` are compared, so
+        the cost does not grow with the full index.
+
+        :param query: Approximate name.
+        :param limit: Maximum number of names to return.
+        :param cutoff: Minimum similarity, between 0 and 1.
+        :return: List of matching names.
+        """
+        result = self.prefix(query, limit)
+        if len(result) >= limit:
+            return result
+        key = query.lower()
+        shared = Counter()
+        for gram in _bigrams(key):
+            shared.update(self._bigram_index().get(gram, ()))
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(key)
+        scored = []
+        for position, _ in shared.most_common(max(50, 5 * limit)):
+            matcher.set_seq1(self._keys[position])
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                scored.append((-ratio, position))
+        seen = set(result)
+        for _, position in sorted(scored):
+            name = self._names[position]
+            if name not in seen:
+                seen.add(name)
+                result.append(name)
+        return result[:limit]
+
+    def _bigram_index(self) -> dict:
+        """Map each character pair to the positions of the names."""
+        if self._grams is None:
+            grams = {}
+            for position, key in enumerate(self._keys):
+                for gram in _bigrams(key):
+                    grams.setdefault(gram, []).append(position)
+            self._grams = grams
+        return self._grams
+
+
+def _bigrams(text: str) -> set:
+    padded = f" {text} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
@@ -0,0 +1,198 @@
+# pointofpresence/ratelimit.py
+
+import threading
+import time
+from .file_cache import load_json, locked_file, save_json
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the rate of an operation.
+
+    The bucket holds up to ``burst`` tokens and refills at ``rate`` tokens
+    per second. :meth:`acquire` takes a token, sleeping until one is
+    available, so callers are smoothed to the configured rate instead of
+    failing.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        """
+        :param rate: Tokens added per second.
+        :param burst: Bucket capacity. Defaults to ``max(1, rate)``.
+        :raises ValueError: If rate or burst is not positive.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        burst = max(1.0, rate) if burst is None else burst
+        if burst <= 0:
+            raise ValueError("burst must be positive.")
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take ``tokens`` if available.
+
+        :param tokens: Number of tokens to take.
+        :return: 0 if the tokens were taken, otherwise the number of
+            seconds until they will be available.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take ``tokens``, waiting until they are available.
+
+        :param tokens: Number of tokens to take.
+        :return: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a file shared by every process of
+    the host, so that they are limited together.
+
+    The file holds several buckets under different keys and is updated
+    under an inter-process lock, which costs a small file read and write
+    per acquisition.
+    """
+
+    def __init__(self, path: str, key: str, rate: float, burst=None):
+        """
+        :param path: State file.
+        :param key: Name of the bucket inside the file.
+        :param rate: Tokens added per second.
+        :param burst: Bucket capacity. Defaults to ``max(1, rate)``.
+        """
+        super().__init__(rate, burst)
+        self.path = path
+        self.key = key
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        with self._lock, locked_file(self.path):
+            state = load_json(self.path)
+            now = time.time()
+            available, updated = state.get(self.key, (self.burst, now))
+            available = min(
+                self.burst, available + max(0.0, now - updated) * self.rate
+            )
+            if available >= tokens:
+                available -= tokens
+                delay = 0.0
+            else:
+                delay = (tokens - available) / self.rate
+            state[self.key] = (available, now)
+            save_json(self.path, state)
+            return delay
+
+
+class RateLimiter:
+    """
+    Client-side rate limits per POP server and per kind of request.
+
+    Rules map ``(server, kind)`` to a rate in requests per second, or to a
+    ``(rate, burst)`` tuple. ``server`` is 'local', 'global', 'pre_ckan'
+    or ``"*"`` for any server, and ``kind`` is 'read', 'write' or
+    ``"*"``. The most specific rule applies, and each server gets its own
+    bucket::
+
+        RateLimiter({("*", "write"): 5, ("global", "read"): 20})
+
+    Requests over the limit wait for a token, so bursts are smoothed
+    instead of being rejected by the server. A limiter is thread-safe and
+    can be given to several clients to limit them together; with
+    ``state_file`` the buckets are also shared with other processes.
+    """
+
+    def __init__(self, rules: dict, state_file: str = None):
+        """
+        :param rules: Dict of ``(server, kind)`` to rate or (rate, burst).
+        :param state_file: Optional file holding the bucket states, to
+            share the limits between processes of the host.
+        :raises ValueError: If a kind is not 'read', 'write' or '*', or a
+            rate is not positive.
+        """
+        self.rules = {}
+        for (server, kind), limit in rules.items():
+            if kind not in ("read", "write", "*"):
+                raise ValueError("kind must be one of 'read', 'write', '*'.")
+            rate, burst = limit if isinstance(limit, tuple) else (limit, None)
+            TokenBucket(rate, burst)  # Validate
+            self.rules[(server, kind)] = (rate, burst)
+        self.state_file = state_file
+        self.waits = 0
+        self.waited = 0.0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, server, kind):
+        """Bucket of a (server, kind) pair, or None if it is unlimited."""
+        key = (server, kind)
+        with self._lock:
+            if key in self._buckets:
+                return self._buckets[key]
+            for rule in ((server, kind), (server, "*"), ("*", kind),
+                         ("*", "*")):
+                if rule in self.rules:
+                    rate, burst = self.rules[rule]
+                    break
+            else:
+                self._buckets[key] = None
+                return None
+            if self.state_file:
+                bucket = FileTokenBucket(
+                    self.state_file, f"{server}:{kind}", rate, burst
+                )
+            else:
+                bucket = TokenBucket(rate, burst)
+            self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, server, kind: str) -> float:
+        """
+        Wait until a request may be sent.
+
+        :param server: Server the request targets, or None.
+        :param kind: 'read' or 'write'.
+        :return: Seconds spent waiting.
+        """
+        bucket = self._bucket(server or "", kind)
+        if bucket is None:
+            return 0.0
+        waited = bucket.acquire()
+        if waited:
+            with self._lock:
+                self.waits += 1
+                self.waited += waited
+        return waited
+
+    def stats(self) -> dict:
+        """
+        Return the number of delayed requests and the total delay.
+
+        :return: Dict with ``waits`` and ``waited`` (seconds).
+        """
+        with self._lock:
+            return {"waits": self.waits, "waited": self.waited}
@@ -16,6 +16,7 @@ class APIClientKafkaRegister(APIClientBase):
         :return: Response JSON data with the topic ID.
         :raises ValueError: If the registration fails.
         """
+        self._validate("kafka", data)
         url = f"{self.base_url}/kafka"
         params = {"server": server}  # Send server as a query parameter
 
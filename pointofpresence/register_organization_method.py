@@ -15,6 +15,7 @@ class APIClientOrganizationRegister(APIClientBase):
         :return: Response JSON data with the organization ID and message.
         :raises ValueError: If the registration fails or name already exists.
         """
+        self._validate("organization", data)
         url = f"{self.base_url}/organization"
         params = {"server": server}
         try:
@@ -15,6 +15,7 @@ class APIClientS3Register(APIClientBase):
         :raises ValueError: If the registration fails or organization
                             does not exist.
         """
+        self._validate("s3", data)
         url = f"{self.base_url}/s3"
         params = {"server": server}
         try:
@@ -16,6 +16,7 @@ class APIClientURLRegister(APIClientBase):
         :return: Response JSON data with the resource ID.
         :raises ValueError: If the registration fails.
         """
+        self._validate("url", data)
         url = f"{self.base_url}/url"
         params = {"server": server}
         try:
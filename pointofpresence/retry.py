@@ -0,0 +1,134 @@
+# pointofpresence/retry.py
+
+import random
+import threading
+from urllib3.util.retry import Retry
+
+IDEMPOTENT_METHODS = frozenset(
+    ["GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"]
+)
+
+
+class _JitteredRetry(Retry):
+    """urllib3 Retry with capped exponential backoff and full jitter."""
+
+    backoff_cap = 30.0
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.backoff_cap = self.backoff_cap
+        return retry
+
+    def get_backoff_time(self):
+        # Only count the trailing errors, not redirects
+        consecutive_errors = 0
+        for entry in reversed(self.history):
+            if entry.redirect_location is not None:
+                break
+            consecutive_errors += 1
+        if consecutive_errors == 0:
+            return 0
+        ceiling = min(
+            self.backoff_cap,
+            self.backoff_factor * (2 ** (consecutive_errors - 1)),
+        )
+        return random.uniform(0, ceiling)
+
+
+class RetryPolicy:
+    """
+    Retry policy for the API client.
+
+    Failed requests are retried with exponential backoff capped at
+    ``backoff_cap`` and full jitter (the actual delay is drawn uniformly
+    between zero and the backoff). ``Retry-After`` headers sent with 429
+    and 503 responses take precedence over the backoff.
+
+    Only idempotent methods (GET, PUT, DELETE, ...) are retried after the
+    request reached the server; POST requests are retried on status codes
+    only when ``retry_post`` is True. Connection failures, where the
+    request never reached the server, are retried for every method.
+
+    When all attempts fail, the last response is returned so that the
+    usual ``ValueError`` error mapping of the client methods applies.
+
+    The policy also counts logical requests and HTTP attempts so that
+    retry amplification can be measured; see :attr:`amplification`.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        retry_on_status=(429, 500, 502, 503, 504),
+        retry_post: bool = False,
+        respect_retry_after: bool = True,
+    ):
+        """
+        :param max_attempts: Total number of attempts, including the first
+            one.
+        :param backoff_base: Backoff of the first retry, in seconds; it
+            doubles on every following retry.
+        :param backoff_cap: Maximum backoff, in seconds.
+        :param retry_on_status: HTTP status codes that trigger a retry.
+        :param retry_post: Also retry POST requests on those status codes.
+        :param respect_retry_after: Honor the Retry-After header.
+        :raises ValueError: If max_attempts is lower than 1.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_on_status = frozenset(retry_on_status)
+        self.retry_post = retry_post
+        self.respect_retry_after = respect_retry_after
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.attempts = 0
+
+    def to_urllib3(self) -> Retry:
+        """
+        Build the urllib3 Retry object used by the transport adapter.
+
+        :return: A urllib3 Retry configured from this policy.
+        """
+        allowed_methods = set(IDEMPOTENT_METHODS)
+        if self.retry_post:
+            allowed_methods.add("POST")
+        retry = _JitteredRetry(
+            total=self.max_attempts - 1,
+            backoff_factor=self.backoff_base,
+            status_forcelist=self.retry_on_status,
+            allowed_methods=frozenset(allowed_methods),
+            respect_retry_after_header=self.respect_retry_after,
+            raise_on_status=False,
+            raise_on_redirect=False,
+        )
+        retry.backoff_cap = self.backoff_cap
+        return retry
+
+    def response_hook(self, response, *args, **kwargs):
+        """
+        Requests response hook that stores the number of HTTP attempts in
+        ``response.attempts`` and updates the policy counters.
+        """
+        retries = getattr(response.raw, "retries", None)
+        if isinstance(retries, Retry):
+            attempts = len(retries.history) + 1
+        else:
+            attempts = 1
+        response.attempts = attempts
+        with self._lock:
+            self.requests += 1
+            self.attempts += attempts
+
+    @property
+    def amplification(self) -> float:
+        """Average number of HTTP attempts per request."""
+        with self._lock:
+            if not self.requests:
+                return 0.0
+            return self.attempts / self.requests
@@ -1,75 +1,295 @@
-from .client_base import APIClientBase
-from requests.exceptions import HTTPError
-
-
-class APIClientSearch(APIClientBase):
-    """
-    Extension of APIClientBase with search functionality for datasets.
-    """
-
-    def search_datasets(self, terms, keys=None, server="global"):
-        """
-        Search datasets by a list of terms with optional key specifications.
-
-        :param terms: A list of terms to search for in the datasets.
-        :param keys: An optional list specifying the keys for each term.
-                     Use `None` for a global search for the corresponding term.
-        :param server: Specify the server to search on: 'local', 'global' or
-        'pre-ckan'.
-        :return: List of matching datasets.
-        :raises ValueError: If the search fails or validation fails.
-        """
-        # Ensure terms and keys lengths match, if keys are provided
-        if keys is not None:
-            if len(keys) != len(terms):
-                raise ValueError(
-                    "The number of terms must match the number of keys, "
-                    "or keys must be omitted."
-                )
-            # Convert Python None to JSON null for the API
-            keys = [key if key is not None else "null" for key in keys]
-
-        url = f"{self.base_url}/search"
-        # Prepare the payload including optional keys
-        payload = {"terms": terms, "server": server}
-        if keys:
-            payload["keys"] = keys
-
-        try:
-            response = self.session.get(url, params=payload)
-            response.raise_for_status()
-            return response.json()
-        except HTTPError as e:
-            # Extract detailed error message from the API response if available
-            error_detail = response.json().get("detail", str(e))
-            raise ValueError(f"Error searching for datasets: {error_detail}")
-
-    def advanced_search(self, search_data: dict) -> list:
-        """
-        Perform an advanced search using the POST /search endpoint.
-
-        :param search_data: A dict matching the 'SearchRequest' model,
-            for example:
-            {
-                "dataset_name": "...",
-                "resource_url": "...",
-                "search_term": "...",
-                "filter_list": [...],
-                "server": "local"
-            }
-        :return: A list of matching datasets.
-        :raises ValueError: If the search or validation fails.
-        """
-        url = f"{self.base_url}/search"
-
-        try:
-            response = self.session.post(url, json=search_data)
-            response.raise_for_status()
-            return response.json()
-        except HTTPError as e:
-            error_detail = ""
-            try:
-                error_detail = response.json().get("detail", str(e))
-            except Exception:
-                error_detail = str(e)
-            raise ValueError(f"Error in advanced search: {error_detail}")
+import json
+from concurrent.futures import ThreadPoolExecutor
+from .cache import TTLCache
+from .client_base import APIClientBase
+from .streaming import iter_json_array
+from requests.exceptions import HTTPError
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class APIClientSearch(APIClientBase):
+    """
+    Extension of APIClientBase with search functionality for datasets.
+    """
+
+    _search_cache = None
+
+    def enable_search_cache(self, ttl: float = 60.0, maxsize: int = 256):
+        """
+        Cache the results of search_datasets and advanced_search.
+
+        Results are cached per normalized (terms, keys, server) and per
+        canonicalized search_data. Entries of a server are dropped when
+        this client registers, updates or deletes anything on it. Cached
+        results are shared between callers and must not be modified.
+
+        :param ttl: Seconds a result stays cached.
+        :param maxsize: Maximum number of cached results.
+        :return: The TTLCache, whose stats() reports hits and misses.
+        """
+        self.disable_search_cache()
+        self._search_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.session.write_listeners.append(self._invalidate_search_cache)
+        return self._search_cache
+
+    def disable_search_cache(self):
+        """Stop caching search results and drop the cached ones."""
+        if self._search_cache is None:
+            return
+        self.session.write_listeners.remove(self._invalidate_search_cache)
+        self._search_cache = None
+
+    def _invalidate_search_cache(self, method, url, params):
+        """Drop cached results of the server a write request touched."""
+        path = url[len(self.base_url):]
+        cache = self._search_cache
+        if cache is None or path.startswith(("/search", "/token")):
+            return
+        server = (params or {}).get("server")
+        if server is None:
+            cache.clear()
+        else:
+            cache.invalidate(server)
+            # Advanced searches that did not name their server
+            cache.invalidate(None)
+
+    def search_datasets(self, terms, keys=None, server="global"):
+        """
+        Search datasets by a list of terms with optional key specifications.
+
+        :param terms: A list of terms to search for in the datasets.
+        :param keys: An optional list specifying the keys for each term.
+                     Use `None` for a global search for the corresponding term.
+        :param server: Specify the server to search on: 'local', 'global' or
+        'pre-ckan'.
+        :return: List of matching datasets.
+        :raises ValueError: If the search fails or validation fails.
+        """
+        url = f"{self.base_url}/search"
+        payload = self._search_payload(terms, keys, server)
+
+        cache = self._search_cache
+        if cache is not None:
+            cache_key = (
+                "search",
+                tuple(terms),
+                tuple(payload.get("keys", ())) or None,
+                server,
+            )
+            found, result = cache.get(cache_key)
+            if found:
+                return result
+
+        try:
+            response = self.session.get(url, params=payload)
+            response.raise_for_status()
+            result = response.json()
+            if cache is not None:
+                cache.set(cache_key, result, tag=server)
+            return result
+        except HTTPError as e:
+            # Extract detailed error message from the API response if available
+            error_detail = response.json().get("detail", str(e))
+            raise ValueError(f"Error searching for datasets: {error_detail}")
+
+    @staticmethod
+    def _search_payload(terms, keys, server):
+        """
+        Build the query parameters of GET /search.
+
+        :raises ValueError: If terms and keys lengths differ.
+        """
+        # Ensure terms and keys lengths match, if keys are provided
+        if keys is not None:
+            if len(keys) != len(terms):
+                raise ValueError(
+                    "The number of terms must match the number of keys, "
+                    "or keys must be omitted."
+                )
+            # Convert Python None to JSON null for the API
+            keys = [key if key is not None else "null" for key in keys]
+
+        # Prepare the payload including optional keys
+        payload = {"terms": terms, "server": server}
+        if keys:
+            payload["keys"] = keys
+        return payload
+
+    def advanced_search(self, search_data: dict) -> list:
+        """
+        Perform an advanced search using the POST /search endpoint.
+
+        :param search_data: A dict matching the 'SearchRequest' model,
+            for example:
+            {
+                "dataset_name": "...",
+                "resource_url": "...",
+                "search_term": "...",
+                "filter_list": [...],
+                "server": "local"
+            }
+        :return: A list of matching datasets.
+        :raises ValueError: If the search or validation fails.
+        """
+        url = f"{self.base_url}/search"
+
+        cache = self._search_cache
+        if cache is not None:
+            cache_key = (
+                "advanced_search",
+                json.dumps(search_data, sort_keys=True, default=str),
+            )
+            found, result = cache.get(cache_key)
+            if found:
+                return result
+
+        try:
+            response = self.session.post(url, json=search_data)
+            response.raise_for_status()
+            result = response.json()
+            if cache is not None:
+                cache.set(cache_key, result, tag=search_data.get("server"))
+            return result
+        except HTTPError as e:
+            error_detail = ""
+            try:
+                error_detail = response.json().get("detail", str(e))
+            except Exception:
+                error_detail = str(e)
+            raise ValueError(f"Error in advanced search: {error_detail}")
+
+    def iter_search(
+        self, terms, keys=None, server="global", page_size=None,
+        prefetch=False,
+    ):
+        """
+        Iterate over the datasets matching a search without holding the
+        whole result list in memory.
+
+        Without ``page_size``, the response of a single request is decoded
+        incrementally as it streams in. With ``page_size``, results are
+        requested page by page through ``limit``/``offset`` parameters;
+        if the server ignores them and returns everything at once, the
+        iteration stops after that response.
+
+        :param terms: A list of terms to search for in the datasets.
+        :param keys: An optional list specifying the keys for each term.
+        :param server: Specify the server to search on: 'local', 'global' or
+        'pre-ckan'.
+        :param page_size: Number of datasets per request, or None to
+            stream a single response.
+        :param prefetch: Fetch the next page on a background thread while
+            the current one is consumed.
+        :return: Generator of matching datasets.
+        :raises ValueError: If the search fails or validation fails.
+        """
+        url = f"{self.base_url}/search"
+        payload = self._search_payload(terms, keys, server)
+
+        def fetch(**extra):
+            try:
+                response = self.session.get(
+                    url, params={**payload, **extra}, stream=True
+                )
+                response.raise_for_status()
+                return response
+            except HTTPError as e:
+                error_detail = response.json().get("detail", str(e))
+                raise ValueError(
+                    f"Error searching for datasets: {error_detail}"
+                )
+
+        return self._iter_results(fetch, page_size, prefetch)
+
+    def iter_advanced_search(
+        self, search_data: dict, page_size=None, prefetch=False
+    ):
+        """
+        Iterate over the results of an advanced search without holding
+        the whole result list in memory.
+
+        Paging and streaming work as in :meth:`iter_search`; the
+        ``limit``/``offset`` fields are added to ``search_data``.
+
+        :param search_data: A dict matching the 'SearchRequest' model.
+        :param page_size: Number of datasets per request, or None to
+            stream a single response.
+        :param prefetch: Fetch the next page on a background thread while
+            the current one is consumed.
+        :return: Generator of matching datasets.
+        :raises ValueError: If the search or validation fails.
+        """
+        url = f"{self.base_url}/search"
+
+        def fetch(**extra):
+            try:
+                response = self.session.post(
+                    url, json={**search_data, **extra}, stream=True
+                )
+                response.raise_for_status()
+                return response
+            except HTTPError as e:
+                error_detail = ""
+                try:
+                    error_detail = response.json().get("detail", str(e))
+                except Exception:
+                    error_detail = str(e)
+                raise ValueError(f"Error in advanced search: {error_detail}")
+
+        return self._iter_results(fetch, page_size, prefetch)
+
+    def _iter_results(self, fetch, page_size, prefetch):
+        """
+        Yield datasets from a streamed response or from successive pages.
+
+        Streamed items are decoded with the client's codec, like the
+        pages, whose ``response.json`` already uses it.
+
+        :param fetch: Callable sending the request with extra parameters
+            and returning the streamed response.
+        """
+        if page_size is None:
+            codec = self.session.codec
+            response = fetch()
+            try:
+                yield from iter_json_array(
+                    response.iter_content(STREAM_CHUNK_SIZE),
+                    loads=codec.loads if codec is not None else None,
+                )
+            finally:
+                response.close()
+            return
+
+        def fetch_page(offset):
+            response = fetch(limit=page_size, offset=offset)
+            try:
+                return response.json()
+            finally:
+                response.close()
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            offset = 0
+            page = fetch_page(offset)
+            previous = None
+            while page and page != previous:
+                next_page = None
+                if executor is not None and len(page) == page_size:
+                    next_page = executor.submit(
+                        fetch_page, offset + page_size
+                    )
+                yield from page
+                # Short pages end the search; longer ones mean the server
+                # does not paginate and already sent everything
+                if len(page) != page_size:
+                    break
+                offset += page_size
+                previous = page
+                if next_page is not None:
+                    page = next_page.result()
+                else:
+                    page = fetch_page(offset)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
@@ -0,0 +1,82 @@
+# pointofpresence/singleflight.py
+
+import threading
+
+
+class _Call:
+    """An in-flight call and its outcome."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls with the same key.
+
+    The first caller of a key runs the function; callers arriving while
+    it is in flight wait for it and receive the same result, or the same
+    exception. Once the call has finished the next caller runs it again,
+    so nothing is cached.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.collapsed = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function):
+        """
+        Run ``function`` once for all the concurrent callers of ``key``.
+
+        :param key: Hashable identity of the call.
+        :param function: Callable taking no arguments.
+        :return: Tuple of the result and True if it was shared from
+            another caller's call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.collapsed += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> dict:
+        """
+        Return the call counters.
+
+        :return: Dict with ``calls`` (functions actually run),
+            ``collapsed`` (callers that shared another call) and
+            ``in_flight``.
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._calls),
+            }
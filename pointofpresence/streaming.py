@@ -0,0 +1,142 @@
+# pointofpresence/streaming.py
+
+import codecs
+import json
+import re
+
+_WHITESPACE = " \t\n\r"
+# A whole string, and a run of text with no bracket outside strings
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_NO_BRACKET = re.compile(
+    r'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL
+)
+_SCALAR_END = re.compile(r"[,\]\s]")
+
+
+def iter_json_array(chunks, decoder=None, loads=None):
+    """
+    Decode a top-level JSON array incrementally.
+
+    Items are yielded as soon as they are complete, so memory use is
+    bounded by the size of the largest item instead of the whole
+    document.
+
+    :param chunks: Iterable of ``bytes`` (or ``str``) chunks, for example
+        ``response.iter_content(65536)``.
+    :param decoder: Optional ``json.JSONDecoder`` instance.
+    :param loads: Optional function decoding the JSON text of one item,
+        such as the ``loads`` method of a codec. Item boundaries are
+        then found by scanning brackets and strings, and each item is
+        decoded once, by ``loads``, instead of by ``decoder``.
+    :return: Generator of the decoded array items.
+    :raises ValueError: If the document is not a well-formed JSON array.
+    """
+    decoder = decoder or json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    exhausted = False
+
+    def fill():
+        # Drop the consumed text and append the next chunk
+        nonlocal buffer, position, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            tail = text_decoder.decode(b"", final=True)
+        elif isinstance(chunk, bytes):
+            tail = text_decoder.decode(chunk)
+        else:
+            tail = chunk
+        buffer = buffer[position:] + tail
+        position = 0
+
+    def peek():
+        # Next non-whitespace character, or None at the end of the input
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if exhausted:
+                return None
+            fill()
+
+    if peek() != "[":
+        raise ValueError("Expected a JSON array.")
+    position += 1
+    after_value = False
+    first = True
+
+    while True:
+        char = peek()
+        if char is None:
+            raise ValueError("Truncated JSON array.")
+        if char == "]" and (after_value or first):
+            return
+        if after_value:
+            if char != ",":
+                raise ValueError(f"Unexpected character {char!r} in array.")
+            position += 1
+            after_value = False
+            continue
+
+        if loads is not None:
+            end = _value_end(buffer, position)
+            while end is None and not exhausted:
+                fill()
+                end = _value_end(buffer, position)
+            if end is None:
+                end = len(buffer)  # Left to loads to reject
+            try:
+                value = loads(buffer[position:end])
+            except ValueError as err:
+                raise ValueError(f"Invalid JSON array item: {err}")
+            yield value
+            position = end
+            after_value = True
+            first = False
+            continue
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as err:
+                if exhausted:
+                    raise ValueError(f"Invalid JSON array item: {err}")
+                end = None
+            # A value ending exactly at the buffer end may be truncated
+            if end is not None and (end < len(buffer) or exhausted):
+                break
+            fill()
+        yield value
+        position = end
+        after_value = True
+        first = False
+
+
+def _value_end(text, position):
+    """
+    Return the end of the JSON value starting at ``position``, or None
+    if ``text`` does not hold all of it yet. The value is not checked.
+    """
+    char = text[position]
+    if char == '"':
+        match = _STRING.match(text, position)
+        return match.end() if match else None
+    if char not in "[{":
+        # A number or literal ends before a separator
+        match = _SCALAR_END.search(text, position)
+        return match.start() if match else None
+    depth = 0
+    while True:
+        # Jump to the next bracket, over strings and everything else
+        position = _NO_BRACKET.match(text, position).end()
+        if position == len(text) or text[position] == '"':
+            return None
+        depth += 1 if text[position] in "[{" else -1
+        position += 1
+        if depth == 0:
+            return position
@@ -0,0 +1,169 @@
+# pointofpresence/token_manager.py
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from .file_cache import cache_path, load_json, locked_file, save_json
+
+
+def decode_jwt_expiry(token: str):
+    """
+    Read the expiry time of a JWT without verifying its signature.
+
+    :param token: The access token.
+    :return: The ``exp`` claim as a Unix timestamp, or None if the token
+        is not a JWT or has no expiry.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims["exp"])
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+class TokenManager:
+    """
+    Cache and refresh the access token of one user on one API.
+
+    Tokens are kept in memory and, when a cache file is configured, on
+    disk so that other processes on the host reuse them instead of
+    requesting their own. The cache file is locked while a token is
+    fetched, so concurrent processes wait for one request to ``/token``.
+
+    When the token is a JWT with an expiry, a background timer fetches a
+    new token ``refresh_margin`` seconds before it expires and hands it to
+    ``on_refresh``.
+    """
+
+    def __init__(
+        self,
+        fetch,
+        cache_key: str,
+        cache_file: str = None,
+        refresh_margin: float = 60.0,
+        on_refresh=None,
+    ):
+        """
+        :param fetch: Callable requesting a new token from the API.
+        :param cache_key: Identifies the user and API, for example
+            ``"<base_url> <username>"``. Only its hash is stored.
+        :param cache_file: Path of the shared token cache file, or None to
+            keep tokens in memory only.
+        :param refresh_margin: Seconds before expiry at which a token is
+            considered stale and refreshed.
+        :param on_refresh: Callable receiving tokens fetched by the
+            background refresh.
+        """
+        self._fetch = fetch
+        self._key = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+        self.cache_file = cache_file
+        self.refresh_margin = refresh_margin
+        self.on_refresh = on_refresh
+
+        self._lock = threading.RLock()
+        self._token = None
+        self._expires_at = None
+        self._timer = None
+
+    @staticmethod
+    def default_cache_file() -> str:
+        """Return the path of the default shared token cache file."""
+        return cache_path("tokens.json")
+
+    def get_token(self) -> str:
+        """
+        Return a valid token, fetching one only if none is cached.
+
+        :return: The access token.
+        :raises ValueError: If a new token cannot be obtained.
+        """
+        with self._lock:
+            if self._token and self._is_fresh(self._expires_at):
+                return self._token
+            return self._renew(stale_token=None)
+
+    def refresh(self, stale_token: str = None) -> str:
+        """
+        Replace a token rejected by the API.
+
+        If another thread or process already replaced ``stale_token``, the
+        newer token is returned without a new request.
+
+        :param stale_token: The token that was rejected.
+        :return: The new access token.
+        :raises ValueError: If a new token cannot be obtained.
+        """
+        with self._lock:
+            if self._token and self._token != stale_token:
+                return self._token
+            return self._renew(stale_token=stale_token or self._token)
+
+    def close(self):
+        """Cancel the background refresh."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _is_fresh(self, expires_at) -> bool:
+        if expires_at is None:
+            return True
+        return expires_at - self.refresh_margin > time.time()
+
+    def _renew(self, stale_token):
+        if self.cache_file is None:
+            self._store(self._fetch())
+            return self._token
+
+        with locked_file(self.cache_file):
+            entry = load_json(self.cache_file).get(self._key)
+            if (
+                entry
+                and entry.get("token") != stale_token
+                and self._is_fresh(entry.get("expires_at"))
+            ):
+                self._store(entry["token"])
+                return self._token
+
+            self._store(self._fetch())
+            cache = load_json(self.cache_file)
+            cache[self._key] = {
+                "token": self._token,
+                "expires_at": self._expires_at,
+            }
+            save_json(self.cache_file, cache)
+        return self._token
+
+    def _store(self, token):
+        self._token = token
+        self._expires_at = decode_jwt_expiry(token)
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._expires_at is None:
+            return
+        delay = self._expires_at - self.refresh_margin - time.time()
+        if delay <= 0:
+            # Lifetime shorter than the margin: rely on 401 handling
+            return
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        try:
+            token = self.refresh(stale_token=self._token)
+        except ValueError:
+            # The next request will get a 401 and re-authenticate
+            return
+        if self.on_refresh is not None:
+            self.on_refresh(token)
@@ -0,0 +1,393 @@
+# pointofpresence/transport.py
+
+import functools
+import threading
+import time
+import requests
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from .circuit_breaker import CircuitOpenError
+from .codec import JSONCodec
+from .failover import request_not_sent
+from .metrics import endpoint_template
+
+WRITE_METHODS = frozenset(["POST", "PUT", "PATCH", "DELETE"])
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that reaps idle keep-alive connections.
+
+    Servers and load balancers silently close keep-alive connections that
+    stay idle for too long; reusing one of them costs a failed request
+    and a reconnect. When ``pool_idle_timeout`` is set and the adapter has
+    had no traffic for that many seconds, every pooled connection is
+    closed before the next request is sent.
+    """
+
+    def __init__(self, pool_idle_timeout=None, **kwargs):
+        """
+        :param pool_idle_timeout: Seconds without traffic after which the
+            pooled connections are discarded. None disables reaping.
+        :param kwargs: Passed through to ``requests.adapters.HTTPAdapter``.
+        """
+        self.pool_idle_timeout = pool_idle_timeout
+        self._last_used = time.monotonic()
+        self._in_flight = 0
+        self._idle_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        with self._idle_lock:
+            self._reap_idle_connections()
+            self._in_flight += 1
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            with self._idle_lock:
+                self._in_flight -= 1
+                self._last_used = time.monotonic()
+
+    def _reap_idle_connections(self):
+        """Close pooled connections if the adapter has been idle too long."""
+        if self.pool_idle_timeout is None or self._in_flight:
+            return
+        if time.monotonic() - self._last_used >= self.pool_idle_timeout:
+            self.poolmanager.clear()
+
+
+class POPSession(requests.Session):
+    """
+    requests Session used by the API client.
+
+    An initializer registered with :meth:`defer` runs once, before the
+    first request is sent. Concurrent first requests wait for it to
+    finish, and requests issued by the initializer itself (for example
+    the token request) go straight through. If the initializer fails, it
+    is run again on the next request.
+
+    When ``reauthenticate`` is set, an authenticated request rejected with
+    401 calls it with the rejected ``Authorization`` header and, if it
+    returns True, is replayed once with the renewed session headers.
+
+    When ``codec`` is set, ``json=`` request bodies are serialized and
+    ``response.json()`` is decoded with it instead of the standard library.
+
+    When ``metrics`` is set to a MetricsRecorder, every request is recorded
+    under its endpoint (relative to ``base_url``) and server.
+
+    When ``circuit_breaker`` is set to a CircuitBreaker, requests to a
+    server whose circuit is open raise CircuitOpenError without being
+    sent, and the outcome of every other request is recorded.
+
+    When ``endpoints`` is set to an EndpointPool, ``base_url`` is its
+    primary and requests under it are sent to the endpoint the pool
+    picks, failing over to the next one on connection errors. Writes
+    only fail over when the request was not sent.
+
+    When ``single_flight`` is set to a SingleFlight, concurrent GET
+    requests with the same URL, parameters and headers (including the
+    ``Authorization`` header) share one HTTP call; every caller but the
+    first receives its own copy of the response.
+
+    When ``compressor`` is set to a BodyCompressor, large JSON request
+    bodies are compressed with a ``Content-Encoding`` header, and the
+    sizes of compressed responses are recorded.
+
+    When ``rate_limiter`` is set to a RateLimiter, every request first
+    waits for a token of its server and kind: POST /search is a read, and
+    any other POST, PUT, PATCH or DELETE is a write.
+
+    Callables in ``write_listeners`` are called with the method, URL and
+    query parameters of every successful POST, PUT, PATCH or DELETE
+    request, so that client-side caches can be invalidated.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._initializer = None
+        self._initializing = False
+        self._ready = True
+        self._init_lock = threading.RLock()
+        self.reauthenticate = None
+        self.codec = None
+        self.metrics = None
+        self.rate_limiter = None
+        self.circuit_breaker = None
+        self.endpoints = None
+        self.single_flight = None
+        self.compressor = None
+        self.base_url = None
+        self.write_listeners = []
+        self._local = threading.local()
+
+    def defer(self, initializer):
+        """
+        Run ``initializer`` before the first request.
+
+        :param initializer: Callable taking no arguments.
+        """
+        with self._init_lock:
+            self._initializer = initializer
+            self._ready = False
+
+    def request(self, method, url, *args, **kwargs):
+        if not self._ready:
+            self._ensure_ready()
+        method = method.upper()
+        if (
+            self.single_flight is not None
+            and method == "GET"
+            and not kwargs.get("stream")
+        ):
+            response, shared = self.single_flight.do(
+                self._flight_key(url, kwargs),
+                lambda: self._request(method, url, *args, **kwargs),
+            )
+            return _copy_response(response) if shared else response
+        return self._request(method, url, *args, **kwargs)
+
+    def _request(self, method, url, *args, **kwargs):
+        server = request_server(kwargs)
+        kind = self._kind(method, url)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(server, kind)
+        codec = self.codec
+        if kwargs.get("json") is not None and (
+            codec is not None or self.compressor is not None
+        ):
+            self._encode_json_body(codec or JSONCodec(), kwargs)
+        if self.compressor is not None and isinstance(
+            kwargs.get("data"), bytes
+        ):
+            self._compress_body(kwargs)
+
+        if self.endpoints is not None and url.startswith(self.base_url):
+            response = self._failover_request(
+                kind, server, method, url, *args, **kwargs
+            )
+        else:
+            response = self._send(
+                self.base_url, server, method, url, *args, **kwargs
+            )
+
+        if self.compressor is not None:
+            if kwargs.get("stream"):
+                self.compressor.count_stream(response)
+            else:
+                self.compressor.record_response(response)
+        if self.write_listeners and method in WRITE_METHODS and response.ok:
+            for listener in self.write_listeners:
+                listener(method, url, kwargs.get("params"))
+        if codec is not None:
+            response.json = functools.partial(
+                _decode_json, codec, response
+            )
+        return response
+
+    def _failover_request(self, kind, server, method, url, *args, **kwargs):
+        """
+        Send a request to the best endpoint of ``endpoints``, moving on to
+        the next one after a connection error or an open circuit.
+        """
+        path = url[len(self.base_url):]
+        candidates = self.endpoints.candidates(kind)
+        for position, base in enumerate(candidates):
+            last = position == len(candidates) - 1
+            start = time.perf_counter()
+            try:
+                response = self._send(
+                    base, server, method, base + path, *args, **kwargs
+                )
+            except CircuitOpenError:
+                if last:
+                    raise
+                continue
+            except requests.exceptions.ConnectionError as exc:
+                self.endpoints.mark_down(base)
+                if last or (kind == "write" and not request_not_sent(exc)):
+                    raise
+                continue
+            self.endpoints.observe(
+                base, time.perf_counter() - start, response.status_code
+            )
+            return response
+
+    def _send(self, base, server, method, url, *args, **kwargs):
+        """
+        Send a request to the API at ``base``.
+
+        The circuit breaker admits the request here, right before it is
+        sent, so that every admitted request, including a half-open
+        probe, reaches :meth:`CircuitBreaker.record` whatever happens.
+        """
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return self._unguarded_send(server, method, url, *args, **kwargs)
+        breaker.before_request(base, server)
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = self._unguarded_send(
+                server, method, url, *args, **kwargs
+            )
+            ok = response.status_code < 500
+            return response
+        finally:
+            breaker.record(base, server, ok, time.perf_counter() - start)
+
+    def _unguarded_send(self, server, method, url, *args, **kwargs):
+        if self.metrics is None:
+            return self._request_with_reauth(method, url, *args, **kwargs)
+        return self._measured_request(server, method, url, *args, **kwargs)
+
+    def _request_with_reauth(self, method, url, *args, **kwargs):
+        """Send a request, replaying it once after a 401 if possible."""
+        response = super().request(method, url, *args, **kwargs)
+        if response.status_code == 401 and self._should_reauthenticate(
+            response
+        ):
+            self._local.reauthenticating = True
+            try:
+                renewed = self.reauthenticate(
+                    response.request.headers.get("Authorization")
+                )
+            finally:
+                self._local.reauthenticating = False
+            if renewed:
+                response = super().request(method, url, *args, **kwargs)
+        return response
+
+    def _measured_request(self, server, method, url, *args, **kwargs):
+        """Send a request and record it in ``metrics``."""
+        endpoint = endpoint_template(self._path(url))
+        start = time.perf_counter()
+        try:
+            response = self._request_with_reauth(method, url, *args, **kwargs)
+        except requests.exceptions.RequestException:
+            self.metrics.record(
+                method, endpoint, server, "error", time.perf_counter() - start
+            )
+            raise
+        duration = time.perf_counter() - start
+
+        if kwargs.get("stream"):
+            received = int(response.headers.get("Content-Length") or 0)
+        else:
+            received = len(response.content or b"")
+        attempts = getattr(response, "attempts", 1)
+        self.metrics.record(
+            method,
+            endpoint,
+            server,
+            response.status_code,
+            duration,
+            bytes_sent=_body_size(response.request.body),
+            bytes_received=received,
+            retries=attempts - 1 if isinstance(attempts, int) else 0,
+        )
+        return response
+
+    def _flight_key(self, url, kwargs):
+        """Identity of a GET request for ``single_flight``."""
+        params = kwargs.get("params")
+        if isinstance(params, dict):
+            params = sorted((str(k), str(v)) for k, v in params.items())
+        headers = dict(self.headers)
+        headers.update(kwargs.get("headers") or {})
+        return url, repr(params), repr(sorted(headers.items()))
+
+    def _kind(self, method, url):
+        """'write' for requests that modify the catalog, else 'read'."""
+        if method in WRITE_METHODS and not self._path(url).startswith(
+            "/search"
+        ):
+            return "write"
+        return "read"
+
+    def _path(self, url):
+        """Path of ``url`` relative to the API base URL."""
+        if self.endpoints is not None:
+            bases = self.endpoints.urls
+        else:
+            bases = [self.base_url] if self.base_url else []
+        for base in bases:
+            if url.startswith(base):
+                return urlparse(url[len(base):]).path
+        return urlparse(url).path
+
+    @staticmethod
+    def _encode_json_body(codec, kwargs):
+        """Replace the ``json`` argument with a codec-encoded body."""
+        kwargs["data"] = codec.dumps(kwargs.pop("json"))
+        headers = dict(kwargs.get("headers") or {})
+        headers.setdefault("Content-Type", "application/json")
+        kwargs["headers"] = headers
+
+    def _compress_body(self, kwargs):
+        """Compress an encoded body with ``compressor`` if it is large."""
+        data, encoding = self.compressor.compress_body(kwargs["data"])
+        if encoding is not None:
+            kwargs["data"] = data
+            headers = dict(kwargs.get("headers") or {})
+            headers["Content-Encoding"] = encoding
+            kwargs["headers"] = headers
+
+    def _should_reauthenticate(self, response):
+        return (
+            self.reauthenticate is not None
+            and "Authorization" in response.request.headers
+            and not getattr(self._local, "reauthenticating", False)
+        )
+
+    def _ensure_ready(self):
+        with self._init_lock:
+            if self._ready or self._initializing:
+                return
+            self._initializing = True
+            try:
+                self._initializer()
+                self._ready = True
+                self._initializer = None
+            finally:
+                self._initializing = False
+
+
+def _decode_json(codec, response, **kwargs):
+    """Replacement for ``Response.json`` using ``codec``."""
+    return codec.loads(response.content)
+
+
+def _copy_response(response):
+    """Copy of a loaded response, for a caller that shares it."""
+    clone = requests.Response.__new__(requests.Response)
+    clone.__dict__.update(response.__dict__)
+    if isinstance(clone.__dict__.get("json"), functools.partial):
+        # Codec decoding bound to the original response
+        clone.json = functools.partial(
+            clone.json.func, clone.json.args[0], clone
+        )
+    return clone
+
+
+def request_server(kwargs):
+    """
+    Return the POP ``server`` a request targets, from its query parameters
+    or, for advanced searches, its JSON body.
+    """
+    params = kwargs.get("params")
+    if isinstance(params, dict) and params.get("server"):
+        return params["server"]
+    body = kwargs.get("json")
+    if isinstance(body, dict):
+        return body.get("server")
+    return None
+
+
+def _body_size(body):
+    """Size in bytes of a prepared request body."""
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return 0
@@ -0,0 +1,208 @@
+# pointofpresence/validation.py
+
+import re
+
+# Dataset fields that cannot be overridden through ``extras``
+RESERVED_EXTRAS_KEYS = frozenset(
+    [
+        "id",
+        "name",
+        "title",
+        "owner_org",
+        "notes",
+        "resources",
+        "tags",
+        "groups",
+        "state",
+        "type",
+        "url",
+        "version",
+        "extras",
+        "private",
+        "license_id",
+    ]
+)
+
+# CKAN names: 2 to 100 lowercase alphanumeric characters, - and _
+NAME_PATTERN = re.compile(r"[a-z0-9_-]{2,100}\Z")
+URL_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*://\S+\Z")
+
+_STR = (str,)
+_DICT = (dict,)
+
+# Per payload kind: (field, accepted types, required); name fields and
+# URL fields are additionally checked against the patterns above
+_SCHEMAS = {
+    "organization": (
+        ("name", _STR, True),
+        ("title", _STR, False),
+        ("description", _STR, False),
+    ),
+    "url": (
+        ("resource_name", _STR, True),
+        ("resource_title", _STR, False),
+        ("owner_org", _STR, True),
+        ("resource_url", _STR, True),
+        ("file_type", _STR, False),
+        ("notes", _STR, False),
+        ("extras", _DICT, False),
+        ("mapping", _DICT, False),
+        ("processing", _DICT, False),
+    ),
+    "s3": (
+        ("resource_name", _STR, True),
+        ("resource_title", _STR, False),
+        ("owner_org", _STR, True),
+        ("resource_s3", _STR, True),
+        ("notes", _STR, False),
+        ("extras", _DICT, False),
+    ),
+    "kafka": (
+        ("dataset_name", _STR, True),
+        ("dataset_title", _STR, False),
+        ("owner_org", _STR, True),
+        ("kafka_topic", _STR, True),
+        ("kafka_host", _STR, True),
+        ("kafka_port", (str, int), True),
+        ("dataset_description", _STR, False),
+        ("extras", _DICT, False),
+        ("mapping", _DICT, False),
+        ("processing", _DICT, False),
+    ),
+}
+
+_NAME_FIELDS = ("name", "resource_name", "dataset_name")
+_URL_FIELDS = ("resource_url",)
+
+
+class PayloadValidationError(ValueError):
+    """
+    Raised when payloads are rejected before being sent.
+
+    :ivar errors: List of (index, message) tuples, one per invalid
+        payload; the index is 0 for a single payload.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        first = "; ".join(message for _, message in errors[:3])
+        more = f" (and {len(errors) - 3} more)" if len(errors) > 3 else ""
+        super().__init__(f"Invalid input: {first}{more}")
+
+
+class PayloadValidator:
+    """
+    Validator of one kind of registration payload.
+
+    The schema is compiled once into flat tuples of checks, so that a
+    payload is validated with a few dict lookups and ``isinstance``
+    calls, without building intermediate objects.
+    """
+
+    __slots__ = ("kind", "_required", "_typed", "_names", "_urls")
+
+    def __init__(self, kind: str):
+        """
+        :param kind: 'organization', 'url', 's3' or 'kafka'.
+        :raises ValueError: If the kind is unknown.
+        """
+        if kind not in _SCHEMAS:
+            raise ValueError(
+                f"kind must be one of {', '.join(sorted(_SCHEMAS))}."
+            )
+        schema = _SCHEMAS[kind]
+        self.kind = kind
+        self._required = tuple(field for field, _, req in schema if req)
+        self._typed = tuple(
+            (field, types, " or ".join(t.__name__ for t in types))
+            for field, types, _ in schema
+        )
+        self._names = tuple(f for f, _, _ in schema if f in _NAME_FIELDS)
+        self._urls = tuple(f for f, _, _ in schema if f in _URL_FIELDS)
+
+    def errors(self, payload) -> list:
+        """
+        Return the problems of a payload.
+
+        :param payload: Registration payload.
+        :return: List of messages; empty when the payload is valid.
+        """
+        if not isinstance(payload, dict):
+            return ["payload must be a dict"]
+        errors = [
+            f"{field} is required"
+            for field in self._required
+            if payload.get(field) in (None, "")
+        ]
+        for field, types, type_names in self._typed:
+            value = payload.get(field)
+            if value is not None and not isinstance(value, types):
+                errors.append(f"{field} must be a {type_names}")
+        for field in self._names:
+            value = payload.get(field)
+            if isinstance(value, str) and value and not NAME_PATTERN.match(
+                value
+            ):
+                errors.append(
+                    f"{field} must be 2 to 100 lowercase letters, digits, "
+                    "'-' or '_'"
+                )
+        for field in self._urls:
+            value = payload.get(field)
+            if isinstance(value, str) and value and not URL_PATTERN.match(
+                value
+            ):
+                errors.append(f"{field} must be an absolute URL")
+        extras = payload.get("extras")
+        if isinstance(extras, dict):
+            reserved = RESERVED_EXTRAS_KEYS.intersection(extras)
+            if reserved:
+                errors.append(
+                    f"Reserved key error: {', '.join(sorted(reserved))}"
+                )
+        return errors
+
+    def __call__(self, payload):
+        """
+        Validate a payload.
+
+        :raises PayloadValidationError: If the payload is invalid.
+        """
+        errors = self.errors(payload)
+        if errors:
+            raise PayloadValidationError([(0, ", ".join(errors))])
+
+
+VALIDATORS = {kind: PayloadValidator(kind) for kind in _SCHEMAS}
+
+
+def validate(kind: str, payload: dict):
+    """
+    Validate one registration payload.
+
+    :param kind: 'organization', 'url', 's3' or 'kafka'.
+    :param payload: Registration payload.
+    :raises PayloadValidationError: If the payload is invalid.
+    """
+    VALIDATORS[kind](payload)
+
+
+def validate_many(kind: str, payloads) -> list:
+    """
+    Validate a batch of payloads before any of them is sent.
+
+    :param kind: 'organization', 'url', 's3' or 'kafka'.
+    :param payloads: Iterable of registration payloads.
+    :return: The payloads as a list.
+    :raises PayloadValidationError: With every invalid payload, if any.
+    """
+    payloads = list(payloads)
+    errors = VALIDATORS[kind].errors
+    problems = []
+    for index, payload in enumerate(payloads):
+        found = errors(payload)
+        if found:
+            problems.append((index, f"item {index}: {', '.join(found)}"))
+    if problems:
+        raise PayloadValidationError(problems)
+    return payloads
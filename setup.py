@@ -45,10 +45,13 @@ setup(
     url="https://github.com/sci-ndp/pop-py",
     packages=find_packages(),
     install_requires=install_requires,
+    entry_points={
+        "console_scripts": ["pop=pointofpresence.cli:main"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
 )
@@ -0,0 +1,419 @@
+# tests/test_async_client.py
+
+import functools
+import httpx
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from pointofpresence.async_client import AsyncAPIClient
+
+
+def _http_error_response(detail, status_code=400):
+    """Build a mocked response whose raise_for_status fails."""
+    mock_response = MagicMock()
+    mock_response.status_code = status_code
+    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        "HTTP Error", request=MagicMock(), response=MagicMock()
+    )
+    mock_response.json.return_value = {"detail": detail}
+    return mock_response
+
+
+def test_init_with_token():
+    """Test initialization with a token sets the Authorization header."""
+    client = AsyncAPIClient(
+        base_url="api.example.com/", token="test-token"
+    )
+
+    assert client.base_url == "http://api.example.com"
+    assert client.session.headers["Authorization"] == "Bearer test-token"
+
+
+def test_init_token_conflict():
+    """Test that token and username/password cannot be combined."""
+    with pytest.raises(ValueError) as exc_info:
+        AsyncAPIClient(
+            base_url="https://api.example.com",
+            token="test-token",
+            username="user",
+            password="pass",
+        )
+
+    assert (
+        str(exc_info.value)
+        == "Provide either a token or username/password, not both."
+    )
+
+
+@pytest.mark.asyncio
+async def test_open_with_credentials_gets_token():
+    """Test that entering the context manager obtains a token."""
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"access_token": "async-token"}
+
+    with patch.object(
+        httpx.AsyncClient, "post", new=AsyncMock(return_value=mock_response)
+    ) as mock_post:
+        async with AsyncAPIClient(
+            base_url="https://api.example.com",
+            username="user",
+            password="pass",
+        ) as client:
+            assert client.token == "async-token"
+            assert (
+                client.session.headers["Authorization"]
+                == "Bearer async-token"
+            )
+
+    mock_post.assert_awaited_once_with(
+        "https://api.example.com/token",
+        data={"username": "user", "password": "pass"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_open_without_credentials_checks_availability():
+    """Test that open() probes the API when no credentials are given."""
+    with patch.object(
+        httpx.AsyncClient,
+        "get",
+        new=AsyncMock(side_effect=httpx.ConnectError("refused")),
+    ):
+        with pytest.raises(ValueError) as exc_info:
+            await AsyncAPIClient.create(base_url="https://api.example.com")
+
+    assert "Failed to connect to the API" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_register_kafka_topic_success():
+    """Test the async register_kafka_topic method."""
+    client = AsyncAPIClient(base_url="https://api.example.com", token="t")
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"id": "12345"}
+    data = {"dataset_name": "kafka_topic_example"}
+
+    with patch.object(
+        httpx.AsyncClient, "post", new=AsyncMock(return_value=mock_response)
+    ) as mock_post:
+        response = await client.register_kafka_topic(data)
+
+    assert response == {"id": "12345"}
+    mock_post.assert_awaited_once_with(
+        "https://api.example.com/kafka",
+        json=data,
+        params={"server": "local"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_register_url_organization_missing():
+    """Test that register_url maps errors like the sync client."""
+    client = AsyncAPIClient(base_url="https://api.example.com", token="t")
+
+    with patch.object(
+        httpx.AsyncClient,
+        "post",
+        new=AsyncMock(
+            return_value=_http_error_response("Organization does not exist")
+        ),
+    ):
+        with pytest.raises(ValueError) as exc_info:
+            await client.register_url({"resource_name": "r"})
+
+    assert str(exc_info.value) == (
+        "Error creating URL resource: Organization "
+        "(owner_org) does not exist."
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_datasets_with_keys():
+    """Test the async search_datasets method with keys."""
+    client = AsyncAPIClient(base_url="https://api.example.com", token="t")
+    mock_response = MagicMock()
+    mock_response.json.return_value = [{"name": "example_dataset_name"}]
+
+    with patch.object(
+        httpx.AsyncClient, "get", new=AsyncMock(return_value=mock_response)
+    ) as mock_get:
+        response = await client.search_datasets(
+            terms=["example", "dataset"], keys=["description", None]
+        )
+
+    assert response == [{"name": "example_dataset_name"}]
+    mock_get.assert_awaited_once_with(
+        "https://api.example.com/search",
+        params={
+            "terms": ["example", "dataset"],
+            "server": "global",
+            "keys": ["description", "null"],
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_resource_by_id_not_found():
+    """Test that a missing resource maps to the 'Not found' error."""
+    client = AsyncAPIClient(base_url="https://api.example.com", token="t")
+
+    with patch.object(
+        httpx.AsyncClient,
+        "delete",
+        new=AsyncMock(
+            return_value=_http_error_response("Resource not found", 404)
+        ),
+    ):
+        with pytest.raises(ValueError) as exc_info:
+            await client.delete_resource_by_id("missing-id")
+
+    assert str(exc_info.value) == "Error deleting resource: Not found"
+
+
+URL = "https://api.example.com"
+
+# (method call, HTTP method, path, params)
+CALLS = {
+    "register_kafka_topic": (
+        lambda c: c.register_kafka_topic({"dataset_name": "d"}),
+        "POST", "/kafka", {"server": "local"},
+    ),
+    "register_s3_link": (
+        lambda c: c.register_s3_link({"resource_name": "r"}),
+        "POST", "/s3", {"server": "local"},
+    ),
+    "register_url": (
+        lambda c: c.register_url({"resource_name": "r"}),
+        "POST", "/url", {"server": "local"},
+    ),
+    "register_organization": (
+        lambda c: c.register_organization({"name": "org"}, server="pre_ckan"),
+        "POST", "/organization", {"server": "pre_ckan"},
+    ),
+    "update_kafka_topic": (
+        lambda c: c.update_kafka_topic("d-1", {"kafka_topic": "t"}),
+        "PUT", "/kafka/d-1", {"server": "local"},
+    ),
+    "update_s3_resource": (
+        lambda c: c.update_s3_resource("r-1", {"resource_s3": "s3://b"}),
+        "PUT", "/s3/r-1", {"server": "local"},
+    ),
+    "update_url_resource": (
+        lambda c: c.update_url_resource("r-1", {"resource_url": "u"}),
+        "PUT", "/url/r-1", {"server": "local"},
+    ),
+    "delete_organization": (
+        lambda c: c.delete_organization("org"),
+        "DELETE", "/organization/org", {"server": "local"},
+    ),
+    "delete_resource_by_id": (
+        lambda c: c.delete_resource_by_id("r-1"),
+        "DELETE", "/resource", {"resource_id": "r-1", "server": "local"},
+    ),
+    "delete_resource_by_name": (
+        lambda c: c.delete_resource_by_name("res"),
+        "DELETE", "/resource/res", {"server": "local"},
+    ),
+    "advanced_search": (
+        lambda c: c.advanced_search({"filter_list": ["a:b"]}),
+        "POST", "/search", {},
+    ),
+    "get_kafka_details": (
+        lambda c: c.get_kafka_details(),
+        "GET", "/status/kafka-details", {},
+    ),
+}
+
+
+def _mock_client(handler):
+    """Build a client whose requests are answered by ``handler``."""
+    # Build the session on the mock transport rather than replacing it
+    # afterwards, which would leave the original pool unclosed
+    mock_session = functools.partial(
+        httpx.AsyncClient, transport=httpx.MockTransport(handler)
+    )
+    with patch("pointofpresence.async_client.httpx.AsyncClient",
+               mock_session):
+        return AsyncAPIClient(base_url=URL, token="t")
+
+
+def _responding(status_code, body, sent=None):
+    """Handler returning ``body`` as JSON and recording the requests."""
+    def handler(request):
+        if sent is not None:
+            sent.append(request)
+        return httpx.Response(status_code, json=body)
+
+    return handler
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", sorted(CALLS))
+async def test_method_success(name):
+    """Test that each method sends the sync client's request."""
+    call, method, path, params = CALLS[name]
+    sent = []
+    async with _mock_client(_responding(200, {"id": "1"}, sent)) as client:
+        assert await call(client) == {"id": "1"}
+
+    request = sent[0]
+    assert request.method == method
+    assert request.url.path == path
+    assert dict(request.url.params) == params
+    assert request.headers["Authorization"] == "Bearer t"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, status_code, detail, message",
+    [
+        (
+            "register_kafka_topic", 400, "Organization does not exist",
+            "Error creating Kafka dataset: Organization (owner_org) "
+            "does not exist",
+        ),
+        (
+            "register_kafka_topic", 400, "Invalid payload",
+            "Error creating Kafka dataset: Invalid payload",
+        ),
+        (
+            "register_s3_link", 400, "Organization does not exist",
+            "Error creating S3 resource: Organization (owner_org) "
+            "does not exist",
+        ),
+        (
+            "register_s3_link", 400, "Reserved key error: name",
+            "Error creating S3 resource: Reserved key conflict.",
+        ),
+        (
+            "register_s3_link", 500, "Internal error",
+            "Error creating S3 resource: Internal error",
+        ),
+        (
+            "register_url", 400, "Organization does not exist",
+            "Error creating URL resource: Organization (owner_org) "
+            "does not exist.",
+        ),
+        (
+            "register_url", 409, "Group name already exists in database",
+            "Error creating URL resource: Name already exists.",
+        ),
+        (
+            "register_url", 400, "Invalid payload",
+            "Error creating URL resource: Invalid payload",
+        ),
+        (
+            "register_organization", 409,
+            "Group name already exists in database",
+            "Error creating organization: Organization name already exists",
+        ),
+        (
+            "register_organization", 400, "Invalid payload",
+            "Error creating organization: Invalid payload",
+        ),
+        (
+            "update_kafka_topic", 404, "Kafka dataset not found",
+            "Error updating Kafka dataset: Not found",
+        ),
+        (
+            "update_kafka_topic", 400, "Invalid payload",
+            "Error updating Kafka dataset: Invalid payload",
+        ),
+        (
+            "update_s3_resource", 404, "S3 resource not found",
+            "Error updating S3 resource: Not found",
+        ),
+        (
+            "update_s3_resource", 400, "Invalid payload",
+            "Error updating S3 resource: Invalid payload",
+        ),
+        (
+            "update_url_resource", 404, "Resource not found",
+            "Error updating URL resource: Not found",
+        ),
+        (
+            "update_url_resource", 400, "Invalid payload",
+            "Error updating URL resource: Invalid payload",
+        ),
+        (
+            "delete_organization", 404, "Organization not found",
+            "Error deleting organization: Not found",
+        ),
+        (
+            "delete_organization", 500, "Internal error",
+            "Error deleting organization: Internal error",
+        ),
+        (
+            "delete_resource_by_id", 404, "Resource not found",
+            "Error deleting resource: Not found",
+        ),
+        (
+            "delete_resource_by_id", 500, "Internal error",
+            "Error deleting resource: Internal error",
+        ),
+        (
+            "delete_resource_by_name", 404, "Resource not found",
+            "Error deleting resource: Not found",
+        ),
+        (
+            "delete_resource_by_name", 500, "Internal error",
+            "Error deleting resource: Internal error",
+        ),
+        (
+            "advanced_search", 400, "Invalid filter",
+            "Error in advanced search: Invalid filter",
+        ),
+    ],
+)
+async def test_method_error_mapping(name, status_code, detail, message):
+    """Test that API errors map to the sync client's ValueErrors."""
+    call = CALLS[name][0]
+    handler = _responding(status_code, {"detail": detail})
+    async with _mock_client(handler) as client:
+        with pytest.raises(ValueError) as exc_info:
+            await call(client)
+
+    assert str(exc_info.value) == message
+
+
+@pytest.mark.asyncio
+async def test_advanced_search_error_without_json():
+    """Test that a non-JSON error body falls back to the HTTP error."""
+    async with _mock_client(
+        lambda request: httpx.Response(502, text="Bad Gateway")
+    ) as client:
+        with pytest.raises(ValueError) as exc_info:
+            await client.advanced_search({"filter_list": []})
+
+    assert str(exc_info.value).startswith(
+        "Error in advanced search: Server error '502 Bad Gateway'"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_kafka_details_errors():
+    """Test the Kafka details HTTP, connection and parsing errors."""
+    async with _mock_client(_responding(404, {"detail": "x"})) as client:
+        with pytest.raises(ValueError) as exc_info:
+            await client.get_kafka_details()
+    assert str(exc_info.value).startswith(
+        "Failed to fetch Kafka details: Client error '404 Not Found'"
+    )
+
+    def refuse(request):
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    async with _mock_client(refuse) as client:
+        with pytest.raises(ValueError) as exc_info:
+            await client.get_kafka_details()
+    assert str(exc_info.value) == (
+        "An error occurred while fetching Kafka details: Connection refused"
+    )
+
+    async with _mock_client(
+        lambda request: httpx.Response(200, text="not json")
+    ) as client:
+        with pytest.raises(ValueError) as exc_info:
+            await client.get_kafka_details()
+    assert str(exc_info.value).startswith(
+        "An error occurred while parsing Kafka details:"
+    )
@@ -184,3 +184,122 @@ def test_init_token_conflict():
         str(exc_info.value)
         == "Provide either a token or username/password, not both."
     )
+
+
+def test_init_pool_configuration():
+    """
+    Test that pool options are applied to the adapters mounted on the
+    session for both protocols.
+    """
+    with patch.object(APIClientBase, "_check_api_availability"):
+        client = APIClientBase(
+            base_url="https://api.example.com",
+            pool_connections=4,
+            pool_maxsize=64,
+            pool_block=True,
+            pool_idle_timeout=30,
+        )
+
+    adapter = client.session.get_adapter("https://api.example.com")
+    assert adapter is client.session.get_adapter("http://api.example.com")
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 64
+    assert adapter._pool_block is True
+    assert adapter.pool_idle_timeout == 30
+
+
+@patch("pointofpresence.client_base.requests.Session.get")
+def test_warm_up(mock_get, client_no_auth):
+    """
+    Test that warm_up opens streamed connections, capped at the pool size.
+    """
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_get.return_value = mock_response
+
+    opened = client_no_auth.warm_up(20)
+
+    assert opened == 10
+    assert mock_get.call_count == 10
+    mock_get.assert_called_with("https://api.example.com", stream=True)
+
+
+@patch.object(APIClientBase, "_check_api_availability")
+def test_init_warmup_connections(mock_check_api):
+    """Test that warmup_connections triggers a warm-up after init."""
+    with patch.object(APIClientBase, "warm_up") as mock_warm_up:
+        APIClientBase(
+            base_url="https://api.example.com", warmup_connections=3
+        )
+
+    mock_warm_up.assert_called_once_with(3)
+
+
+@patch("pointofpresence.client_base.requests.Session.request")
+def test_lazy_init_defers_authentication(mock_request):
+    """
+    Test that lazy construction does no I/O and authenticates on the
+    first request.
+    """
+    token_response = MagicMock()
+    token_response.json.return_value = {"access_token": "lazy-token"}
+    mock_request.return_value = token_response
+
+    client = APIClientBase(
+        base_url="https://api.example.com",
+        username="user",
+        password="pass",
+        lazy=True,
+    )
+
+    mock_request.assert_not_called()
+    assert client.token is None
+
+    client.session.get("https://api.example.com/organization")
+
+    assert client.token == "lazy-token"
+    assert mock_request.call_count == 2
+    assert mock_request.call_args_list[0].args == (
+        "POST",
+        "https://api.example.com/token",
+    )
+    assert mock_request.call_args_list[1].args == (
+        "GET",
+        "https://api.example.com/organization",
+    )
+
+    client.session.get("https://api.example.com/organization")
+    assert mock_request.call_count == 3
+
+
+@patch("pointofpresence.client_base.requests.Session.request")
+def test_lazy_init_retries_failed_initialization(mock_request):
+    """Test that a failed deferred check is retried on the next request."""
+    mock_request.side_effect = [
+        requests.exceptions.ConnectionError("refused"),
+        MagicMock(),
+        MagicMock(),
+    ]
+    client = APIClientBase(
+        base_url="https://lazy-retry.example.com", lazy=True
+    )
+
+    with pytest.raises(ValueError):
+        client.session.get("https://lazy-retry.example.com/organization")
+
+    client.session.get("https://lazy-retry.example.com/organization")
+    assert mock_request.call_count == 3
+
+
+@patch("pointofpresence.client_base.requests.Session.get")
+def test_availability_check_cached_per_base_url(mock_get):
+    """Test that only the first client for a base URL probes the API."""
+    mock_get.return_value = MagicMock()
+
+    APIClientBase(base_url="https://cached.example.com")
+    APIClientBase(base_url="https://cached.example.com/")
+    APIClientBase(base_url="https://other.example.com")
+
+    assert mock_get.call_count == 2
+    mock_get.assert_any_call("https://cached.example.com")
+    mock_get.assert_any_call("https://other.example.com")
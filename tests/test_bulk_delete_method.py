@@ -0,0 +1,145 @@
+# tests/test_bulk_delete_method.py
+
+import time
+import uuid
+import pytest
+from unittest.mock import patch, MagicMock
+from pointofpresence.bulk_delete_method import APIClientBulkDelete
+from requests.exceptions import HTTPError
+
+KNOWN_ID = str(uuid.UUID(int=1))
+MISSING_ID = str(uuid.UUID(int=2))
+
+
+@pytest.fixture
+def client():
+    """Fixture for APIClientBulkDelete without triggering network calls."""
+    with patch.object(APIClientBulkDelete, "_check_api_availability"):
+        return APIClientBulkDelete(base_url="https://api.example.com")
+
+
+def _response_for(url, params=None):
+    """Succeed for known resources, 404 or 500 for the others."""
+    mock_response = MagicMock()
+    target = params.get("resource_id") or url.rsplit("/", 1)[-1]
+    if target in (KNOWN_ID, "known_name", "org"):
+        mock_response.json.return_value = {"message": "deleted"}
+    elif target == "broken":
+        mock_response.raise_for_status.side_effect = HTTPError("500")
+        mock_response.json.return_value = {"detail": "Internal error"}
+    else:
+        mock_response.raise_for_status.side_effect = HTTPError("404")
+        mock_response.json.return_value = {"detail": "Resource not found"}
+    return mock_response
+
+
+@patch("pointofpresence.client_base.requests.Session.delete")
+def test_delete_resources_many_report(mock_delete, client):
+    """Test the deleted / not found / error report and ID detection."""
+    mock_delete.side_effect = _response_for
+    items = [KNOWN_ID, MISSING_ID, "known_name", "broken"]
+
+    results = sorted(client.delete_resources_many(items, max_workers=2))
+
+    assert [r.result for r in results] == [
+        "deleted",
+        "not found",
+        "deleted",
+        None,
+    ]
+    assert str(results[3].error) == "Error deleting resource: Internal error"
+    urls = {call.args[0] for call in mock_delete.call_args_list}
+    assert "https://api.example.com/resource" in urls
+    assert "https://api.example.com/resource/known_name" in urls
+
+
+@patch("pointofpresence.client_base.requests.Session.delete")
+def test_delete_resources_many_by_name(mock_delete, client):
+    """Test that by='name' never uses the ID endpoint."""
+    mock_delete.side_effect = _response_for
+    results = list(
+        client.delete_resources_many([KNOWN_ID], server="pre_ckan", by="name")
+    )
+    assert results[0].result == "deleted"
+    mock_delete.assert_called_once_with(
+        f"https://api.example.com/resource/{KNOWN_ID}",
+        params={"server": "pre_ckan"},
+    )
+
+
+def test_delete_resources_many_invalid_by(client):
+    """Test the validation of the by parameter."""
+    with pytest.raises(ValueError, match="by must be one of"):
+        client.delete_resources_many(["a"], by="title")
+
+
+@patch("pointofpresence.client_base.requests.Session.delete")
+def test_delete_resources_many_rate(mock_delete, client):
+    """Test that the requests-per-second limit is applied."""
+    mock_delete.side_effect = _response_for
+    start = time.monotonic()
+    list(
+        client.delete_resources_many(
+            ["known_name"] * 6, max_workers=6, rate=50
+        )
+    )
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.fixture
+def fake_client():
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    with FakePOPServer() as server:
+        client = APIClient(server.url)
+        for org in ("org", "org_other"):
+            client.register_organization({"name": org})
+            for i in range(3):
+                client.register_url(
+                    {
+                        "resource_name": f"{org}_{i}",
+                        "resource_url": f"https://example.com/{i}",
+                        "owner_org": org,
+                    }
+                )
+        yield client
+        client.close()
+
+
+def test_delete_organization_cascade(fake_client):
+    """Test that only the organization's own datasets are deleted."""
+    response = fake_client.delete_organization(
+        "org", cascade=True, max_workers=2
+    )
+    assert list(response["resources"].values()) == ["deleted"] * 3
+    assert fake_client.list_organizations(server="local") == ["org_other"]
+    remaining = fake_client.search_datasets(["org"], ["owner_org"], "local")
+    assert sorted(d["name"] for d in remaining) == [
+        "org_other_0",
+        "org_other_1",
+        "org_other_2",
+    ]
+
+
+@patch.object(APIClientBulkDelete, "iter_search")
+@patch("pointofpresence.client_base.requests.Session.delete")
+def test_delete_organization_cascade_keeps_org_on_error(
+    mock_delete, mock_search, client
+):
+    """Test that the organization survives failed resource deletions."""
+    mock_search.return_value = iter(
+        [{"id": "broken", "owner_org": "org"}]
+    )
+    mock_delete.side_effect = _response_for
+    with pytest.raises(ValueError, match="1 resources could not be deleted"):
+        client.delete_organization("org", cascade=True)
+    mock_delete.assert_called_once()
+
+
+@patch("pointofpresence.client_base.requests.Session.delete")
+def test_delete_organization_without_cascade(mock_delete, client):
+    """Test that the default keeps the single-request behaviour."""
+    mock_delete.side_effect = _response_for
+    assert client.delete_organization("org") == {"message": "deleted"}
+    mock_delete.assert_called_once()
@@ -0,0 +1,107 @@
+# tests/test_bulk_register_method.py
+
+import pytest
+from unittest.mock import patch, MagicMock
+from pointofpresence.bulk_register_method import APIClientBulkRegister
+from requests.exceptions import HTTPError
+
+
+@pytest.fixture
+def client():
+    """Fixture for APIClientBulkRegister without triggering network calls."""
+    with patch.object(APIClientBulkRegister, "_check_api_availability"):
+        return APIClientBulkRegister(base_url="https://api.example.com")
+
+
+def _response_for(url, json=None, params=None):
+    """Return a success response, or an HTTP error for 'bad' payloads."""
+    mock_response = MagicMock()
+    if json["name"] == "bad":
+        mock_response.raise_for_status.side_effect = HTTPError("HTTP Error")
+        mock_response.json.return_value = {
+            "detail": "Organization does not exist"
+        }
+    else:
+        mock_response.json.return_value = {"id": f"id-{json['name']}"}
+    return mock_response
+
+
+@patch("pointofpresence.client_base.requests.Session.post")
+def test_register_url_many(mock_post, client):
+    """Test bulk URL registration with one failing item."""
+    mock_post.side_effect = _response_for
+    items = [{"name": "a"}, {"name": "bad"}, {"name": "c"}]
+
+    results = sorted(client.register_url_many(items, max_workers=2))
+
+    assert [r.result for r in results] == [
+        {"id": "id-a"},
+        None,
+        {"id": "id-c"},
+    ]
+    assert isinstance(results[1].error, ValueError)
+    assert str(results[1].error) == (
+        "Error creating URL resource: Organization "
+        "(owner_org) does not exist."
+    )
+    assert mock_post.call_count == 3
+
+
+@patch("pointofpresence.client_base.requests.Session.post")
+def test_register_kafka_topics_many_server(mock_post, client):
+    """Test that the server parameter is forwarded to every request."""
+    mock_post.side_effect = _response_for
+    items = ({"name": str(i)} for i in range(5))
+
+    results = list(
+        client.register_kafka_topics_many(items, server="pre_ckan")
+    )
+
+    assert all(r.ok for r in results)
+    for call in mock_post.call_args_list:
+        assert call.args[0] == "https://api.example.com/kafka"
+        assert call.kwargs["params"] == {"server": "pre_ckan"}
+
+
+@patch("pointofpresence.client_base.requests.Session.post")
+def test_register_s3_links_many(mock_post, client):
+    """Test bulk S3 registration endpoint."""
+    mock_post.side_effect = _response_for
+
+    results = list(client.register_s3_links_many([{"name": "s3"}]))
+
+    assert results[0].result == {"id": "id-s3"}
+    mock_post.assert_called_once_with(
+        "https://api.example.com/s3",
+        json={"name": "s3"},
+        params={"server": "local"},
+    )
+
+
+@patch("pointofpresence.client_base.requests.Session.post")
+def test_register_url_many_validate(mock_post, client):
+    """Test that invalid items fail without a request, one at a time."""
+    from pointofpresence.validation import PayloadValidationError
+
+    mock_post.return_value.json.return_value = {"id": "id"}
+    taken = []
+
+    def items():
+        for name in ("good", "Bad Name", "also_good", "x", "last"):
+            taken.append(name)
+            yield {
+                "resource_name": name,
+                "owner_org": "org",
+                "resource_url": "https://example.com/data.csv",
+            }
+
+    results = client.register_url_many(items(), validate=True, max_workers=1)
+    first = next(results)
+    # Items are validated as they are taken, not buffered upfront
+    assert len(taken) < 5
+
+    results = sorted([first, *results], key=lambda r: r.index)
+    assert [r.ok for r in results] == [True, False, True, False, True]
+    assert isinstance(results[1].error, PayloadValidationError)
+    assert "resource_name" in str(results[3].error)
+    assert mock_post.call_count == 3
@@ -0,0 +1,62 @@
+# tests/test_cache.py
+
+import pytest
+from unittest.mock import patch
+from pointofpresence.cache import TTLCache
+
+
+def test_cache_hit_and_miss_counters():
+    """Test that lookups are counted."""
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("a", [1])
+
+    assert cache.get("a") == (True, [1])
+    assert cache.get("b") == (False, None)
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "size": 1,
+    }
+
+
+def test_cache_lru_eviction():
+    """Test that the least recently used entry is evicted."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.evictions == 1
+
+
+@patch("pointofpresence.cache.time.monotonic")
+def test_cache_entries_expire(mock_monotonic):
+    """Test that entries are dropped after their TTL."""
+    mock_monotonic.return_value = 100.0
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+
+    mock_monotonic.return_value = 111.0
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_cache_invalidate_by_tag():
+    """Test that only entries with the given tag are dropped."""
+    cache = TTLCache()
+    cache.set("a", 1, tag="local")
+    cache.set("b", 2, tag="global")
+
+    assert cache.invalidate("local") == 1
+    assert cache.get("a") == (False, None)
+    assert cache.get("b") == (True, 2)
+
+
+def test_cache_rejects_invalid_size():
+    """Test that the cache needs room for at least one entry."""
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0)
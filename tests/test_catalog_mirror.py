@@ -0,0 +1,250 @@
+# tests/test_catalog_mirror.py
+
+import pytest
+from unittest.mock import MagicMock
+from pointofpresence.catalog_mirror import CatalogMirror, flatten
+
+
+@pytest.fixture
+def populated():
+    """Fake server with two organizations and three datasets."""
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    with FakePOPServer() as server:
+        client = APIClient(server.url)
+        for name in ("utah", "ndp"):
+            client.register_organization({"name": name})
+        client.register_url(
+            {
+                "resource_name": "rainfall",
+                "resource_url": "https://example.com/rain.csv",
+                "owner_org": "utah",
+                "notes": "Daily rainfall in Salt Lake",
+                "extras": {"key1": "weather", "station": "SLC"},
+            }
+        )
+        client.register_s3_link(
+            {
+                "resource_name": "snowpack",
+                "resource_s3": "s3://bucket/snow.parquet",
+                "owner_org": "utah",
+                "notes": "Snow water equivalent",
+            }
+        )
+        client.register_kafka_topic(
+            {
+                "dataset_name": "seismic_stream",
+                "owner_org": "ndp",
+                "kafka_topic": "seismic",
+                "kafka_host": "localhost",
+                "kafka_port": "9092",
+                "extras": {"key1": "sensors"},
+            }
+        )
+        yield client
+        client.close()
+
+
+@pytest.fixture
+def mirror(populated, tmp_path):
+    with CatalogMirror(
+        populated, str(tmp_path / "catalog.db"), server="local"
+    ) as mirror:
+        assert mirror.sync(max_workers=2) == {
+            "organizations": 2,
+            "datasets": 3,
+        }
+        yield mirror
+
+
+def test_flatten_joins_nested_keys():
+    """Test the flattened keys used for key-specific terms."""
+    dataset = {
+        "name": "a",
+        "extras": {"key1": "v"},
+        "resources": [{"url": "u1"}, {"url": "u2"}],
+        "private": False,
+        "notes": None,
+    }
+    assert list(flatten(dataset)) == [
+        ("name", "a"),
+        ("extras.key1", "v"),
+        ("resources.url", "u1"),
+        ("resources.url", "u2"),
+        ("private", "false"),
+    ]
+
+
+def test_sync_mirrors_catalog(mirror):
+    """Test that organizations and datasets are stored."""
+    assert len(mirror) == 3
+    assert mirror.organizations() == ["ndp", "utah"]
+    assert mirror.sync_state()["synced_at"] is not None
+    (dataset,) = mirror.search_datasets(["rainfall"], ["name"])
+    assert mirror.get(dataset["id"]) == dataset
+
+
+def test_search_matches_remote_shape(mirror, populated):
+    """Test that local results equal the remote API results."""
+    remote = populated.search_datasets(["rain"], server="local")
+    assert mirror.search_datasets(["rain"]) == remote
+
+
+@pytest.mark.parametrize(
+    "terms, keys, expected",
+    [
+        (["salt lake"], None, ["rainfall"]),
+        (["SNOW"], None, ["snowpack"]),
+        (["weather"], ["extras.key1"], ["rainfall"]),
+        (["e"], ["extras.key1"], ["rainfall", "seismic_stream"]),
+        (["utah", "snow"], ["owner_org", None], ["snowpack"]),
+        (["kafka://"], ["resources.url"], ["seismic_stream"]),
+        (["100%"], None, []),
+        ([], None, ["rainfall", "seismic_stream", "snowpack"]),
+    ],
+)
+def test_search_terms_and_keys(mirror, terms, keys, expected):
+    """Test global, short and key-specific terms."""
+    results = mirror.search_datasets(terms, keys)
+    assert [d["name"] for d in results] == expected
+
+
+def test_search_validates_keys(mirror):
+    """Test the terms/keys length check."""
+    with pytest.raises(ValueError, match="number of terms"):
+        mirror.search_datasets(["a", "b"], ["name"])
+
+
+def test_failed_sync_keeps_previous_copy(mirror):
+    """Test that a failing organization aborts the sync untouched."""
+    mirror.client = MagicMock()
+    mirror.client.list_organizations.return_value = ["utah"]
+    mirror.client.iter_search.side_effect = ValueError("boom")
+    with pytest.raises(ValueError, match="Error syncing organization utah"):
+        mirror.sync()
+    assert len(mirror) == 3
+
+
+def test_like_fallback(populated, monkeypatch):
+    """Test searching without the FTS5 trigram index."""
+    monkeypatch.setattr(
+        CatalogMirror, "_create_full_text_index", lambda self: False
+    )
+    with CatalogMirror(populated, server="local") as mirror:
+        mirror._db.execute(
+            "CREATE TABLE datasets_fts (server TEXT, id TEXT, text TEXT)"
+        )
+        mirror.sync()
+        results = mirror.search_datasets(["water equivalent"])
+        assert [d["name"] for d in results] == ["snowpack"]
+
+
+def test_sync_delta_without_state_runs_full_sync(populated):
+    """Test that the first delta sync falls back to a full sync."""
+    with CatalogMirror(populated, server="local") as mirror:
+        stats = mirror.sync_delta()
+        assert stats == {
+            "organizations": 2,
+            "upserted": 3,
+            "deleted": 0,
+            "full": True,
+        }
+        assert mirror.sync_state()["high_water_mark"] is not None
+
+
+def test_sync_delta_fetches_only_changes(mirror, populated):
+    """Test created, updated and deleted datasets and organizations."""
+    rainfall = mirror.search_datasets(["rainfall"], ["name"])[0]
+    snowpack = mirror.search_datasets(["snowpack"], ["name"])[0]
+    populated.update_url_resource(rainfall["id"], {"notes": "Hourly rain"})
+    populated.delete_resource_by_id(snowpack["id"])
+    populated.register_organization({"name": "sci"})
+    populated.register_url(
+        {
+            "resource_name": "lidar",
+            "resource_url": "https://example.com/lidar.las",
+            "owner_org": "sci",
+        }
+    )
+    populated.delete_organization("ndp")
+
+    stats = mirror.sync_delta(max_workers=2)
+    assert stats["full"] is False
+    assert stats["organizations"] == 2
+    # rainfall updated and lidar created
+    assert stats["upserted"] == 2
+    # snowpack deleted and seismic_stream dropped with its organization
+    assert stats["deleted"] == 2
+    assert mirror.organizations() == ["sci", "utah"]
+    assert [d["name"] for d in mirror.search_datasets([])] == [
+        "lidar",
+        "rainfall",
+    ]
+    assert mirror.search_datasets(["hourly"])[0]["id"] == rainfall["id"]
+    assert mirror.search_datasets(["snow"]) == []
+
+    # Nothing changed since: the mark only re-reports the newest dataset
+    stats = mirror.sync_delta()
+    assert stats["deleted"] == 0
+    assert stats["upserted"] <= 1
+    assert len(mirror) == 2
+
+
+def test_sync_delta_failure_keeps_state(mirror):
+    """Test that a failed delta leaves the mirror untouched."""
+    state = mirror.sync_state()
+    mirror.client = MagicMock()
+    mirror.client.list_organizations.return_value = ["utah", "ndp"]
+    mirror.client.iter_advanced_search.side_effect = ValueError("boom")
+    with pytest.raises(ValueError, match="Error syncing organization"):
+        mirror.sync_delta()
+    assert mirror.sync_state() == state
+    assert len(mirror) == 3
+
+
+def test_search_survives_vacuum(populated, tmp_path):
+    """Test that VACUUM does not unlink the text index from datasets."""
+    with CatalogMirror(
+        populated, str(tmp_path / "catalog.db"), server="local"
+    ) as mirror:
+        mirror.sync()
+        # Leave a hole before the other rows, which VACUUM may close
+        rainfall = mirror.search_datasets(["rainfall"], ["name"])[0]
+        with mirror._db:
+            mirror._delete(rainfall["id"])
+        mirror._db.execute("VACUUM")
+        assert [d["name"] for d in mirror.search_datasets(["snow"])] == [
+            "snowpack"
+        ]
+        assert mirror.search_datasets(["sensors"])[0]["name"] == (
+            "seismic_stream"
+        )
+
+
+def test_old_database_is_rebuilt(populated, tmp_path):
+    """Test that a catalog without the row_id key is synced again."""
+    import sqlite3
+
+    path = str(tmp_path / "catalog.db")
+    db = sqlite3.connect(path)
+    db.executescript(
+        "CREATE TABLE datasets (server TEXT NOT NULL, id TEXT NOT NULL, "
+        "name TEXT, owner_org TEXT, metadata_modified TEXT, "
+        "data TEXT NOT NULL, PRIMARY KEY (server, id));"
+        "CREATE TABLE sync_state (server TEXT PRIMARY KEY, "
+        "synced_at REAL, high_water_mark TEXT);"
+        "INSERT INTO sync_state VALUES ('local', 1.0, '2020-01-01');"
+    )
+    db.close()
+
+    with CatalogMirror(populated, path, server="local") as mirror:
+        keys = [
+            row[1]
+            for row in mirror._db.execute("PRAGMA table_info(datasets)")
+            if row[5]
+        ]
+        assert keys == ["row_id"]
+        assert mirror.sync_state()["synced_at"] is None
+        mirror.sync()
+        assert len(mirror) == 3
@@ -0,0 +1,144 @@
+# tests/test_circuit_breaker.py
+
+import json
+import time
+import pytest
+from unittest.mock import patch
+from pointofpresence.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+URL = "http://pop.example.com"
+
+
+@pytest.fixture
+def clock():
+    now = [100.0]
+    with patch(
+        "pointofpresence.circuit_breaker.time.monotonic", lambda: now[0]
+    ):
+        yield now
+
+
+def fail(breaker, server, times=1):
+    for _ in range(times):
+        breaker.before_request(URL, server)
+        breaker.record(URL, server, False, 0.01)
+
+
+def test_opens_after_consecutive_failures(clock):
+    """Test that the circuit opens after the threshold and fails fast."""
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    fail(breaker, "global", 2)
+    breaker.record(URL, "global", True, 0.01)
+    fail(breaker, "global", 2)
+    assert breaker.state(URL, "global") == "closed"
+    fail(breaker, "global")
+    assert breaker.state(URL, "global") == "open"
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_request(URL, "global")
+    assert excinfo.value.server == "global"
+    assert excinfo.value.retry_after == pytest.approx(10)
+    # Other servers of the same API are unaffected
+    breaker.before_request(URL, "local")
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_probe(clock):
+    """Test that a single probe is let through after the reset timeout."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    fail(breaker, "global")
+    clock[0] += 10
+    assert breaker.state(URL, "global") == "half_open"
+    breaker.before_request(URL, "global")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(URL, "global")
+
+    # A failed probe reopens the circuit
+    breaker.record(URL, "global", False, 0.01)
+    assert breaker.state(URL, "global") == "open"
+
+    # A successful probe closes it
+    clock[0] += 10
+    breaker.before_request(URL, "global")
+    breaker.record(URL, "global", True, 0.01)
+    assert breaker.state(URL, "global") == "closed"
+    assert breaker.stats()["circuits"][0]["trips"] == 2
+
+
+def test_latency_slo_counts_as_failure(clock):
+    """Test that slow responses trip the circuit."""
+    breaker = CircuitBreaker(failure_threshold=2, latency_slo=0.5)
+    breaker.record(URL, "global", True, 0.6)
+    breaker.record(URL, "global", True, 0.7)
+    assert breaker.state(URL, "global") == "open"
+
+
+def test_reset(clock):
+    """Test that reset closes the selected circuits."""
+    breaker = CircuitBreaker(failure_threshold=1)
+    fail(breaker, "global")
+    fail(breaker, "local")
+    breaker.reset(server="global")
+    assert breaker.state(URL, "global") == "closed"
+    assert breaker.state(URL, "local") == "open"
+
+
+def test_invalid_parameters():
+    """Test the parameter validation."""
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0)
+
+
+def test_client_fails_fast_on_open_circuit():
+    """Test the client integration against the fake server."""
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    with FakePOPServer() as server:
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        client = APIClient(server.url, circuit_breaker=breaker)
+        server.error_rate = 1.0
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                client.list_organizations(server="global")
+        sent = server.request_count
+
+        with pytest.raises(CircuitOpenError):
+            client.list_organizations(server="global")
+        assert server.request_count == sent
+
+        server.error_rate = 0.0
+        assert client.list_organizations(server="local") == []
+        client.close()
+
+
+def test_probe_slot_released_when_request_fails_before_send():
+    """Test that an encoding error while half-open does not wedge it."""
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    class FailingCodec:
+        def dumps(self, obj):
+            raise TypeError("not serializable")
+
+        def loads(self, data):
+            return json.loads(data)
+
+    with FakePOPServer() as server:
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        client = APIClient(
+            server.url, circuit_breaker=breaker, codec=FailingCodec()
+        )
+        server.error_rate = 1.0
+        with pytest.raises(ValueError):
+            client.list_organizations(server="local")
+        assert breaker.state(client.base_url, "local") == "open"
+        server.error_rate = 0.0
+
+        time.sleep(0.06)
+        with pytest.raises(TypeError):
+            client.register_url({"resource_name": "x"}, server="local")
+        # The failed encoding did not take the probe slot
+        assert client.list_organizations(server="local") == []
+        assert breaker.state(client.base_url, "local") == "closed"
+        client.close()
@@ -0,0 +1,88 @@
+# tests/test_codec.py
+
+import pytest
+from unittest.mock import patch, MagicMock
+from pointofpresence.client_base import APIClientBase
+from pointofpresence.codec import JSONCodec, get_codec
+
+
+def test_get_codec_defaults_to_stdlib():
+    """Test that no codec setting means the standard library codec."""
+    codec = get_codec()
+
+    assert type(codec) is JSONCodec
+    assert codec.loads(codec.dumps({"a": [1, None]})) == {"a": [1, None]}
+
+
+def test_get_codec_orjson_roundtrip():
+    """Test the orjson codec when the package is installed."""
+    pytest.importorskip("orjson")
+    codec = get_codec("orjson")
+
+    assert codec.name == "orjson"
+    assert codec.loads(codec.dumps({"extras": {"k": "é"}})) == {
+        "extras": {"k": "é"}
+    }
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+def test_get_codec_custom_object():
+    """Test that codec objects are used as they are."""
+    custom = MagicMock()
+
+    assert get_codec(custom) is custom
+
+
+def test_get_codec_unknown():
+    """Test that unknown codec names are rejected."""
+    with pytest.raises(ValueError) as exc_info:
+        get_codec("yaml")
+
+    assert "Unknown codec 'yaml'" in str(exc_info.value)
+
+
+@patch("pointofpresence.client_base.requests.Session.request")
+def test_client_uses_codec_for_bodies_and_responses(mock_request):
+    """
+    Test that json bodies are encoded, and responses decoded, with the
+    configured codec.
+    """
+    codec = MagicMock()
+    codec.dumps.return_value = b'{"encoded":true}'
+    codec.loads.return_value = {"id": "decoded"}
+    mock_response = MagicMock()
+    mock_response.content = b'{"id":"raw"}'
+    mock_request.return_value = mock_response
+
+    client = APIClientBase(
+        base_url="https://api.example.com", token="t", codec=codec
+    )
+    response = client.session.post(
+        "https://api.example.com/url",
+        json={"resource_name": "r"},
+        params={"server": "local"},
+    )
+
+    codec.dumps.assert_called_once_with({"resource_name": "r"})
+    mock_request.assert_called_once_with(
+        "POST",
+        "https://api.example.com/url",
+        data=b'{"encoded":true}',
+        params={"server": "local"},
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.json() == {"id": "decoded"}
+    codec.loads.assert_called_once_with(b'{"id":"raw"}')
+
+
+@patch("pointofpresence.client_base.requests.Session.request")
+def test_client_default_codec_leaves_requests_untouched(mock_request):
+    """Test that the default codec keeps requests' own JSON handling."""
+    client = APIClientBase(base_url="https://api.example.com", token="t")
+    client.session.post("https://api.example.com/url", json={"a": 1})
+
+    assert client.session.codec is None
+    mock_request.assert_called_once_with(
+        "POST", "https://api.example.com/url", data=None, json={"a": 1}
+    )
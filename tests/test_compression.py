@@ -0,0 +1,71 @@
+# tests/test_compression.py
+
+import gzip
+import os
+import zlib
+import pytest
+from pointofpresence import compression
+from pointofpresence.compression import BodyCompressor, compress
+
+
+def test_compress_roundtrip():
+    """Test the gzip and deflate encodings."""
+    data = b'{"extras": "' + b"x" * 4000 + b'"}'
+    assert gzip.decompress(compress(data, "gzip")) == data
+    assert zlib.decompress(compress(data, "deflate")) == data
+    with pytest.raises(ValueError):
+        compress(data, "br")
+
+
+def test_zstd_requires_package(monkeypatch):
+    """Test that zstd is rejected without the zstandard package."""
+    monkeypatch.setattr(compression, "zstandard", None)
+    with pytest.raises(ValueError):
+        BodyCompressor("zstd")
+    assert BodyCompressor("auto").encoding == "gzip"
+
+
+def test_threshold_and_incompressible_bodies():
+    """Test that small and incompressible bodies are sent as they are."""
+    compressor = BodyCompressor("gzip", threshold=100)
+    assert compressor.compress_body(b"x" * 99) == (b"x" * 99, None)
+    noise = os.urandom(2000)
+    assert compressor.compress_body(noise) == (noise, None)
+
+    body, encoding = compressor.compress_body(b"x" * 2000)
+    assert encoding == "gzip" and len(body) < 2000
+    stats = compressor.stats()
+    assert stats["requests_compressed"] == 1
+    assert stats["bytes_saved"] == 2000 - len(body)
+
+
+def test_client_compresses_requests_and_responses():
+    """Test the client integration against the fake server."""
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    with FakePOPServer(compress_responses=True) as server:
+        client = APIClient(server.url, compression="gzip")
+        assert "gzip" in client.session.headers["Accept-Encoding"]
+        client.register_organization({"name": "org"})
+        for i in range(20):
+            client.register_url(
+                {
+                    "resource_name": f"resource_{i}",
+                    "resource_url": f"https://example.com/{i}",
+                    "owner_org": "org",
+                    "notes": "Large description " * 100,
+                }
+            )
+        stats = client.compressor.stats()
+        assert stats["requests_compressed"] == 20
+        assert stats["request_bytes_sent"] < stats["request_bytes"] / 5
+
+        results = client.search_datasets(["resource"], server="local")
+        assert len(results) == 20
+        streamed = list(client.iter_search(["resource"], server="local"))
+        assert len(streamed) == 20
+        stats = client.compressor.stats()
+        assert stats["responses_compressed"] == 2
+        assert stats["response_bytes_received"] < stats["response_bytes"]
+        client.close()
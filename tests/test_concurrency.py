@@ -0,0 +1,51 @@
+# tests/test_concurrency.py
+
+import threading
+import pytest
+from pointofpresence.concurrency import bounded_map
+
+
+def test_bounded_map_collects_results_and_errors():
+    """Test that failures are reported per item without aborting."""
+
+    def work(value):
+        if value == 3:
+            raise ValueError("bad item")
+        return value * 10
+
+    results = sorted(bounded_map(work, range(6), max_workers=3))
+
+    assert [r.index for r in results] == list(range(6))
+    assert [r.result for r in results if r.ok] == [0, 10, 20, 40, 50]
+    failed = [r for r in results if not r.ok]
+    assert len(failed) == 1
+    assert failed[0].item == 3
+    assert str(failed[0].error) == "bad item"
+
+
+def test_bounded_map_limits_pending_items():
+    """Test that items are pulled lazily from the input iterable."""
+    pulled = []
+    release = threading.Event()
+
+    def items():
+        for value in range(100):
+            pulled.append(value)
+            yield value
+
+    def work(value):
+        release.wait(timeout=5)
+        return value
+
+    results = bounded_map(work, items(), max_workers=2, max_pending=4)
+    release.set()
+    first = next(results)
+    assert first.ok
+    assert len(pulled) <= 6
+    results.close()
+
+
+def test_bounded_map_rejects_invalid_workers():
+    """Test that max_workers must be positive."""
+    with pytest.raises(ValueError):
+        list(bounded_map(lambda value: value, [1], max_workers=0))
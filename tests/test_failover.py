@@ -0,0 +1,157 @@
+# tests/test_failover.py
+
+import socket
+import time
+import pytest
+from unittest.mock import patch
+from pointofpresence.failover import EndpointPool
+from pointofpresence.fake_server import FakePOPServer
+
+PRIMARY = "http://pop-a.example.com"
+REPLICA = "http://pop-b.example.com"
+
+
+def test_reads_prefer_fastest_writes_stay_on_primary():
+    """Test the endpoint order for reads and writes."""
+    pool = EndpointPool([PRIMARY, REPLICA], alpha=0.5)
+    pool.observe(PRIMARY, 0.2)
+    pool.observe(REPLICA, 0.05)
+    assert pool.candidates("read") == [REPLICA, PRIMARY]
+    assert pool.candidates("write") == [PRIMARY, REPLICA]
+
+    # The moving average follows the latest samples
+    pool.observe(REPLICA, 0.45)
+    assert pool.stats()[1]["rtt"] == pytest.approx(0.25)
+    assert pool.candidates("read") == [PRIMARY, REPLICA]
+
+
+def test_down_endpoint_is_last_resort_until_recheck():
+    """Test that failed endpoints are skipped until rechecked."""
+    clock = [100.0]
+    with patch("pointofpresence.failover.time.monotonic", lambda: clock[0]):
+        pool = EndpointPool([PRIMARY, REPLICA], recheck_after=10)
+        pool.mark_down(PRIMARY)
+        assert pool.candidates("write") == [REPLICA, PRIMARY]
+        pool.observe(REPLICA, 0.1, status_code=503)
+        assert not pool.stats()[1]["healthy"]
+        clock[0] += 10
+        assert pool.candidates("write") == [PRIMARY, REPLICA]
+
+
+def test_invalid_parameters():
+    """Test the parameter validation."""
+    with pytest.raises(ValueError):
+        EndpointPool([])
+    with pytest.raises(ValueError):
+        EndpointPool([PRIMARY], alpha=0)
+
+
+def _unused_url():
+    """URL of a local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_client_routes_and_fails_over():
+    """Test the client against a fast and a slow fake replica."""
+    from pointofpresence import APIClient
+
+    with FakePOPServer() as fast, FakePOPServer(latency=0.05) as slow:
+        client = APIClient(
+            [slow.url, fast.url, _unused_url()],
+            username="admin",
+            password="admin",
+            probe_interval=None,
+        )
+        client.register_organization({"name": "org"})
+        assert slow.store.orgs("local") and not fast.store.orgs("local")
+
+        # Sample every replica, then reads settle on the fastest one
+        client.endpoints.probe(client.session)
+        before = fast.request_count
+        for _ in range(3):
+            client.list_organizations(server="local")
+        assert fast.request_count == before + 3
+        assert [e["healthy"] for e in client.endpoints.stats()] == [
+            True, True, False
+        ]
+        client.close()
+
+
+def test_client_write_fails_over_when_primary_is_down():
+    """Test that writes move on when the primary refuses connections."""
+    from pointofpresence import APIClient
+
+    with FakePOPServer() as replica:
+        client = APIClient(
+            [_unused_url(), replica.url], token="token", probe_interval=None
+        )
+        client.register_organization({"name": "org"})
+        assert replica.store.orgs("local")
+        assert not client.endpoints.stats()[0]["healthy"]
+        client.close()
+
+
+def test_client_does_not_retry_connects_with_replicas():
+    """Test that a dead replica fails over without connect retries."""
+    from pointofpresence import APIClient
+    from pointofpresence.retry import RetryPolicy
+
+    with FakePOPServer() as replica:
+        with APIClient(
+            [_unused_url(), replica.url],
+            token="token",
+            retry=RetryPolicy(max_attempts=4, backoff_base=1.0),
+            probe_interval=None,
+        ) as client:
+            adapter = client.session.get_adapter(replica.url)
+            assert adapter.max_retries.connect == 0
+            assert adapter.max_retries.total == 3
+            with patch("time.sleep") as sleep:
+                client.register_organization({"name": "org"})
+            sleep.assert_not_called()
+            assert replica.store.orgs("local")
+
+
+def test_probe_thread_stops_with_the_client():
+    """Test that leaving the context stops the probes."""
+    from pointofpresence import APIClient
+
+    with FakePOPServer() as a, FakePOPServer() as b:
+        with APIClient([a.url, b.url], probe_interval=60) as client:
+            pool = client.endpoints
+            assert not pool._stop.is_set()
+        assert pool._stop.is_set()
+
+
+@pytest.mark.parametrize(
+    "options, setup",
+    [
+        ({}, None),
+        ({"username": "admin", "password": "admin"}, None),
+        ({"lazy": True}, None),
+        ({}, lambda client: client.enable_search_cache()),
+        ({}, lambda client: client.organization_index("local")),
+    ],
+    ids=["plain", "auth", "lazy", "search_cache", "organization_index"],
+)
+def test_probe_thread_stops_when_client_is_collected(options, setup):
+    """Test that an unclosed client does not keep probing forever."""
+    import gc
+    from pointofpresence import APIClient
+
+    with FakePOPServer() as a, FakePOPServer() as b:
+        client = APIClient([a.url, b.url], probe_interval=0.01, **options)
+        if setup is not None:
+            setup(client)
+        pool = client.endpoints
+        thread = pool._probe_thread
+        del client, setup
+        deadline = time.monotonic() + 5
+        while thread.is_alive():
+            # A probe in flight keeps the session alive until it ends
+            assert time.monotonic() < deadline
+            gc.collect()
+            thread.join(timeout=0.05)
+        assert pool._stop.is_set()
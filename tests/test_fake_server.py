@@ -0,0 +1,128 @@
+# tests/test_fake_server.py
+
+import pytest
+import requests
+from pointofpresence import APIClient
+from pointofpresence.fake_server import FakePOPServer
+
+
+@pytest.fixture
+def server():
+    with FakePOPServer() as fake:
+        yield fake
+
+
+@pytest.fixture
+def client(server):
+    client = APIClient(
+        server.url, username=server.username, password=server.password
+    )
+    client.register_organization({"name": "org"})
+    yield client
+    client.close()
+
+
+def test_token_rejects_bad_credentials(server):
+    """Test that wrong credentials map to the client login error."""
+    with pytest.raises(ValueError, match="Invalid username or password"):
+        APIClient(server.url, username="admin", password="wrong")
+
+
+def test_organization_lifecycle(client):
+    """Test listing, duplicate registration and deletion."""
+    assert client.list_organizations(server="local") == ["org"]
+    assert client.list_organizations(name="or", server="local") == ["org"]
+
+    with pytest.raises(ValueError, match="already exists"):
+        client.register_organization({"name": "org"})
+
+    client.delete_organization("org")
+    with pytest.raises(ValueError, match="Not found"):
+        client.delete_organization("org")
+
+
+def test_register_requires_existing_organization(client):
+    """Test that registering into a missing organization fails."""
+    with pytest.raises(ValueError, match="does not exist"):
+        client.register_url(
+            {
+                "resource_name": "data",
+                "resource_url": "https://example.com/data.csv",
+                "owner_org": "missing",
+            }
+        )
+
+
+def test_reserved_extras_are_rejected(client):
+    """Test the reserved key error of the registration endpoints."""
+    with pytest.raises(ValueError, match="Reserved key conflict"):
+        client.register_s3_link(
+            {
+                "resource_name": "object",
+                "resource_s3": "s3://bucket/object",
+                "owner_org": "org",
+                "extras": {"name": "clash"},
+            }
+        )
+
+
+def test_register_update_search_delete(client):
+    """Test a dataset round trip through every dataset endpoint."""
+    dataset_id = client.register_kafka_topic(
+        {
+            "dataset_name": "sensor_stream",
+            "dataset_title": "Sensor stream",
+            "owner_org": "org",
+            "kafka_topic": "sensors",
+            "kafka_host": "localhost",
+            "kafka_port": "9092",
+        }
+    )["id"]
+
+    client.update_kafka_topic(dataset_id, {"dataset_title": "Renamed"})
+    (result,) = client.search_datasets(["sensor"], ["name"], server="local")
+    assert result["id"] == dataset_id
+    assert result["title"] == "Renamed"
+    assert client.advanced_search(
+        {"search_term": "renamed", "server": "local"}
+    ) == [result]
+    assert client.search_datasets(["sensor"], server="global") == [result]
+
+    with pytest.raises(ValueError, match="Not found"):
+        client.update_kafka_topic("missing", {"dataset_title": "x"})
+
+    client.delete_resource_by_id(dataset_id)
+    assert client.search_datasets(["sensor"], server="local") == []
+    with pytest.raises(ValueError, match="Not found"):
+        client.delete_resource_by_name("sensor_stream")
+
+
+def test_search_pagination(client):
+    """Test that iter_search pages through the fake server results."""
+    for i in range(5):
+        client.register_url(
+            {
+                "resource_name": f"file_{i}",
+                "resource_url": f"https://example.com/{i}.csv",
+                "owner_org": "org",
+            }
+        )
+    names = [
+        item["name"]
+        for item in client.iter_search(["file"], server="local", page_size=2)
+    ]
+    assert names == [f"file_{i}" for i in range(5)]
+
+
+def test_kafka_details(client):
+    """Test the Kafka status endpoint."""
+    assert client.get_kafka_details()["kafka_connection"] is True
+
+
+def test_error_injection():
+    """Test that the configured error rate answers with a 503."""
+    with FakePOPServer(error_rate=1.0) as server:
+        response = requests.get(server.url)
+        assert response.status_code == 503
+        assert response.json() == {"detail": "Injected failure"}
+        assert server.request_count == 1
@@ -112,3 +112,74 @@ def test_get_kafka_details_invalid_json(mock_check_api, mock_get, client):
     mock_get.assert_called_once_with(
         "https://api.example.com/status/kafka-details"
     )
+
+
+@pytest.fixture
+def fake_server():
+    from pointofpresence.fake_server import FakePOPServer
+
+    with FakePOPServer() as server:
+        yield server
+
+
+def test_cached_details_are_revalidated_with_etag(fake_server):
+    """Test TTL caching and the conditional revalidation request."""
+    client = APIClientKafkaDetails(fake_server.url)
+    client.enable_kafka_details_cache(ttl=60, cache_file=False)
+    changes = []
+    client.on_kafka_details_change(lambda old, new: changes.append(new))
+    start = fake_server.request_count
+
+    details = client.get_kafka_details_cached()
+    assert client.get_kafka_details_cached() is details
+    assert fake_server.request_count == start + 1
+
+    # Expire the entry: the server answers 304 and nothing changes
+    client._kafka_details_cache.entry["fetched_at"] -= 120
+    with patch(
+        "pointofpresence.client_base.requests.Session.get",
+        wraps=client.session.get,
+    ) as spy:
+        assert client.get_kafka_details_cached() is details
+    assert spy.call_args[1]["headers"]["If-None-Match"]
+    assert changes == []
+
+    fake_server.kafka_details = {"kafka_host": "kafka2", "kafka_port": "1"}
+    client._kafka_details_cache.entry["fetched_at"] -= 120
+    assert client.get_kafka_details_cached()["kafka_host"] == "kafka2"
+    assert changes == [fake_server.kafka_details]
+
+
+def test_cached_details_are_shared_through_file(fake_server, tmp_path):
+    """Test that a second client reuses the lookup of the first one."""
+    cache_file = str(tmp_path / "kafka.json")
+    first = APIClientKafkaDetails(fake_server.url)
+    second = APIClientKafkaDetails(fake_server.url)
+    for client in (first, second):
+        client.enable_kafka_details_cache(ttl=60, cache_file=cache_file)
+
+    start = fake_server.request_count
+    expected = first.get_kafka_details_cached()
+    assert second.get_kafka_details_cached() == expected
+    assert fake_server.request_count == start + 1
+
+
+@patch("pointofpresence.client_base.requests.Session.get")
+def test_cached_details_compare_hash_without_etag(mock_get, client):
+    """Test that change callbacks fire only when the details differ."""
+    mock_response = MagicMock(status_code=200, headers={})
+    mock_response.json.return_value = {"kafka_host": "localhost"}
+    mock_get.return_value = mock_response
+    client.enable_kafka_details_cache(ttl=0, cache_file=None)
+    callback = client.on_kafka_details_change(MagicMock())
+
+    client.get_kafka_details_cached()
+    client.get_kafka_details_cached()
+    callback.assert_not_called()
+
+    mock_response.json.return_value = {"kafka_host": "remote"}
+    client.get_kafka_details_cached()
+    callback.assert_called_once_with(
+        {"kafka_host": "localhost"}, {"kafka_host": "remote"}
+    )
+    assert mock_get.call_count == 3
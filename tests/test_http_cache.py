@@ -0,0 +1,197 @@
+# tests/test_http_cache.py
+
+import pytest
+import requests
+from unittest.mock import patch
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from pointofpresence.http_cache import (
+    CachingHTTPAdapter,
+    FileCacheBackend,
+    MemoryCacheBackend,
+    parse_cache_control,
+)
+
+URL = "https://api.example.com/organization?server=local"
+
+
+def make_response(request, status=200, headers=None, body=b'["org"]'):
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body if status != 304 else b""
+    response._content_consumed = True
+    response.url = request.url
+    response.request = request
+    return response
+
+
+@pytest.fixture(params=["memory", "file"])
+def session(request, tmp_path):
+    backend = (
+        MemoryCacheBackend()
+        if request.param == "memory"
+        else FileCacheBackend(str(tmp_path))
+    )
+    session = requests.Session()
+    adapter = CachingHTTPAdapter(backend=backend)
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+def test_parse_cache_control():
+    """Test directive parsing."""
+    assert parse_cache_control('max-age=60, No-Cache, private="x"') == {
+        "max-age": "60",
+        "no-cache": True,
+        "private": "x",
+    }
+    assert parse_cache_control(None) == {}
+
+
+def test_fresh_response_is_served_without_request(session):
+    """Test that max-age responses are reused while fresh."""
+    session, adapter = session
+    with patch(
+        "requests.adapters.HTTPAdapter.send",
+        side_effect=lambda request, **kw: make_response(
+            request, headers={"Cache-Control": "max-age=60"}
+        ),
+    ) as send:
+        first = session.get(URL)
+        second = session.get(URL)
+    assert send.call_count == 1
+    assert first.from_cache is False
+    assert second.from_cache is True
+    assert second.json() == ["org"]
+    assert adapter.stats()["hits"] == 1
+    assert adapter.stats()["bytes_saved"] == len(b'["org"]')
+
+
+@pytest.mark.parametrize(
+    "age, fresh", [("30", True), ("90", False), ("1.5", True), ("x", True)]
+)
+def test_age_header(session, age, fresh):
+    """Test that Age shortens max-age and a malformed one is ignored."""
+    session, adapter = session
+    with patch(
+        "requests.adapters.HTTPAdapter.send",
+        side_effect=lambda request, **kw: make_response(
+            request, headers={"Cache-Control": "max-age=60", "Age": age}
+        ),
+    ) as send:
+        assert session.get(URL).json() == ["org"]
+        assert session.get(URL).from_cache is fresh
+    assert send.call_count == (1 if fresh else 2)
+
+
+def test_stale_response_is_revalidated(session):
+    """Test If-None-Match / If-Modified-Since and 304 handling."""
+    session, adapter = session
+    validators = {
+        "ETag": '"v1"',
+        "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    sent = []
+
+    def send(request, **kwargs):
+        sent.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return make_response(request, 304, validators)
+        return make_response(request, headers=validators)
+
+    with patch("requests.adapters.HTTPAdapter.send", side_effect=send):
+        session.get(URL)
+        response = session.get(URL)
+    assert sent[1]["If-None-Match"] == '"v1"'
+    assert sent[1]["If-Modified-Since"] == validators["Last-Modified"]
+    assert response.status_code == 200
+    assert response.from_cache is True
+    assert response.json() == ["org"]
+    assert adapter.stats()["revalidated"] == 1
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"Cache-Control": "no-store", "ETag": '"v1"'},
+        {},
+    ],
+)
+def test_uncacheable_responses_are_not_stored(session, headers):
+    """Test no-store and responses without validators or lifetime."""
+    session, adapter = session
+    with patch(
+        "requests.adapters.HTTPAdapter.send",
+        side_effect=lambda request, **kw: make_response(
+            request, headers=headers
+        ),
+    ) as send:
+        session.get(URL)
+        session.get(URL)
+    assert send.call_count == 2
+    assert "If-None-Match" not in send.call_args[0][0].headers
+    assert adapter.stats()["stored"] == 0
+
+
+def test_no_cache_and_writes_force_revalidation(session):
+    """Test that no-cache requests and writes bypass fresh entries."""
+    session, adapter = session
+    with patch(
+        "requests.adapters.HTTPAdapter.send",
+        side_effect=lambda request, **kw: make_response(
+            request, headers={"Cache-Control": "max-age=60", "ETag": '"v1"'}
+        ),
+    ) as send:
+        session.get(URL)
+        session.get(URL, headers={"Cache-Control": "no-cache"})
+        assert send.call_count == 2
+        session.post(URL, json={"name": "org"})
+        session.get(URL)
+        assert send.call_count == 4
+
+
+def test_authorization_is_part_of_key(session):
+    """Test that responses are not shared between tokens."""
+    session, adapter = session
+    with patch(
+        "requests.adapters.HTTPAdapter.send",
+        side_effect=lambda request, **kw: make_response(
+            request, headers={"Cache-Control": "max-age=60"}
+        ),
+    ) as send:
+        session.get(URL, headers={"Authorization": "Bearer a"})
+        session.get(URL, headers={"Authorization": "Bearer b"})
+        session.get(URL, headers={"Authorization": "Bearer a"})
+    assert send.call_count == 2
+
+
+def test_streamed_requests_bypass_cache(session):
+    """Test that streamed responses are neither served nor stored."""
+    session, adapter = session
+    with patch(
+        "requests.adapters.HTTPAdapter.send",
+        side_effect=lambda request, **kw: make_response(
+            request, headers={"Cache-Control": "max-age=60"}
+        ),
+    ) as send:
+        session.get(URL, stream=True)
+        session.get(URL, stream=True)
+    assert send.call_count == 2
+    assert adapter.stats()["stored"] == 0
+
+
+def test_client_revalidates_against_fake_server():
+    """Test the client option end to end with ETag revalidation."""
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    with FakePOPServer() as server:
+        client = APIClient(server.url, http_cache=True)
+        client.register_organization({"name": "org"})
+        assert client.list_organizations(server="local") == ["org"]
+        assert client.list_organizations(server="local") == ["org"]
+        assert client.http_cache.stats()["revalidated"] == 1
+        client.register_organization({"name": "org2"})
+        assert client.list_organizations(server="local") == ["org", "org2"]
+        client.close()
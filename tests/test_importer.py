@@ -0,0 +1,195 @@
+# tests/test_importer.py
+
+import io
+import json
+import pytest
+from pointofpresence.cli import main
+from pointofpresence.fake_server import FakePOPServer
+from pointofpresence.importer import (
+    import_file,
+    iter_import,
+    map_record,
+    read_records,
+)
+
+CSV = (
+    "dct:title,dct:description,owner_org,dcat:accessURL,dcat:downloadURL,"
+    "dct:format,dcat:keyword,extras:publisher_name\n"
+    "Air Quality,Hourly readings,org,https://a.example.com,"
+    "https://a.example.com/data.csv,CSV,air;quality,NDP\n"
+    "Soil Samples,,org,s3://bucket/soil,,,,\n"
+    "No Org,Missing owner,,https://example.com/x,,,,\n"
+)
+
+
+def test_map_record_dcat_columns():
+    """Test the mapping of DCAT columns to a URL payload."""
+    kind, payload = map_record(
+        {
+            "dct:title": "Air Quality",
+            "dct:description": "Hourly readings",
+            "owner_org": "org",
+            "dcat:accessURL": "https://a.example.com",
+            "dcat:downloadURL": "https://a.example.com/data.csv",
+            "dct:format": "CSV",
+            "owl:versionInfo": "2",
+            "extras:publisher_name": "NDP",
+            "custom": "value",
+        }
+    )
+    assert kind == "url"
+    assert payload == {
+        "resource_name": "air_quality",
+        "resource_title": "Air Quality",
+        "notes": "Hourly readings",
+        "owner_org": "org",
+        "resource_url": "https://a.example.com/data.csv",
+        "file_type": "CSV",
+        "extras": {
+            "dataset_version": "2",
+            "publisher_name": "NDP",
+            "custom": "value",
+        },
+    }
+
+
+def test_map_record_kafka_and_s3():
+    """Test the detection of Kafka and S3 records."""
+    kind, payload = map_record(
+        {
+            "dataset_name": "topic",
+            "owner_org": "org",
+            "kafka_topic": "t",
+            "kafka_host": "h",
+            "kafka_port": "9092",
+            "dct:description": "Stream",
+            "mapping": '{"a": "b"}',
+            "dcat:keyword": ["x", "y"],
+        }
+    )
+    assert kind == "kafka"
+    assert payload["dataset_description"] == "Stream"
+    assert payload["mapping"] == {"a": "b"}
+    assert payload["extras"] == {"keywords": "x, y"}
+
+    kind, payload = map_record(
+        {"name": "soil", "owner_org": "org", "dcat:accessURL": "s3://b/k"}
+    )
+    assert kind == "s3" and payload["resource_s3"] == "s3://b/k"
+    with pytest.raises(ValueError):
+        map_record({"kind": "ftp"})
+
+
+def test_read_records_is_lazy(tmp_path):
+    """Test that records are read one at a time with line numbers."""
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"name": "a"}\n\nnot json\n[1]\n{"name": "b"}\n')
+    records = read_records(str(path))
+    assert next(records) == (1, {"name": "a"})
+    rest = list(records)
+    assert [number for number, _ in rest] == [3, 4, 5]
+    assert isinstance(rest[0][1], ValueError)
+    assert isinstance(rest[1][1], ValueError)
+    with pytest.raises(ValueError):
+        read_records(str(path), format="xml")
+
+
+def test_read_records_from_stdin(monkeypatch):
+    """Test that quoted newlines survive and stdin is left open."""
+    buffer = io.BytesIO(b'name,notes\r\na,"two\r\nlines"\r\nb,one\r\n')
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(buffer))
+    records = list(read_records("-", format="csv"))
+    assert records == [
+        (3, {"name": "a", "notes": "two\r\nlines"}),
+        (4, {"name": "b", "notes": "one"}),
+    ]
+    assert not buffer.closed
+
+
+def test_import_file(tmp_path):
+    """Test a CSV import against the fake server."""
+    from pointofpresence import APIClient
+
+    path = tmp_path / "records.csv"
+    path.write_text(CSV)
+    results = tmp_path / "results.jsonl"
+    with FakePOPServer() as server:
+        client = APIClient(server.url)
+        client.register_organization({"name": "org"})
+        summary = import_file(
+            client, str(path), results_path=str(results), max_workers=2
+        )
+        assert summary == {"total": 3, "registered": 2, "failed": 1}
+        names = {d["name"] for d in server.store.dsets("local").values()}
+        assert names == {"air_quality", "soil_samples"}
+        client.close()
+
+    entries = sorted(
+        (json.loads(line) for line in results.read_text().splitlines()),
+        key=lambda entry: entry["line"],
+    )
+    assert [entry["line"] for entry in entries] == [2, 3, 4]
+    assert entries[0]["kind"] == "url" and entries[0]["id"]
+    assert entries[1]["kind"] == "s3"
+    assert "owner_org" in entries[2]["error"]
+
+
+def test_iter_import_dry_run(tmp_path):
+    """Test that a dry run checks records without a client."""
+    path = tmp_path / "records.csv"
+    path.write_text(CSV)
+    outcomes = list(iter_import(None, str(path), dry_run=True))
+    assert sorted(o.ok for o in outcomes) == [False, True, True]
+
+
+def test_cli_import(tmp_path, capsys):
+    """Test the pop import command."""
+    path = tmp_path / "records.csv"
+    path.write_text(CSV)
+    with FakePOPServer() as server:
+        from pointofpresence import APIClient
+
+        APIClient(server.url).register_organization({"name": "org"})
+        status = main(["import", str(path), "--url", server.url])
+    assert status == 1
+    assert json.loads(capsys.readouterr().out)["registered"] == 2
+
+    assert main(["import", str(tmp_path / "missing.csv"), "--dry-run"]) == 2
+
+
+def test_malformed_csv_row_fails_alone(tmp_path):
+    """Test that a CSV parsing error only fails its own row."""
+    path = tmp_path / "records.csv"
+    path.write_text(
+        "name,owner_org,dcat:accessURL\n"
+        "first,org,https://example.com/1\n"
+        f"{'x' * 200000},org,https://example.com/2\n"
+        "last,org,https://example.com/3\n"
+    )
+    records = list(read_records(str(path)))
+    assert [number for number, _ in records] == [2, 3, 4]
+    assert records[0][1]["name"] == "first"
+    assert isinstance(records[1][1], ValueError)
+    assert "Invalid CSV" in str(records[1][1])
+    assert records[2][1]["name"] == "last"
+
+    outcomes = list(iter_import(None, str(path), dry_run=True))
+    assert sorted(o.item[0] for o in outcomes if not o.ok) == [3]
+
+
+def test_cli_reports_csv_errors(tmp_path, capsys, monkeypatch):
+    """Test that the CLI reports CSV errors instead of crashing."""
+    import csv
+    import pointofpresence.importer
+
+    path = tmp_path / "records.csv"
+    path.write_text(f"name,owner_org\n{'x' * 200000},org\n")
+    assert main(["import", str(path), "--dry-run"]) == 1
+    assert json.loads(capsys.readouterr().out)["failed"] == 1
+
+    def broken(*args, **kwargs):
+        raise csv.Error("field larger than field limit (131072)")
+
+    monkeypatch.setattr(pointofpresence.importer, "import_file", broken)
+    assert main(["import", str(path), "--dry-run"]) == 2
+    assert "field larger than field limit" in capsys.readouterr().err
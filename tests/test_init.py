@@ -0,0 +1,76 @@
+# tests/test_init.py
+
+import importlib
+import os
+import subprocess
+import sys
+import pytest
+import pointofpresence
+
+
+def test_import_does_not_load_transport():
+    """Test that importing the package defers requests and httpx."""
+    code = (
+        "import sys\n"
+        "before = set(sys.modules)\n"
+        "import pointofpresence\n"
+        "loaded = {m.split('.')[0] for m in set(sys.modules) - before}\n"
+        "print(' '.join(sorted(loaded)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout.split()
+    assert "pointofpresence" in output
+    assert not {"requests", "urllib3", "httpx"} & set(output)
+
+
+def test_lazy_exports():
+    """Test that the clients resolve on first access."""
+    from pointofpresence.async_client import AsyncAPIClient
+    from pointofpresence.client import APIClient
+
+    assert pointofpresence.APIClient is APIClient
+    assert pointofpresence.AsyncAPIClient is AsyncAPIClient
+    assert {"APIClient", "AsyncAPIClient"} <= set(dir(pointofpresence))
+
+
+def test_unknown_attribute():
+    """Test that unknown names still raise AttributeError."""
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        pointofpresence.missing
+
+
+@pytest.mark.parametrize("name", sorted(pointofpresence._LAZY_EXPORTS))
+def test_public_names_resolve(name):
+    """Test that every exported client and mixin can still be imported."""
+    namespace = {}
+    exec(f"from pointofpresence import {name}", namespace)
+    module = importlib.import_module(
+        pointofpresence._LAZY_EXPORTS[name], "pointofpresence"
+    )
+    assert namespace[name] is getattr(module, name)
+    assert name in pointofpresence.__all__
+
+
+def test_baseline_mixins_are_exported():
+    """Test the names exported by the package before lazy loading."""
+    from pointofpresence import (  # noqa: F401
+        APIClientBase,
+        APIClientBulkRegister,
+        APIClientKafkaDetails,
+        APIClientKafkaRegister,
+        APIClientKafkaUpdate,
+        APIClientOrganizationDelete,
+        APIClientOrganizationList,
+        APIClientOrganizationRegister,
+        APIClientResourceDelete,
+        APIClientS3Register,
+        APIClientS3Update,
+        APIClientSearch,
+        APIClientURLRegister,
+        APIClientURLUpdate,
+    )
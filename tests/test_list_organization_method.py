@@ -1,5 +1,7 @@
 # tests/test_list_organization_method.py
 
+import threading
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from pointofpresence.list_organization_method import APIClientOrganizationList
@@ -104,3 +106,135 @@ def test_list_organizations_with_server(mock_check_api, mock_get, client):
         "https://api.example.com/organization",
         params={"server": "local"}
     )
+
+
+@pytest.fixture
+def fake_client():
+    """APIClient connected to an in-process fake server."""
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    with FakePOPServer() as server:
+        client = APIClient(server.url)
+        for name in ("utah", "utah_chpc", "ndp"):
+            client.register_organization({"name": name})
+        yield server, client
+        client.close()
+
+
+def test_find_organizations_uses_local_index(fake_client):
+    """Test that repeated lookups do not reach the server."""
+    server, client = fake_client
+    assert client.find_organizations("ut", server="local") == [
+        "utah",
+        "utah_chpc",
+    ]
+    start = server.request_count
+    assert client.find_organizations("nd", server="local") == ["ndp"]
+    assert client.find_organizations(
+        "chp", server="local", mode="contains"
+    ) == ["utah_chpc"]
+    assert client.find_organizations(
+        "utha", server="local", mode="fuzzy"
+    ) == ["utah"]
+    assert server.request_count == start
+
+
+def test_find_organizations_falls_back_on_miss(fake_client):
+    """Test that a miss asks the server and updates the index."""
+    server, client = fake_client
+    client.organization_index("local")
+    # Registered by another client: the index does not know it yet
+    server.store.orgs("local")["sci"] = {"name": "sci"}
+    assert client.find_organizations("sc", server="local") == ["sci"]
+    assert "sci" in client.organization_index("local")
+
+
+def test_organization_writes_drop_index(fake_client):
+    """Test that this client's writes reload the index."""
+    server, client = fake_client
+    client.organization_index("local")
+    client.delete_organization("ndp")
+    assert "ndp" not in client.organization_index("local")
+
+
+def test_stale_index_refreshes_in_background(fake_client):
+    """Test the refresh interval."""
+    server, client = fake_client
+    client.organization_refresh_interval = 0
+    index = client.organization_index("local")
+    server.store.orgs("local")["sci"] = {"name": "sci"}
+    assert client.organization_index("local") is index
+    deadline = time.monotonic() + 5
+    while "sci" not in client.organization_index("local"):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_find_organizations_invalid_mode(fake_client):
+    """Test the mode validation."""
+    with pytest.raises(ValueError, match="mode must be one of"):
+        fake_client[1].find_organizations("ut", mode="regex")
+
+
+def test_concurrent_first_calls_load_once(fake_client):
+    """Test that threads asking for a new index share one fetch."""
+    import threading
+
+    server, client = fake_client
+    start = server.request_count
+    server.latency = 0.05
+    threads = [
+        threading.Thread(target=client.organization_index, args=("local",))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.request_count == start + 1
+
+
+def test_organization_lock_is_per_client():
+    """Test that clients do not share the index lock."""
+    with patch.object(APIClientOrganizationList, "_check_api_availability"):
+        first = APIClientOrganizationList(base_url="https://a.example.com")
+        second = APIClientOrganizationList(base_url="https://b.example.com")
+    assert first._organization_lock is not second._organization_lock
+
+
+def test_load_racing_a_write_is_not_stored(fake_client):
+    """Test that a list fetched before a write does not replace it."""
+    server, client = fake_client
+    list_organizations = client.list_organizations
+
+    def list_then_delete(**kwargs):
+        names = list_organizations(**kwargs)
+        client.delete_organization("ndp")
+        return names
+
+    with patch.object(client, "list_organizations", list_then_delete):
+        assert "ndp" in client.organization_index("local", refresh=True)
+    assert "ndp" not in client.organization_index("local")
+
+
+def test_lock_released_while_fetching(fake_client):
+    """Test that other threads can use the indexes during a load."""
+    server, client = fake_client
+    list_organizations = client.list_organizations
+    acquired = []
+
+    def list_and_probe(**kwargs):
+        thread = threading.Thread(
+            target=lambda: acquired.append(
+                client._organization_lock.acquire(timeout=1)
+                and client._organization_lock.release() is None
+            )
+        )
+        thread.start()
+        thread.join()
+        return list_organizations(**kwargs)
+
+    with patch.object(client, "list_organizations", list_and_probe):
+        client.organization_index("local")
+    assert acquired == [True]
@@ -0,0 +1,103 @@
+# tests/test_metrics.py
+
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+from pointofpresence.client_base import APIClientBase
+from pointofpresence.metrics import MetricsRecorder, endpoint_template
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/search", "/search"),
+        ("/kafka/1234-abcd", "/kafka/{id}"),
+        ("/resource/my_resource", "/resource/{id}"),
+        ("/status/kafka-details", "/status/kafka-details"),
+        ("", "/"),
+    ],
+)
+def test_endpoint_template(path, expected):
+    """Test that identifiers are collapsed out of request paths."""
+    assert endpoint_template(path) == expected
+
+
+def test_recorder_snapshot():
+    """Test counts, status codes, histogram and byte counters."""
+    recorder = MetricsRecorder(buckets=(0.1, 1.0))
+    recorder.record("GET", "/search", "global", 200, 0.05, 0, 300)
+    recorder.record("GET", "/search", "global", 500, 0.5, 0, 20, retries=2)
+    recorder.record("GET", "/search", "global", "error", 3.0)
+
+    (item,) = recorder.snapshot()
+    assert item["count"] == 3
+    assert item["status_codes"] == {"200": 1, "500": 1, "error": 1}
+    assert item["latency"]["buckets"] == {0.1: 1, 1.0: 2}
+    assert item["latency"]["sum"] == pytest.approx(3.55)
+    assert item["bytes_received"] == 320
+    assert item["retries"] == 2
+
+
+def test_recorder_prometheus_format():
+    """Test the Prometheus text exposition output."""
+    recorder = MetricsRecorder(buckets=(0.1,))
+    recorder.record("POST", "/kafka", "local", 201, 0.05, 120, 40)
+
+    text = recorder.to_prometheus()
+
+    labels = 'method="POST",endpoint="/kafka",server="local"'
+    assert "# TYPE pop_client_requests_total counter" in text
+    assert f'pop_client_requests_total{{{labels},status="201"}} 1' in text
+    assert (
+        f'pop_client_request_duration_seconds_bucket{{{labels},le="0.1"}} 1'
+        in text
+    )
+    assert (
+        f'pop_client_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1'
+        in text
+    )
+    assert f"pop_client_sent_bytes_total{{{labels}}} 120" in text
+    assert text.endswith("\n")
+
+
+@patch("pointofpresence.client_base.requests.Session.request")
+def test_client_records_requests(mock_request):
+    """Test that the client records each request per endpoint/server."""
+    mock_response = MagicMock(status_code=200, content=b"[]", attempts=1)
+    mock_response.request.body = b'{"a": 1}'
+    mock_request.side_effect = [
+        mock_response,
+        requests.exceptions.ConnectionError("refused"),
+    ]
+    client = APIClientBase(
+        base_url="https://api.example.com", token="t", metrics=True
+    )
+
+    client.session.put(
+        "https://api.example.com/kafka/123",
+        json={"a": 1},
+        params={"server": "pre_ckan"},
+    )
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.session.get("https://api.example.com/kafka/456")
+
+    snapshot = client.metrics()
+    assert [(m["method"], m["endpoint"], m["server"]) for m in snapshot] == [
+        ("GET", "/kafka/{id}", ""),
+        ("PUT", "/kafka/{id}", "pre_ckan"),
+    ]
+    assert snapshot[0]["status_codes"] == {"error": 1}
+    assert snapshot[1]["bytes_sent"] == 8
+    assert snapshot[1]["bytes_received"] == 2
+    assert "pop_client_requests_total" in client.metrics(prometheus=True)
+
+
+def test_client_metrics_disabled():
+    """Test that metrics() explains how to enable metrics."""
+    client = APIClientBase(base_url="https://api.example.com", token="t")
+
+    with pytest.raises(ValueError) as exc_info:
+        client.metrics()
+
+    assert "metrics=True" in str(exc_info.value)
+    assert client.session.metrics is None
@@ -0,0 +1,33 @@
+# tests/test_organization_index.py
+
+from pointofpresence.organization_index import OrganizationIndex
+
+NAMES = ["Utah", "utah_chpc", "NDP", "ndp-sandbox", "Sci Lab", "geo"]
+
+
+def test_prefix_is_case_insensitive():
+    """Test prefix lookups, limits and original case."""
+    index = OrganizationIndex(NAMES)
+    assert index.prefix("ut") == ["Utah", "utah_chpc"]
+    assert index.prefix("NDP") == ["NDP", "ndp-sandbox"]
+    assert index.prefix("ndp", limit=1) == ["NDP"]
+    assert index.prefix("zz") == []
+    assert index.prefix("") == index.names()
+
+
+def test_contains_and_membership():
+    """Test substring lookups and the in operator."""
+    index = OrganizationIndex(NAMES)
+    assert index.contains("lab") == ["Sci Lab"]
+    assert index.contains("a", limit=2) == ["ndp-sandbox", "Sci Lab"]
+    assert "utah" in index
+    assert "uta" not in index
+    assert len(index) == len(NAMES)
+
+
+def test_fuzzy_ranks_prefix_then_similar():
+    """Test that typos still find the organization."""
+    index = OrganizationIndex(NAMES)
+    assert index.fuzzy("uath") == ["Utah"]
+    assert index.fuzzy("ndp")[:2] == ["NDP", "ndp-sandbox"]
+    assert index.fuzzy("xyz") == []
@@ -0,0 +1,106 @@
+# tests/test_ratelimit.py
+
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from pointofpresence.ratelimit import (
+    FileTokenBucket,
+    RateLimiter,
+    TokenBucket,
+)
+
+
+def test_burst_then_refill():
+    """Test that the burst is available at once and then refills."""
+    clock = [100.0]
+    with patch("pointofpresence.ratelimit.time.monotonic", lambda: clock[0]):
+        bucket = TokenBucket(rate=2, burst=3)
+        assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+        clock[0] += 0.5
+        assert bucket.try_acquire() == 0
+        clock[0] += 100
+        assert [bucket.try_acquire() for _ in range(4)][-1] > 0
+
+
+def test_acquire_smooths_concurrent_callers():
+    """Test that threads are held to the configured rate."""
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    threads = [
+        threading.Thread(target=bucket.acquire) for _ in range(11)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # One token immediately, ten more at 50 per second
+    assert time.monotonic() - start >= 0.18
+
+
+@pytest.mark.parametrize("rate, burst", [(0, None), (1, 0)])
+def test_invalid_parameters(rate, burst):
+    """Test the parameter validation."""
+    with pytest.raises(ValueError):
+        TokenBucket(rate, burst)
+
+
+def test_rate_limiter_rule_specificity():
+    """Test that the most specific rule applies, per server."""
+    limiter = RateLimiter(
+        {("*", "*"): 1, ("*", "write"): 2, ("global", "read"): (3, 6)}
+    )
+    assert limiter._bucket("local", "read").rate == 1
+    assert limiter._bucket("local", "write").rate == 2
+    assert limiter._bucket("global", "read").burst == 6
+    assert limiter._bucket("pre_ckan", "write") is not limiter._bucket(
+        "local", "write"
+    )
+    assert RateLimiter({("local", "*"): 1})._bucket("global", "read") is None
+
+
+def test_rate_limiter_invalid_kind():
+    """Test that unknown request kinds are rejected."""
+    with pytest.raises(ValueError):
+        RateLimiter({("*", "delete"): 1})
+
+
+def test_file_token_bucket_shared(tmp_path):
+    """Test that buckets on the same file and key share their tokens."""
+    path = str(tmp_path / "limits.json")
+    first = FileTokenBucket(path, "global:write", rate=1, burst=2)
+    second = FileTokenBucket(path, "global:write", rate=1, burst=2)
+    other = FileTokenBucket(path, "local:write", rate=1, burst=2)
+    assert first.try_acquire() == 0
+    assert second.try_acquire() == 0
+    assert first.try_acquire() > 0
+    assert other.try_acquire() == 0
+
+
+def test_client_rate_limit_counts_search_as_read():
+    """Test that the client waits on writes but not on POST /search."""
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    limiter = RateLimiter({("*", "write"): (20, 1)})
+    with FakePOPServer() as server:
+        client = APIClient(server.url, rate_limit=limiter)
+        other = APIClient(server.url, rate_limit=limiter)
+        for _ in range(3):
+            client.advanced_search({"server": "global"})
+        assert limiter.stats()["waits"] == 0
+
+        start = time.monotonic()
+        client.register_organization({"name": "org_a"})
+        other.register_organization({"name": "org_b"})
+        client.register_organization({"name": "org_c"})
+        assert time.monotonic() - start >= 0.09
+        assert limiter.stats()["waits"] == 2
+        client.close()
+        other.close()
+
+        client = APIClient(server.url, rate_limit={("*", "*"): 5})
+        assert isinstance(client.rate_limiter, RateLimiter)
+        assert client.session.rate_limiter is client.rate_limiter
+        client.close()
@@ -0,0 +1,81 @@
+# tests/test_retry.py
+
+import pytest
+from unittest.mock import patch, MagicMock
+from pointofpresence.client_base import APIClientBase
+from pointofpresence.retry import RetryPolicy
+
+
+def test_policy_to_urllib3_idempotent_methods():
+    """Test that POST is only retried on status codes when opted in."""
+    retry = RetryPolicy(max_attempts=4).to_urllib3()
+
+    assert retry.total == 3
+    assert retry.raise_on_status is False
+    assert retry.respect_retry_after_header is True
+    assert retry.is_retry("GET", 503)
+    assert retry.is_retry("DELETE", 502)
+    assert not retry.is_retry("POST", 503)
+    assert not retry.is_retry("GET", 404)
+
+    retry_post = RetryPolicy(retry_post=True).to_urllib3()
+    assert retry_post.is_retry("POST", 503)
+
+
+def test_policy_rejects_invalid_attempts():
+    """Test that at least one attempt is required."""
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+@patch("pointofpresence.retry.random.uniform")
+def test_backoff_is_capped_with_full_jitter(mock_uniform):
+    """Test the exponential backoff ceiling passed to the jitter."""
+    mock_uniform.side_effect = lambda low, high: high
+    retry = RetryPolicy(
+        max_attempts=10, backoff_base=0.5, backoff_cap=3
+    ).to_urllib3()
+
+    assert retry.get_backoff_time() == 0
+    delays = []
+    for _ in range(5):
+        retry = retry.increment("GET", "/search")
+        delays.append(retry.get_backoff_time())
+
+    assert delays == [0.5, 1.0, 2.0, 3, 3]
+    assert retry.backoff_cap == 3
+
+
+def test_response_hook_records_attempts():
+    """Test that attempts are reported on the response and aggregated."""
+    policy = RetryPolicy(max_attempts=5)
+    retried = policy.to_urllib3().increment("GET", "/search")
+    retried = retried.increment("GET", "/search")
+
+    first = MagicMock()
+    first.raw.retries = retried
+    second = MagicMock()
+    second.raw.retries = None
+
+    policy.response_hook(first)
+    policy.response_hook(second)
+
+    assert first.attempts == 3
+    assert second.attempts == 1
+    assert policy.requests == 2
+    assert policy.attempts == 4
+    assert policy.amplification == 2.0
+
+
+def test_client_mounts_retry_policy():
+    """Test that the client wires the policy into adapter and hooks."""
+    policy = RetryPolicy(max_attempts=2)
+    with patch.object(APIClientBase, "_check_api_availability"):
+        client = APIClientBase(
+            base_url="https://api.example.com", retry=policy
+        )
+
+    adapter = client.session.get_adapter("https://api.example.com")
+    assert adapter.max_retries.total == 1
+    assert policy.response_hook in client.session.hooks["response"]
+    assert client.retry_policy is policy
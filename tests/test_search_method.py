@@ -1,5 +1,6 @@
 # tests/test_search_method.py
 
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 from pointofpresence.search_method import APIClientSearch
@@ -162,3 +163,180 @@ def test_search_datasets_keys_mismatch(client):
     assert "The number of terms must match the number of keys" in str(
         exc_info.value
     )
+
+
+def test_search_datasets_cached(client):
+    """Test that identical searches are served from the search cache."""
+    cache = client.enable_search_cache(ttl=60)
+    with patch("pointofpresence.client_base.requests.Session.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.json.return_value = [{"name": "cached_dataset"}]
+        mock_get.return_value = mock_response
+
+        first = client.search_datasets(terms=["example"], keys=[None])
+        second = client.search_datasets(terms=["example"], keys=[None])
+        client.search_datasets(terms=["example"], server="local")
+
+    assert first == second == [{"name": "cached_dataset"}]
+    assert mock_get.call_count == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_advanced_search_cached_with_canonical_key(client):
+    """Test that advanced searches are cached regardless of key order."""
+    client.enable_search_cache()
+    with patch(
+        "pointofpresence.client_base.requests.Session.post"
+    ) as mock_post:
+        mock_response = MagicMock()
+        mock_response.json.return_value = [{"name": "advanced"}]
+        mock_post.return_value = mock_response
+
+        client.advanced_search({"search_term": "a", "server": "local"})
+        client.advanced_search({"server": "local", "search_term": "a"})
+
+    mock_post.assert_called_once()
+
+
+def test_search_cache_invalidated_by_writes(client):
+    """
+    Test that a successful write on a server drops that server's cached
+    results only.
+    """
+    cache = client.enable_search_cache()
+    cache.set("local-entry", [], tag="local")
+    cache.set("global-entry", [], tag="global")
+
+    with patch(
+        "pointofpresence.client_base.requests.Session.request"
+    ) as mock_request:
+        mock_request.return_value = MagicMock(ok=True)
+        client.session.get(
+            "https://api.example.com/organization",
+            params={"server": "local"},
+        )
+        assert len(cache) == 2
+
+        client.session.post(
+            "https://api.example.com/url",
+            json={},
+            params={"server": "local"},
+        )
+
+    assert cache.get("local-entry") == (False, None)
+    assert cache.get("global-entry") == (True, [])
+
+
+def test_search_cache_disabled(client):
+    """Test that disabling the cache detaches its write listener."""
+    client.enable_search_cache()
+    client.disable_search_cache()
+
+    assert client.session.write_listeners == []
+    assert client._search_cache is None
+
+
+def _streamed_response(items):
+    """Build a mocked streamed response over a JSON array."""
+    data = json.dumps(items).encode("utf-8")
+    mock_response = MagicMock()
+    mock_response.iter_content.return_value = [
+        data[i:i + 5] for i in range(0, len(data), 5)
+    ]
+    mock_response.json.return_value = items
+    return mock_response
+
+
+def test_iter_search_streams_response(client):
+    """Test that iter_search decodes a single streamed response."""
+    datasets = [{"name": f"dataset_{i}"} for i in range(3)]
+    with patch("pointofpresence.client_base.requests.Session.get") as mock_get:
+        mock_get.return_value = _streamed_response(datasets)
+
+        results = list(client.iter_search(terms=["example"]))
+
+    assert results == datasets
+    mock_get.assert_called_once_with(
+        "https://api.example.com/search",
+        params={"terms": ["example"], "server": "global"},
+        stream=True,
+    )
+
+
+def test_iter_search_streams_with_client_codec():
+    """Test that streamed items are decoded with the client's codec."""
+    class CountingCodec:
+        calls = 0
+
+        def dumps(self, obj):
+            return json.dumps(obj).encode("utf-8")
+
+        def loads(self, data):
+            CountingCodec.calls += 1
+            return json.loads(data)
+
+    with patch.object(APIClientSearch, "_check_api_availability"):
+        client = APIClientSearch(
+            base_url="https://api.example.com", codec=CountingCodec()
+        )
+    datasets = [{"name": f"dataset_{i}"} for i in range(3)]
+    with patch("pointofpresence.client_base.requests.Session.get") as mock_get:
+        mock_get.return_value = _streamed_response(datasets)
+
+        assert list(client.iter_search(terms=["example"])) == datasets
+
+    assert CountingCodec.calls == 3
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_search_pages(client, prefetch):
+    """Test that iter_search pages with limit/offset until a short page."""
+    pages = [
+        [{"name": "a"}, {"name": "b"}],
+        [{"name": "c"}, {"name": "d"}],
+        [{"name": "e"}],
+    ]
+    with patch("pointofpresence.client_base.requests.Session.get") as mock_get:
+        mock_get.side_effect = [_streamed_response(page) for page in pages]
+
+        results = list(
+            client.iter_search(
+                terms=["example"], page_size=2, prefetch=prefetch
+            )
+        )
+
+    assert [r["name"] for r in results] == ["a", "b", "c", "d", "e"]
+    offsets = [
+        call.kwargs["params"]["offset"] for call in mock_get.call_args_list
+    ]
+    assert offsets == [0, 2, 4]
+    assert mock_get.call_args_list[0].kwargs["params"]["limit"] == 2
+
+
+def test_iter_search_server_without_pagination(client):
+    """Test that an unpaginated response is yielded once."""
+    datasets = [{"name": str(i)} for i in range(5)]
+    with patch("pointofpresence.client_base.requests.Session.get") as mock_get:
+        mock_get.return_value = _streamed_response(datasets)
+
+        results = list(client.iter_search(terms=["example"], page_size=2))
+
+    assert results == datasets
+    mock_get.assert_called_once()
+
+
+def test_iter_advanced_search_http_error(client):
+    """Test that iter_advanced_search maps HTTP errors."""
+    with patch(
+        "pointofpresence.client_base.requests.Session.post"
+    ) as mock_post:
+        mock_response = MagicMock()
+        mock_response.raise_for_status.side_effect = HTTPError("HTTP Error")
+        mock_response.json.return_value = {"detail": "Bad filter"}
+        mock_post.return_value = mock_response
+
+        with pytest.raises(ValueError) as exc_info:
+            list(client.iter_advanced_search({"search_term": "a"}))
+
+    assert str(exc_info.value) == "Error in advanced search: Bad filter"
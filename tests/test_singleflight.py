@@ -0,0 +1,96 @@
+# tests/test_singleflight.py
+
+import threading
+import pytest
+from pointofpresence.singleflight import SingleFlight
+
+
+def run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(position):
+        barrier.wait()
+        try:
+            results[position] = target()
+        except Exception as exc:
+            results[position] = exc
+
+    threads = [
+        threading.Thread(target=worker, args=(i,)) for i in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_run():
+    """Test that callers of the same key share the first caller's run."""
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def slow():
+        runs.append(1)
+        release.wait(1)
+        return "result"
+
+    def call():
+        return flight.do("key", slow)
+
+    timer = threading.Timer(0.1, release.set)
+    timer.start()
+    results = run_concurrently(5, call)
+    assert len(runs) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert {value for value, _ in results} == {"result"}
+    assert flight.stats() == {"calls": 1, "collapsed": 4, "in_flight": 0}
+
+    # Finished calls are not cached
+    assert flight.do("key", lambda: "again") == ("again", False)
+
+
+def test_error_is_shared():
+    """Test that every waiting caller receives the exception."""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(1)
+        raise ValueError("boom")
+
+    timer = threading.Timer(0.1, release.set)
+    timer.start()
+    results = run_concurrently(3, lambda: flight.do("key", failing))
+    assert all(isinstance(result, ValueError) for result in results)
+    with pytest.raises(KeyError):
+        flight.do("other", lambda: {}["missing"])
+
+
+def test_client_coalesces_identical_gets():
+    """Test that concurrent identical reads cost one HTTP request."""
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    with FakePOPServer(latency=0.1) as server:
+        client = APIClient(server.url, coalesce=True, codec="auto")
+        client.register_organization({"name": "org"})
+        before = server.request_count
+        results = run_concurrently(
+            8, lambda: client.list_organizations(server="local")
+        )
+        assert results == [["org"]] * 8
+        assert server.request_count == before + 1
+        assert client.single_flight.stats()["collapsed"] == 7
+
+        # Different parameters are separate requests
+        run_concurrently(
+            2,
+            lambda: client.list_organizations(
+                name=threading.current_thread().name, server="local"
+            ),
+        )
+        assert server.request_count == before + 3
+        client.close()
@@ -0,0 +1,74 @@
+# tests/test_streaming.py
+
+import json
+import pytest
+from pointofpresence.streaming import iter_json_array
+
+
+def _chunks(document, size):
+    """Split a JSON document into byte chunks of the given size."""
+    data = json.dumps(document).encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("loads", [None, json.loads])
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 4096])
+def test_iter_json_array_any_chunking(size, loads):
+    """Test that items are decoded whatever the chunk boundaries."""
+    document = [
+        {"id": "1", "title": "Café data", "extras": {"k": [1, 2]}},
+        12345,
+        "text",
+        None,
+        {"id": "2", "resources": []},
+    ]
+
+    chunks = _chunks(document, size)
+    assert list(iter_json_array(chunks, loads=loads)) == document
+
+
+def test_iter_json_array_empty():
+    """Test decoding an empty array."""
+    assert list(iter_json_array([b" [ ", b" ] "])) == []
+
+
+def test_iter_json_array_yields_incrementally():
+    """Test that the first item is available before the array ends."""
+    chunks = iter([b'[{"id": 1}, ', b'{"id": 2}'])
+    items = iter_json_array(chunks)
+
+    assert next(items) == {"id": 1}
+    with pytest.raises(ValueError):
+        list(items)
+
+
+@pytest.mark.parametrize("loads", [None, json.loads])
+@pytest.mark.parametrize(
+    "document",
+    [b'{"id": 1}', b"[1 2]", b"[1,", b"[1,]", b'[{"a": 1]', b'["x'],
+)
+def test_iter_json_array_invalid(document, loads):
+    """Test that malformed documents raise ValueError."""
+    with pytest.raises(ValueError):
+        list(iter_json_array([document], loads=loads))
+
+
+@pytest.mark.parametrize("size", [1, 2, 5])
+def test_iter_json_array_loads_each_item_once(size):
+    """Test that ``loads`` gets the exact text of every item."""
+    document = [
+        {"title": 'quote " and ] } [ { in a string', "path": "C:\\dir\\"},
+        [[], [1, [2]]],
+        "\\",
+        -1.5e3,
+        True,
+    ]
+    texts = []
+
+    def loads(text):
+        texts.append(text)
+        return json.loads(text)
+
+    chunks = _chunks(document, size)
+    assert list(iter_json_array(chunks, loads=loads)) == document
+    assert texts == [json.dumps(item) for item in document]
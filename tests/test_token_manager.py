@@ -0,0 +1,126 @@
+# tests/test_token_manager.py
+
+import base64
+import json
+import time
+from unittest.mock import patch, MagicMock
+from pointofpresence.client_base import APIClientBase
+from pointofpresence.token_manager import TokenManager, decode_jwt_expiry
+
+
+def _jwt(exp):
+    """Build an unsigned JWT with the given expiry."""
+    payload = base64.urlsafe_b64encode(
+        json.dumps({"sub": "user", "exp": exp}).encode()
+    ).rstrip(b"=")
+    return f"header.{payload.decode()}.signature"
+
+
+def test_decode_jwt_expiry():
+    """Test reading the exp claim, and ignoring non-JWT tokens."""
+    assert decode_jwt_expiry(_jwt(1700000000)) == 1700000000.0
+    assert decode_jwt_expiry("opaque-token") is None
+    assert decode_jwt_expiry("a.not-base64!.c") is None
+
+
+def test_token_cached_in_memory():
+    """Test that a fresh token is reused without fetching again."""
+    fetch = MagicMock(return_value="opaque-token")
+    manager = TokenManager(fetch, cache_key="https://api user")
+
+    assert manager.get_token() == "opaque-token"
+    assert manager.get_token() == "opaque-token"
+    fetch.assert_called_once()
+
+
+def test_token_shared_through_cache_file(tmp_path):
+    """Test that a second manager reuses the token stored on disk."""
+    cache_file = str(tmp_path / "tokens.json")
+    token = _jwt(time.time() + 3600)
+    first = TokenManager(
+        MagicMock(return_value=token), "https://api user", cache_file
+    )
+    second_fetch = MagicMock()
+    second = TokenManager(second_fetch, "https://api user", cache_file)
+
+    assert first.get_token() == token
+    assert second.get_token() == token
+    second_fetch.assert_not_called()
+    assert "https://api" not in (tmp_path / "tokens.json").read_text()
+    first.close()
+    second.close()
+
+
+def test_expired_token_in_cache_file_is_refetched(tmp_path):
+    """Test that a token about to expire is not reused from disk."""
+    cache_file = str(tmp_path / "tokens.json")
+    TokenManager(
+        MagicMock(return_value=_jwt(time.time() + 10)),
+        "https://api user",
+        cache_file,
+    ).get_token()
+    fetch = MagicMock(return_value="new-token")
+
+    manager = TokenManager(fetch, "https://api user", cache_file)
+
+    assert manager.get_token() == "new-token"
+    fetch.assert_called_once()
+
+
+def test_refresh_skips_already_replaced_token():
+    """Test that concurrent 401s for the same token fetch only once."""
+    fetch = MagicMock(side_effect=["token-1", "token-2"])
+    manager = TokenManager(fetch, cache_key="https://api user")
+    manager.get_token()
+
+    assert manager.refresh("token-1") == "token-2"
+    assert manager.refresh("token-1") == "token-2"
+    assert fetch.call_count == 2
+
+
+def test_background_refresh_before_expiry():
+    """Test that a JWT is refreshed shortly before it expires."""
+    renewed = []
+    fetch = MagicMock(side_effect=[_jwt(time.time() + 60.05), "token-2"])
+    manager = TokenManager(
+        fetch, "https://api user", refresh_margin=60, on_refresh=renewed.append
+    )
+    manager.get_token()
+
+    deadline = time.time() + 2
+    while not renewed and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert renewed == ["token-2"]
+    manager.close()
+
+
+@patch("pointofpresence.client_base.requests.Session.request")
+def test_client_replays_request_after_401(mock_request):
+    """Test transparent re-authentication and a single replay on 401."""
+    token_responses = [MagicMock(), MagicMock()]
+    token_responses[0].json.return_value = {"access_token": "token-1"}
+    token_responses[1].json.return_value = {"access_token": "token-2"}
+    rejected = MagicMock(status_code=401)
+    rejected.request.headers = {"Authorization": "Bearer token-1"}
+    accepted = MagicMock(status_code=200)
+    mock_request.side_effect = [
+        token_responses[0],
+        rejected,
+        token_responses[1],
+        accepted,
+    ]
+
+    client = APIClientBase(
+        base_url="https://api.example.com", username="user", password="pass"
+    )
+    response = client.session.get("https://api.example.com/organization")
+
+    assert response is accepted
+    assert client.token == "token-2"
+    assert client.session.headers["Authorization"] == "Bearer token-2"
+    assert mock_request.call_count == 4
+    assert mock_request.call_args_list[2].args == (
+        "POST",
+        "https://api.example.com/token",
+    )
@@ -0,0 +1,43 @@
+# tests/test_transport.py
+
+from unittest.mock import patch, MagicMock
+from requests.adapters import HTTPAdapter
+from pointofpresence.transport import PooledHTTPAdapter
+
+
+@patch.object(HTTPAdapter, "send")
+def test_idle_connections_are_reaped(mock_send):
+    """Test that pools are cleared after the idle timeout elapses."""
+    adapter = PooledHTTPAdapter(pool_idle_timeout=5)
+    adapter.poolmanager = MagicMock()
+    adapter._last_used -= 10
+
+    adapter.send(MagicMock())
+
+    adapter.poolmanager.clear.assert_called_once()
+    mock_send.assert_called_once()
+
+
+@patch.object(HTTPAdapter, "send")
+def test_recent_connections_are_kept(mock_send):
+    """Test that pools are kept while the adapter is in use."""
+    adapter = PooledHTTPAdapter(pool_idle_timeout=5)
+    adapter.poolmanager = MagicMock()
+
+    adapter.send(MagicMock())
+    adapter.send(MagicMock())
+
+    adapter.poolmanager.clear.assert_not_called()
+    assert mock_send.call_count == 2
+
+
+@patch.object(HTTPAdapter, "send")
+def test_reaping_disabled_by_default(mock_send):
+    """Test that no timeout means connections are never reaped."""
+    adapter = PooledHTTPAdapter()
+    adapter.poolmanager = MagicMock()
+    adapter._last_used -= 3600
+
+    adapter.send(MagicMock())
+
+    adapter.poolmanager.clear.assert_not_called()
@@ -0,0 +1,98 @@
+# tests/test_validation.py
+
+import pytest
+from pointofpresence.validation import (
+    PayloadValidationError,
+    PayloadValidator,
+    validate,
+    validate_many,
+)
+
+URL_PAYLOAD = {
+    "resource_name": "air_quality",
+    "resource_title": "Air Quality",
+    "owner_org": "org",
+    "resource_url": "https://example.com/data.csv",
+    "extras": {"source": "sensor"},
+    "mapping": {"a": "b"},
+}
+
+
+def test_valid_payloads():
+    """Test that well-formed payloads of every kind pass."""
+    validate("url", URL_PAYLOAD)
+    validate("organization", {"name": "org", "title": "Org"})
+    validate(
+        "s3",
+        {
+            "resource_name": "s3_res",
+            "owner_org": "org",
+            "resource_s3": "s3://bucket/key",
+        },
+    )
+    validate(
+        "kafka",
+        {
+            "dataset_name": "topic",
+            "owner_org": "org",
+            "kafka_topic": "t",
+            "kafka_host": "localhost",
+            "kafka_port": 9092,
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        ({"resource_name": None}, "resource_name is required"),
+        ({"owner_org": ""}, "owner_org is required"),
+        ({"resource_name": "Air Quality"}, "resource_name must be 2 to 100"),
+        ({"resource_url": "example.com/x"}, "must be an absolute URL"),
+        ({"mapping": "a=b"}, "mapping must be a dict"),
+        ({"extras": {"name": "x", "tags": "y"}}, "Reserved key error: name"),
+    ],
+)
+def test_invalid_url_payloads(change, message):
+    """Test the messages of the individual checks."""
+    with pytest.raises(PayloadValidationError) as excinfo:
+        validate("url", {**URL_PAYLOAD, **change})
+    assert message in str(excinfo.value)
+
+
+def test_validate_many_reports_every_invalid_item():
+    """Test the batch mode."""
+    good = dict(URL_PAYLOAD)
+    items = validate_many("url", iter([good, good]))
+    assert items == [good, good]
+
+    with pytest.raises(PayloadValidationError) as excinfo:
+        validate_many("url", [good, {}, good, "x", {}, {}, {}])
+    errors = excinfo.value.errors
+    assert [index for index, _ in errors] == [1, 3, 4, 5, 6]
+    assert "(and 2 more)" in str(excinfo.value)
+
+
+def test_unknown_kind():
+    """Test that unknown payload kinds are rejected."""
+    with pytest.raises(ValueError):
+        PayloadValidator("ftp")
+
+
+def test_client_validate_option():
+    """Test that a validating client fails before the network."""
+    from pointofpresence import APIClient
+    from pointofpresence.fake_server import FakePOPServer
+
+    with FakePOPServer() as server:
+        client = APIClient(server.url, validate=True)
+        client.register_organization({"name": "org"})
+        sent = server.request_count
+        with pytest.raises(ValueError, match="Reserved key error"):
+            client.register_url(
+                {**URL_PAYLOAD, "extras": {"version": "2"}}
+            )
+        with pytest.raises(ValueError, match="name is required"):
+            client.register_organization({"title": "No name"})
+        assert server.request_count == sent
+        client.close()